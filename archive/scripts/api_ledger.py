@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+API call ledger — append-only record of every Claude, Firecrawl and Viator call.
+
+extract_operator.py, firecrawl_extract.py and viator_compare.py record each
+external call here (endpoint, model, tokens, credits, latency, status,
+operator) in a local SQLite database, so spend and throughput over time can
+be queried from real runs instead of reconstructed from result metadata.
+
+Usage:
+    # Spend and latency per API over the last 7 days
+    python scripts/api_ledger.py
+
+    # Per model / per operator / per day, over any window
+    python scripts/api_ledger.py --by model --since 30d
+    python scripts/api_ledger.py --by operator --api claude
+    python scripts/api_ledger.py --by day --since 90d
+
+    # Most recent calls
+    python scripts/api_ledger.py --recent 20
+
+Output:
+    results/ledger/api_calls.sqlite    — the ledger (safe to share between
+                                         concurrent processes)
+"""
+
+import argparse
+import contextlib
+import contextvars
+import math
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_LEDGER_PATH = PROJECT_ROOT / "results" / "ledger" / "api_calls.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts          TEXT NOT NULL,
+    api         TEXT NOT NULL,
+    endpoint    TEXT NOT NULL,
+    model       TEXT,
+    operator    TEXT,
+    status      TEXT NOT NULL,
+    latency_ms  REAL NOT NULL,
+    tokens_in   INTEGER NOT NULL DEFAULT 0,
+    tokens_out  INTEGER NOT NULL DEFAULT 0,
+    cache_write INTEGER NOT NULL DEFAULT 0,
+    cache_read  INTEGER NOT NULL DEFAULT 0,
+    credits     INTEGER NOT NULL DEFAULT 0,
+    cost_usd    REAL,
+    script      TEXT,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS calls_ts ON calls (ts);
+"""
+
+# Columns a caller may set on a call record (besides api/endpoint/status/latency)
+CALL_FIELDS = (
+    "model", "operator", "tokens_in", "tokens_out", "cache_write", "cache_read",
+    "credits", "cost_usd", "error",
+)
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+# Operator the calls in the current context are made for (None = unattributed)
+LEDGER_OPERATOR: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "ledger_operator", default=None,
+)
+
+# One connection per process, shared by every thread behind a lock; None
+# path disables recording
+LEDGER: dict = {"path": DEFAULT_LEDGER_PATH, "conn": None, "lock": threading.Lock(), "warned": False}
+
+
+def set_ledger_path(path: Path | None):
+    """Record to ``path`` from now on (None = stop recording)."""
+    with LEDGER["lock"]:
+        if LEDGER["conn"] is not None:
+            LEDGER["conn"].close()
+        LEDGER.update(path=path, conn=None)
+
+
+def set_operator(operator: str | None):
+    """Attribute calls made in the current context to ``operator``."""
+    LEDGER_OPERATOR.set(operator)
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    # WAL lets sharded runs in separate processes append concurrently
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def record_call(api: str, endpoint: str, status: str, seconds: float, **fields):
+    """Append one call. Ledger failures are reported once and never raised."""
+    if LEDGER["path"] is None:
+        return
+    row = {k: fields.get(k) for k in CALL_FIELDS}
+    row["operator"] = row["operator"] or LEDGER_OPERATOR.get()
+    for key in ("tokens_in", "tokens_out", "cache_write", "cache_read", "credits"):
+        row[key] = row[key] or 0
+    row.update(
+        ts=datetime.now(timezone.utc).isoformat(),
+        api=api,
+        endpoint=endpoint,
+        status=status,
+        latency_ms=round(seconds * 1000, 1),
+        script=Path(sys.argv[0]).name,
+    )
+    columns = ", ".join(row)
+    placeholders = ", ".join(f":{k}" for k in row)
+    with LEDGER["lock"]:
+        try:
+            if LEDGER["conn"] is None:
+                LEDGER["conn"] = connect(LEDGER["path"])
+            with LEDGER["conn"]:
+                LEDGER["conn"].execute(f"INSERT INTO calls ({columns}) VALUES ({placeholders})", row)
+        except sqlite3.Error as e:
+            if not LEDGER["warned"]:
+                print(f"WARNING: API ledger unavailable ({e}); calls are not being recorded", file=sys.stderr)
+                LEDGER["warned"] = True
+
+
+@contextlib.contextmanager
+def ledger_call(api: str, endpoint: str, **fields):
+    """Time one external call and record it. Yields a dict for tokens/credits/cost.
+
+    An exception marks the call "error" (with its message) and propagates.
+    """
+    call = dict(fields)
+    started = time.monotonic()
+    try:
+        yield call
+    except BaseException as e:
+        call.pop("status", None)
+        call.setdefault("error", f"{type(e).__name__}: {e}"[:500])
+        record_call(api, endpoint, "error", time.monotonic() - started, **call)
+        raise
+    record_call(api, endpoint, call.pop("status", "ok"), time.monotonic() - started, **call)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+GROUPINGS = {
+    "api": "api",
+    "endpoint": "api || ' ' || endpoint",
+    "model": "COALESCE(model, api)",
+    "operator": "COALESCE(operator, '-')",
+    "day": "substr(ts, 1, 10)",
+    "script": "COALESCE(script, '-')",
+}
+
+
+def parse_since(value: str) -> datetime:
+    """'7d', '12h', '30m' or an ISO date/time -> UTC datetime."""
+    match = re.fullmatch(r"(\d+)([dhm])", value.strip())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"d": timedelta(days=amount), "h": timedelta(hours=amount), "m": timedelta(minutes=amount)}[unit]
+        return datetime.now(timezone.utc) - delta
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile (pct in 0-100) of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+def summarize(conn: sqlite3.Connection, by: str, since: datetime, api: str | None = None) -> list[dict]:
+    """Calls, errors, tokens, credits, cost, latency and throughput per group."""
+    where, params = "ts >= ?", [since.isoformat()]
+    if api:
+        where += " AND api = ?"
+        params.append(api)
+    rows = conn.execute(
+        f"SELECT {GROUPINGS[by]} AS grp, ts, status, latency_ms, tokens_in, tokens_out, "
+        f"credits, COALESCE(cost_usd, 0) FROM calls WHERE {where} ORDER BY ts",
+        params,
+    ).fetchall()
+
+    groups: dict[str, dict] = {}
+    for grp, ts, status, latency_ms, tokens_in, tokens_out, credits, cost in rows:
+        g = groups.setdefault(grp, {
+            "group": grp, "calls": 0, "errors": 0, "tokensIn": 0, "tokensOut": 0,
+            "credits": 0, "costUsd": 0.0, "latencies": [], "first": ts, "last": ts,
+        })
+        g["calls"] += 1
+        g["errors"] += status != "ok"
+        g["tokensIn"] += tokens_in
+        g["tokensOut"] += tokens_out
+        g["credits"] += credits
+        g["costUsd"] += cost
+        g["latencies"].append(latency_ms)
+        g["last"] = ts
+
+    summary = []
+    for g in groups.values():
+        latencies = g.pop("latencies")
+        span_hours = (datetime.fromisoformat(g["last"]) - datetime.fromisoformat(g["first"])).total_seconds() / 3600
+        g.update(
+            costUsd=round(g["costUsd"], 4),
+            p50Ms=percentile(latencies, 50),
+            p95Ms=percentile(latencies, 95),
+            # Rates over less than a minute of calls are noise
+            callsPerHour=round(g["calls"] / span_hours, 1) if span_hours >= 1 / 60 else None,
+        )
+        summary.append(g)
+    return sorted(summary, key=lambda g: (-g["costUsd"], -g["calls"]))
+
+
+def _fmt_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value / 1000:.1f}s"
+
+
+def print_summary(summary: list[dict], by: str, since: datetime):
+    print()
+    print("=" * 96)
+    print(f"API LEDGER — by {by}, since {since.strftime('%Y-%m-%d %H:%M')} UTC")
+    print("=" * 96)
+    if not summary:
+        print("  No calls recorded in this window.")
+        return
+    print(
+        f"  {by.title():<34} {'calls':>6} {'err':>4} {'tok in':>10} {'tok out':>9} "
+        f"{'credits':>7} {'cost':>9} {'p50':>7} {'p95':>7} {'calls/h':>8}"
+    )
+    for g in summary:
+        print(
+            f"  {str(g['group'])[:34]:<34} {g['calls']:>6} {g['errors']:>4} {g['tokensIn']:>10,} "
+            f"{g['tokensOut']:>9,} {g['credits']:>7} {'$' + format(g['costUsd'], ',.2f'):>9} "
+            f"{_fmt_ms(g['p50Ms']):>7} {_fmt_ms(g['p95Ms']):>7} "
+            f"{'-' if g['callsPerHour'] is None else g['callsPerHour']:>8}"
+        )
+    total_cost = sum(g["costUsd"] for g in summary)
+    total_calls = sum(g["calls"] for g in summary)
+    total_credits = sum(g["credits"] for g in summary)
+    print("-" * 96)
+    print(f"  Total: {total_calls} calls, ${total_cost:,.2f} Claude, {total_credits} Firecrawl credits")
+
+
+def print_recent(conn: sqlite3.Connection, limit: int):
+    rows = conn.execute(
+        "SELECT ts, api, endpoint, model, operator, status, latency_ms, tokens_in, tokens_out, "
+        "credits, cost_usd FROM calls ORDER BY id DESC LIMIT ?",
+        (limit,),
+    ).fetchall()
+    for ts, api, endpoint, model, operator, status, latency_ms, t_in, t_out, credits, cost in reversed(rows):
+        detail = f"{t_in:,}/{t_out:,} tok" if t_in or t_out else f"{credits} cr" if credits else ""
+        cost_note = f" ${cost:.4f}" if cost else ""
+        print(
+            f"  {ts[:19]} {api:<9} {endpoint:<28} {(model or ''):<28} {(operator or '-'):<20} "
+            f"{status:<5} {latency_ms / 1000:6.1f}s {detail}{cost_note}".rstrip()
+        )
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query the API call ledger for spend and throughput",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--ledger", type=Path, default=DEFAULT_LEDGER_PATH,
+        help=f"Ledger database (default: {DEFAULT_LEDGER_PATH.relative_to(PROJECT_ROOT)}).",
+    )
+    parser.add_argument(
+        "--by", choices=sorted(GROUPINGS), default="api",
+        help="Group calls by this column (default: api).",
+    )
+    parser.add_argument(
+        "--since", default="7d",
+        help="Window start: 7d, 12h, 30m or an ISO date (default: 7d).",
+    )
+    parser.add_argument(
+        "--api", choices=["claude", "firecrawl", "viator"],
+        help="Only include calls to this API.",
+    )
+    parser.add_argument(
+        "--recent", type=int, metavar="N",
+        help="List the N most recent calls instead of a summary.",
+    )
+
+    args = parser.parse_args()
+
+    if not args.ledger.exists():
+        print(f"ERROR: No ledger at {args.ledger} (nothing recorded yet)", file=sys.stderr)
+        sys.exit(1)
+    conn = connect(args.ledger)
+
+    if args.recent:
+        print_recent(conn, args.recent)
+        return
+
+    since = parse_since(args.since)
+    print_summary(summarize(conn, args.by, since, args.api), args.by, since)
+
+
+if __name__ == "__main__":
+    main()
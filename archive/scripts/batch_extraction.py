@@ -0,0 +1,262 @@
+"""
+Batch extraction through the Message Batches API.
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from api_ledger import ledger_call, record_call, set_operator as set_ledger_operator
+from claude_costs import estimate_cost, ledger_usage, usage_tokens
+from extraction_common import (
+    RESULTS_DIR, TEMPERATURE, anthropic_client, build_system_blocks, firecrawl_app,
+    load_extraction_prompt, load_operator_manifest, require_api_keys,
+)
+from extraction_options import ExtractionOptions
+from extraction_pipeline import finalize_extraction
+from page_reduction import build_user_content, reduce_pages
+from preflight import auto_max_tokens, predict_product_count
+from response_parsing import parse_response
+from scraping import scrape_operator
+
+if TYPE_CHECKING:
+    from firecrawl import FirecrawlApp
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+BATCHES_DIR = RESULTS_DIR / "batches"
+
+# Seconds between batch status checks
+DEFAULT_BATCH_POLL_SECONDS = 60
+
+
+# ---------------------------------------------------------------------------
+# Batch extraction (Message Batches API)
+#
+# For overnight bulk runs: every operator's prompt goes into one message
+# batch (50% of standard price, no interactive latency). Batch state is
+# saved under results/batches/ so an interrupted run can resume polling
+# with --batch-id. For testing, scripts/batch_standin.py serves the batch
+# endpoints locally; point ANTHROPIC_BASE_URL at it.
+# ---------------------------------------------------------------------------
+
+def _batch_state_path(batch_id: str) -> Path:
+    return BATCHES_DIR / f"{batch_id}.json"
+
+
+def submit_extraction_batch(
+    client,
+    app: "FirecrawlApp",
+    operators: list[dict],
+    options: ExtractionOptions,
+) -> dict | None:
+    """Scrape every operator and submit all their prompts as one message batch.
+
+    Returns the saved batch state (batch id + per-operator scrape info).
+    """
+    model, max_tokens, include_raw_html = options.model, options.max_tokens, options.include_raw_html
+    extraction_prompt = load_extraction_prompt()
+    system_blocks = build_system_blocks(extraction_prompt, options.prompt_cache)
+
+    requests_: list[dict] = []
+    state_ops: dict[str, dict] = {}
+    for i, op in enumerate(operators, 1):
+        print(f"\n[{i}/{len(operators)}] {op['slug']}: scraping {len(op['urls'])} page(s)")
+        set_ledger_operator(op["slug"])
+        scrape_result = scrape_operator(app, op["urls"], include_raw_html, **options.scrape_kwargs())
+        if scrape_result is None:
+            continue
+        pages, site_chrome, reduction = reduce_pages(scrape_result["pages"], options.strip_boilerplate)
+        user_content = build_user_content(pages, include_raw_html, site_chrome)
+        print(f"  User message: {len(user_content):,} chars")
+        op_max_tokens = max_tokens or auto_max_tokens(
+            predict_product_count(scrape_result["pages"]), [user_content], model,
+        )
+        if max_tokens is None:
+            print(f"  max_tokens:   {op_max_tokens:,} (auto, from the preflight estimate)")
+        requests_.append({
+            "custom_id": op["slug"],
+            "params": {
+                "model": model,
+                "max_tokens": op_max_tokens,
+                "temperature": TEMPERATURE,
+                "system": system_blocks,
+                "messages": [{"role": "user", "content": user_content}],
+            },
+        })
+        # Page text is not kept in the state file; metadata only needs the counts
+        state_ops[op["slug"]] = {
+            "pages": [{"url": p["url"]} for p in scrape_result["pages"]],
+            "total_credits": scrape_result["total_credits"],
+            "cached_pages": scrape_result["cached_pages"],
+            "total_chars": scrape_result["total_chars"],
+            "reduction": reduction,
+        }
+
+    if not requests_:
+        print("ERROR: No operator produced any pages. Nothing to submit.", file=sys.stderr)
+        return None
+
+    print(f"\nSubmitting message batch ({len(requests_)} operator(s))...")
+    set_ledger_operator(None)
+    with ledger_call("claude", "messages.batches.create", model=model):
+        batch = client.messages.batches.create(requests=requests_)
+
+    state = {
+        "batchId": batch.id,
+        "submittedAt": datetime.now(timezone.utc).isoformat(),
+        "model": model,
+        "includeRawHtml": include_raw_html,
+        "operators": state_ops,
+    }
+    BATCHES_DIR.mkdir(parents=True, exist_ok=True)
+    with open(_batch_state_path(batch.id), "w") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    print(f"  Batch ID: {batch.id}")
+    print(f"  State:    {_batch_state_path(batch.id)}")
+    return state
+
+
+def wait_for_batch(client, batch_id: str, poll_interval: float) -> None:
+    """Poll a message batch until processing has ended."""
+    while True:
+        batch = client.messages.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        print(
+            f"  [{datetime.now().strftime('%H:%M:%S')}] {batch.processing_status}: "
+            f"{counts.processing} processing, {counts.succeeded} succeeded, "
+            f"{counts.errored} errored, {counts.expired} expired"
+        )
+        if batch.processing_status == "ended":
+            return
+        time.sleep(poll_interval)
+
+
+def collect_batch_results(client, state: dict) -> dict:
+    """Fan batch results back into each operator's extract_operator_v1.json."""
+    model = state["model"]
+    saved: list[str] = []
+    failed: dict[str, str] = {}
+    totals = {"input": 0, "output": 0, "cacheWrite": 0, "cacheRead": 0}
+
+    # Batch latency is submission to collection; the ledger records it per operator
+    batch_seconds = (
+        datetime.now(timezone.utc) - datetime.fromisoformat(state["submittedAt"])
+    ).total_seconds()
+
+    for entry in client.messages.batches.results(state["batchId"]):
+        slug = entry.custom_id
+        op_state = state["operators"].get(slug)
+        if op_state is None:
+            continue
+        print(f"\n{slug}:")
+        if entry.result.type != "succeeded":
+            record_call(
+                "claude", "messages.batches.result", entry.result.type, batch_seconds,
+                model=model, operator=slug,
+            )
+            # errored results wrap the API error; expired/canceled carry none
+            error = getattr(getattr(entry.result, "error", None), "error", None)
+            failed[slug] = (
+                f"{entry.result.type}: {error.type}: {error.message}" if error else entry.result.type
+            )
+            print(f"  ERROR: batch request {failed[slug]}", file=sys.stderr)
+            continue
+
+        message = entry.result.message
+        tokens = usage_tokens(message.usage)
+        call = {"operator": slug}
+        ledger_usage(call, model, message, batch=True)
+        record_call("claude", "messages.batches.result", call.pop("status", "ok"), batch_seconds, **call)
+        for key in totals:
+            totals[key] += tokens[key]
+        result = parse_response(slug, message.content[0].text)
+        if result is None:
+            failed[slug] = "unparseable response"
+            continue
+        extra_metadata = dict(op_state.get("reduction") or {})
+        if message.stop_reason == "max_tokens":
+            extra_metadata["truncated"] = {"stopReason": message.stop_reason}
+        finalize_extraction(
+            slug, result, model, tokens, op_state,
+            state["includeRawHtml"], method="firecrawl_scrape_claude_batch", batch=True,
+            extra_metadata=extra_metadata,
+        )
+        saved.append(slug)
+
+    return {"saved": saved, "failed": failed, "tokens": totals}
+
+
+def run_batch_extraction(
+    manifest_path: Path | None = None,
+    batch_id: str | None = None,
+    options: ExtractionOptions | None = None,
+    poll_interval: float = DEFAULT_BATCH_POLL_SECONDS,
+) -> dict | None:
+    """Extract many operators through one message batch.
+
+    With a manifest, scrapes every operator and submits a new batch; with
+    ``batch_id``, resumes polling a batch submitted earlier. Either way,
+    waits for the batch to end and saves each operator's result. Cascades,
+    chunking, crawl plans and unchanged-content checks do not apply.
+    """
+    options = options or ExtractionOptions()
+    fc_key, anth_key = require_api_keys()
+    client = anthropic_client(anth_key)
+
+    print()
+    print("=" * 60)
+    print("EXTRACT OPERATORS — Message Batch (Firecrawl /scrape + Claude Batches API)")
+    print("=" * 60)
+
+    if batch_id:
+        state_path = _batch_state_path(batch_id)
+        if not state_path.exists():
+            print(f"ERROR: No saved state for batch {batch_id} at {state_path}", file=sys.stderr)
+            return None
+        with open(state_path) as f:
+            state = json.load(f)
+        print(f"  Resuming batch: {batch_id} ({len(state['operators'])} operator(s))")
+    else:
+        operators = load_operator_manifest(manifest_path)
+        print(f"  Manifest:       {manifest_path} ({len(operators)} operator(s))")
+        print(f"  Claude model:   {options.model} (batch pricing)")
+        app = firecrawl_app(fc_key)
+        state = submit_extraction_batch(client, app, operators, options)
+        if state is None:
+            return None
+
+    print("\nWaiting for batch to finish...")
+    wait_for_batch(client, state["batchId"], poll_interval)
+
+    print("\nCollecting results...")
+    summary = collect_batch_results(client, state)
+
+    tokens = summary["tokens"]
+    credits = sum(op["total_credits"] for op in state["operators"].values())
+    cost_est = estimate_cost(
+        state["model"], tokens["input"], tokens["output"], tokens["cacheWrite"], tokens["cacheRead"],
+        batch=True,
+    )
+    print()
+    print("=" * 60)
+    print("BATCH SUMMARY")
+    print("=" * 60)
+    print(f"  Batch ID:   {state['batchId']}")
+    print(f"  Saved:      {len(summary['saved'])} operator(s)")
+    print(f"  Failed:     {len(summary['failed'])} operator(s)")
+    for slug, reason in summary["failed"].items():
+        print(f"    - {slug}: {reason}")
+    print(f"  Claude:     {tokens['input']:,} input + {tokens['output']:,} output tokens")
+    print(f"  Cache:      {tokens['cacheRead']:,} read + {tokens['cacheWrite']:,} written")
+    print(f"  Claude est: {cost_est} (batch pricing)")
+    print(f"  Total est:  {cost_est} + {credits} Firecrawl credits")
+    print("=" * 60)
+
+    return summary
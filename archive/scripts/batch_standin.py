@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Anthropic Message Batches API.
+
+Serves just enough of /v1/messages/batches for extract_operator.py --batch
+to submit, poll and collect against it without an API key or spend: each
+batch reports "in_progress" for a few polls, then "ended", and its results
+are a canned extraction per request (an operator named after the request's
+custom_id with one product) unless a ``respond`` callable says otherwise.
+
+Usage:
+    # Terminal 1 — start the stand-in
+    python scripts/batch_standin.py --port 8080
+
+    # Terminal 2 — point the Anthropic client at it
+    ANTHROPIC_BASE_URL=http://localhost:8080 python scripts/extract_operator.py \\
+        --batch --manifest manifests/phase0_seattle.json --poll-interval 1
+
+Firecrawl scrapes still go to Firecrawl (or the scrape cache, or a --replay
+cassette); only the Claude side is stood in for.
+"""
+
+import argparse
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DEFAULT_PORT = 8080
+
+# Retrieves answered "in_progress" before a batch reports "ended"
+DEFAULT_POLLS_UNTIL_ENDED = 2
+
+
+# ---------------------------------------------------------------------------
+# Canned responses
+# ---------------------------------------------------------------------------
+
+def canned_extraction(params: dict, custom_id: str) -> str:
+    """A minimal schema-shaped extraction for one batch request."""
+    return json.dumps({
+        "operator": {"name": custom_id.replace("_", " ").title(), "url": f"https://{custom_id}.example.com"},
+        "products": [{
+            "title": f"{custom_id.replace('_', ' ').title()} Signature Tour",
+            "pricingModel": "PER_UNIT",
+            "currency": "USD",
+            "priceByUnit": [{"unitType": "adult", "amount": 9900}],
+        }],
+    })
+
+
+def succeeded_result(params: dict, custom_id: str, text: str) -> dict:
+    """One results.jsonl line for a successful request."""
+    return {
+        "custom_id": custom_id,
+        "result": {
+            "type": "succeeded",
+            "message": {
+                "id": f"msg_{uuid.uuid4().hex[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": params.get("model", "claude-standin"),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": len(json.dumps(params.get("messages", []))) // 4,
+                    "output_tokens": len(text) // 4,
+                    "cache_creation_input_tokens": 0,
+                    "cache_read_input_tokens": 0,
+                },
+            },
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class BatchStandIn:
+    """In-memory batches: {id: {requests, polls, createdAt}}."""
+
+    def __init__(self, respond=canned_extraction, polls_until_ended: int = DEFAULT_POLLS_UNTIL_ENDED):
+        self.respond = respond
+        self.polls_until_ended = polls_until_ended
+        self.batches: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def create(self, body: dict) -> dict:
+        batch_id = f"msgbatch_standin_{uuid.uuid4().hex[:16]}"
+        with self.lock:
+            self.batches[batch_id] = {
+                "requests": body.get("requests", []),
+                "polls": 0,
+                "createdAt": datetime.now(timezone.utc),
+            }
+        return self.describe(batch_id, base_url="")
+
+    def describe(self, batch_id: str, base_url: str, poll: bool = False) -> dict | None:
+        with self.lock:
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                return None
+            if poll:
+                batch["polls"] += 1
+            ended = batch["polls"] > self.polls_until_ended
+        count = len(batch["requests"])
+        created = batch["createdAt"]
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": created.isoformat(),
+            "expires_at": (created + timedelta(days=1)).isoformat(),
+            "ended_at": datetime.now(timezone.utc).isoformat() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def results(self, batch_id: str) -> str | None:
+        with self.lock:
+            batch = self.batches.get(batch_id)
+        if batch is None:
+            return None
+        lines = []
+        for request in batch["requests"]:
+            params, custom_id = request.get("params", {}), request.get("custom_id", "")
+            lines.append(json.dumps(succeeded_result(params, custom_id, self.respond(params, custom_id))))
+        return "\n".join(lines) + "\n"
+
+
+def _handler(standin: BatchStandIn):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: str, content_type: str = "application/json"):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _not_found(self):
+            self._send(404, json.dumps({
+                "type": "error", "error": {"type": "not_found_error", "message": f"No route {self.path}"},
+            }))
+
+        def do_POST(self):
+            if self.path.split("?")[0].rstrip("/") != "/v1/messages/batches":
+                return self._not_found()
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            self._send(200, json.dumps(standin.create(body)))
+
+        def do_GET(self):
+            parts = self.path.split("?")[0].strip("/").split("/")
+            if parts[:3] != ["v1", "messages", "batches"] or len(parts) not in (4, 5):
+                return self._not_found()
+            batch_id = parts[3]
+            if len(parts) == 5 and parts[4] == "results":
+                body = standin.results(batch_id)
+                return self._send(200, body, "application/binary") if body is not None else self._not_found()
+            base_url = f"http://{self.headers.get('Host')}"
+            batch = standin.describe(batch_id, base_url, poll=True)
+            return self._send(200, json.dumps(batch)) if batch is not None else self._not_found()
+
+    return Handler
+
+
+def start_standin(
+    port: int = 0,
+    respond=canned_extraction,
+    polls_until_ended: int = DEFAULT_POLLS_UNTIL_ENDED,
+) -> tuple[ThreadingHTTPServer, str]:
+    """Serve the stand-in from a daemon thread; returns (server, base URL).
+
+    Port 0 picks a free port. Call ``server.shutdown()`` when done.
+    """
+    standin = BatchStandIn(respond, polls_until_ended)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(standin))
+    server.standin = standin
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the Anthropic Message Batches API (for testing --batch).",
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT}).")
+    parser.add_argument(
+        "--polls", type=int, default=DEFAULT_POLLS_UNTIL_ENDED,
+        help=f"Status checks answered 'in_progress' before a batch ends (default: {DEFAULT_POLLS_UNTIL_ENDED}).",
+    )
+    args = parser.parse_args()
+
+    server, base_url = start_standin(args.port, polls_until_ended=args.polls)
+    print(f"Message Batches stand-in listening on {base_url}")
+    print(f"  ANTHROPIC_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+CLI startup benchmark — import time and --help latency for each script.
+
+Every measurement runs in a fresh interpreter, so nothing is cached between
+runs. For each script it reports the median and fastest wall time of a bare
+import and of `--help`, net of bare interpreter startup, plus which heavy
+SDKs (anthropic, firecrawl, pydantic, requests, jsonschema) the import
+pulled in and what they cost according to `python -X importtime`.
+
+Usage:
+    # All scripts, 10 runs each
+    python scripts/bench_startup.py
+
+    # More runs, one script
+    python scripts/bench_startup.py --repeat 30 --scripts extract_operator
+
+    # Compare against an earlier run
+    python scripts/bench_startup.py --baseline results/benchmarks/startup_1a2b3c4.json
+
+Output:
+    results/benchmarks/startup_<commit>.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench_viator import BENCHMARKS_DIR, git_commit
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+DEFAULT_SCRIPTS = ["extract_operator", "firecrawl_extract", "viator_compare", "api_ledger"]
+
+# Third-party SDKs that should only load on the code paths that use them
+HEAVY_MODULES = ["anthropic", "firecrawl", "pydantic", "requests", "jsonschema"]
+
+DEFAULT_REPEAT = 10
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def wall_seconds(argv: list[str]) -> float:
+    """Wall time of one fresh interpreter running ``argv``."""
+    started = time.perf_counter()
+    proc = subprocess.run(argv, cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} exited {proc.returncode}: {proc.stderr.strip()[-300:]}")
+    return elapsed
+
+
+def sample(argv: list[str], repeat: int) -> dict:
+    runs = [wall_seconds(argv) for _ in range(repeat)]
+    return {"medianSeconds": round(statistics.median(runs), 4), "minSeconds": round(min(runs), 4)}
+
+
+def heavy_imports(module: str) -> dict[str, int]:
+    """Cumulative import microseconds of each heavy SDK that ``import module`` loads."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True,
+    )
+    loaded: dict[str, int] = {}
+    # Lines look like: "import time:   self [us] |  cumulative | imported package"
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not line.startswith("import time:"):
+            continue
+        name = parts[2].strip()
+        if name in HEAVY_MODULES:
+            try:
+                loaded[name] = int(parts[1])
+            except ValueError:
+                continue
+    return loaded
+
+
+def benchmark_script(name: str, repeat: int, interpreter: dict) -> dict:
+    python = sys.executable
+    import_stats = sample([python, "-c", f"import {name}"], repeat)
+    help_stats = sample([python, f"{name}.py", "--help"], repeat)
+    heavy = heavy_imports(name)
+    return {
+        "script": name,
+        "import": import_stats,
+        "help": help_stats,
+        "importNetSeconds": round(import_stats["medianSeconds"] - interpreter["medianSeconds"], 4),
+        "helpNetSeconds": round(help_stats["medianSeconds"] - interpreter["medianSeconds"], 4),
+        "heavyImports": heavy,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def print_results(interpreter: dict, results: list[dict]):
+    print(f"\n  Interpreter startup: {interpreter['medianSeconds'] * 1000:.0f} ms median (subtracted below)")
+    print()
+    print(f"    {'script':20s} {'import ms':>10s} {'--help ms':>10s}  heavy SDKs loaded on import")
+    for r in results:
+        heavy = ", ".join(f"{m} {us / 1000:.0f}ms" for m, us in r["heavyImports"].items()) or "none"
+        print(
+            f"    {r['script']:20s} {r['importNetSeconds'] * 1000:10.0f} "
+            f"{r['helpNetSeconds'] * 1000:10.0f}  {heavy}"
+        )
+
+
+def print_baseline_comparison(results: list[dict], baseline: dict):
+    """Net --help and import time against an earlier run (<1.00x is faster now)."""
+    earlier = {r["script"]: r for r in baseline.get("results", [])}
+    print()
+    print("-" * 60)
+    print(f"VS BASELINE {baseline.get('commit') or '?'} ({baseline.get('generatedAt', '?')[:10]})")
+    print("-" * 60)
+    for r in results:
+        before = earlier.get(r["script"])
+        if not before:
+            print(f"  {r['script']:20s} not in baseline")
+            continue
+        parts = []
+        for key, label in (("importNetSeconds", "import"), ("helpNetSeconds", "--help")):
+            old, new = before.get(key), r[key]
+            if old and old > 0:
+                parts.append(f"{label} {old * 1000:.0f} → {new * 1000:.0f} ms ({new / old:.2f}x)")
+        print(f"  {r['script']:20s} " + ", ".join(parts))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure import time and --help latency of the pipeline scripts.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/bench_startup.py
+  python scripts/bench_startup.py --repeat 30 --scripts extract_operator
+  python scripts/bench_startup.py --baseline results/benchmarks/startup_1a2b3c4.json
+        """,
+    )
+    parser.add_argument(
+        "--scripts", default=",".join(DEFAULT_SCRIPTS),
+        help=f"Comma-separated script names (default: {','.join(DEFAULT_SCRIPTS)}).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT,
+        help=f"Fresh interpreters per measurement (default: {DEFAULT_REPEAT}).",
+    )
+    parser.add_argument("--output", type=Path, help="Results JSON path (default: results/benchmarks/startup_<commit>.json).")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against.")
+    args = parser.parse_args()
+
+    scripts = [s.strip().removesuffix(".py") for s in args.scripts.split(",") if s.strip()]
+    missing = [s for s in scripts if not (SCRIPTS_DIR / f"{s}.py").exists()]
+    if missing:
+        print(f"ERROR: No such script(s) in {SCRIPTS_DIR}: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+    if args.repeat < 1:
+        print("ERROR: --repeat must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = None
+    if args.baseline:
+        if not args.baseline.exists():
+            print(f"ERROR: Baseline not found: {args.baseline}", file=sys.stderr)
+            sys.exit(1)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    commit = git_commit()
+
+    print("=" * 60)
+    print("CLI STARTUP BENCHMARK")
+    print("=" * 60)
+    print(f"  Scripts: {', '.join(scripts)}")
+    print(f"  Repeat:  {args.repeat} fresh interpreters per measurement")
+    print(f"  Commit:  {commit or 'unknown'}")
+
+    interpreter = sample([sys.executable, "-c", "pass"], args.repeat)
+    try:
+        results = [benchmark_script(name, args.repeat, interpreter) for name in scripts]
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    print_results(interpreter, results)
+
+    if baseline:
+        print_baseline_comparison(results, baseline)
+
+    output = {
+        "benchmark": "startup",
+        "commit": commit,
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "interpreter": interpreter,
+        "results": results,
+    }
+    out_path = args.output or BENCHMARKS_DIR / f"startup_{commit or 'uncommitted'}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\n  Results saved to: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
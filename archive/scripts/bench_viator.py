@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Synthetic-catalog benchmark for the Viator mapping and comparison path.
+
+Generates realistic Viator product + schedule payloads and matching Path A
+extraction results (seeded, so every run sees the same catalog), then times
+the hot functions of viator_compare.py over a ladder of catalog sizes:
+
+    map_viator_to_octo   — one call per (product, schedule) pair
+    compare_operator     — one call per synthetic operator
+    _compare_products    — one call per matched product pair
+    generate_report      — one call over every operator's comparison
+
+Each size reports total seconds, throughput (catalog products/s, or matched
+pairs/s for _compare_products) and peak traced memory per function, and the whole run is saved as JSON tagged with the git
+commit so regressions can be tracked across commits.
+
+Usage:
+    # Default ladder: 100, 1k, 10k and 136k products
+    python scripts/bench_viator.py
+
+    # Quick check at small sizes, best of 5
+    python scripts/bench_viator.py --sizes 100,1000 --repeat 5
+
+    # Compare against an earlier run
+    python scripts/bench_viator.py --baseline results/benchmarks/viator_1a2b3c4.json
+
+    # Timings only (tracemalloc slows the memory pass down considerably)
+    python scripts/bench_viator.py --no-memory
+
+Output:
+    results/benchmarks/viator_<commit>.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from viator_compare import _compare_products, compare_operator, generate_report, map_viator_to_octo
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS_DIR = PROJECT_ROOT / "results" / "benchmarks"
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 136_000]
+
+# Viator products per synthetic operator; Path A finds roughly as many
+DEFAULT_PRODUCTS_PER_OPERATOR = 20
+
+# Share of Path A products that are retitled versions of a Viator product
+# (the rest are website-only products with unrelated titles)
+MATCH_SHARE = 0.7
+
+DEFAULT_SEED = 1729
+
+BENCHMARKED = ["map_viator_to_octo", "compare_operator", "_compare_products", "generate_report"]
+
+# What each function's throughput counts: _compare_products only ever sees
+# the matched pairs, the others the whole catalog
+THROUGHPUT_UNITS = {
+    "map_viator_to_octo": "products",
+    "compare_operator": "products",
+    "_compare_products": "pairs",
+    "generate_report": "products",
+}
+
+
+# ---------------------------------------------------------------------------
+# Synthetic catalog
+# ---------------------------------------------------------------------------
+
+TITLE_WORDS = [
+    "Seattle", "Harbor", "Cruise", "Locks", "Sunset", "Dinner", "Whale", "Watching",
+    "Rainier", "Olympic", "Snoqualmie", "Falls", "Winery", "Brewery", "Underground",
+    "Food", "Walking", "Tour", "Private", "Day", "Trip", "Kayak", "Island", "Ferry",
+    "Skyline", "Photography", "Market", "Coffee", "Hike", "Glacier", "Lake", "City",
+]
+FEATURE_PHRASES = [
+    "Live narration", "Hotel pickup and drop-off", "Professional guide", "Bottled water",
+    "Snacks", "Lunch", "Entry fees", "Gratuities", "Wine tasting", "Transportation by van",
+    "Restrooms on board", "Photos of your trip", "Alcoholic beverages", "Parking fees",
+]
+ADDITIONAL_INFO_TYPES = [
+    "WHEELCHAIR_ACCESSIBLE", "STROLLER_ACCESSIBLE", "INFANTS_MUST_SIT_ON_LAPS",
+    "PUBLIC_TRANSPORTATION_NEARBY", "SERVICE_ANIMALS_ALLOWED", "PHYSICAL_EASY",
+]
+DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
+AGE_BANDS = [("INFANT", 0, 3), ("CHILD", 4, 12), ("ADULT", 13, 99)]
+SENIOR_BAND = ("SENIOR", 65, 99)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(TITLE_WORDS).lower() for _ in range(words)).capitalize() + "."
+
+
+def synthetic_viator_product(rng: random.Random, code: str, supplier: str) -> dict:
+    """One Viator /products/{code} response, shaped like the recorded ones."""
+    title = " ".join(rng.sample(TITLE_WORDS, rng.randint(3, 6)))
+    bands = AGE_BANDS + ([SENIOR_BAND] if rng.random() < 0.3 else [])
+    images = [
+        {
+            "imageSource": "SUPPLIER_PROVIDED",
+            "caption": "",
+            "isCover": i == 0,
+            "variants": [
+                {"height": size, "width": size, "url": f"https://media.example.com/{code}/{i}/{size}.jpg"}
+                for size in (100, 240, 480, 720)
+            ],
+        }
+        for i in range(rng.randint(1, 8))
+    ]
+    duration = rng.choice([60, 90, 120, 180, 240, 360, 480, 600])
+    return {
+        "status": "ACTIVE",
+        "productCode": code,
+        "language": "en",
+        "title": title,
+        "description": " ".join(_sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(3, 8))),
+        "viatorUniqueContent": {"shortDescription": _sentence(rng, 12)},
+        "pricingInfo": {
+            "type": "PER_PERSON" if rng.random() < 0.85 else "UNIT",
+            "ageBands": [
+                {"ageBand": band, "startAge": lo, "endAge": hi,
+                 "minTravelersPerBooking": 0, "maxTravelersPerBooking": 15}
+                for band, lo, hi in bands
+            ],
+        },
+        "images": images,
+        "logistics": {
+            "start": [
+                {"location": {"ref": f"LOC-{code}-{i}"}, "description": _sentence(rng, 10)}
+                for i in range(rng.randint(1, 3))
+            ],
+            "end": [{"location": {"ref": f"LOC-{code}-0"}, "description": _sentence(rng, 6)}],
+            "redemption": {"redemptionType": "NONE"},
+            "travelerPickup": {
+                "pickupOptionType": rng.choice(["MEET_EVERYONE_AT_START_POINT", "PICKUP_AND_MEET_AT_START_POINT"]),
+                "allowCustomTravelerPickup": False,
+            },
+        },
+        "inclusions": [
+            {"category": "OTHER", "type": "OTHER", "typeDescription": "Other", "otherDescription": phrase}
+            for phrase in rng.sample(FEATURE_PHRASES, rng.randint(2, 6))
+        ],
+        "exclusions": [
+            {"category": "OTHER", "type": "OTHER", "typeDescription": "Other", "otherDescription": phrase}
+            for phrase in rng.sample(FEATURE_PHRASES, rng.randint(1, 3))
+        ],
+        "additionalInfo": [
+            {"type": t, "description": t.replace("_", " ").capitalize()}
+            for t in rng.sample(ADDITIONAL_INFO_TYPES, rng.randint(2, 6))
+        ],
+        "cancellationPolicy": {
+            "type": "STANDARD",
+            "description": "For a full refund, cancel at least 24 hours before the scheduled departure time.",
+            "cancelIfBadWeather": True,
+            "refundEligibility": [
+                {"dayRangeMin": 1, "percentageRefundable": 100},
+                {"dayRangeMin": 0, "dayRangeMax": 1, "percentageRefundable": 0},
+            ],
+        },
+        "bookingRequirements": {
+            "minTravelersPerBooking": 1,
+            "maxTravelersPerBooking": rng.choice([8, 15, 50]),
+            "requiresAdultForBooking": True,
+        },
+        "languageGuides": [{"type": "GUIDE", "language": "en", "legacyGuide": "en/SERVICE_GUIDE"}],
+        "tags": rng.sample(range(10000, 30000), rng.randint(5, 20)),
+        "flags": rng.sample(["FREE_CANCELLATION", "LIKELY_TO_SELL_OUT", "PRIVATE_TOUR"], rng.randint(0, 2)),
+        "itinerary": {
+            "itineraryType": "STANDARD",
+            "privateTour": rng.random() < 0.1,
+            "duration": {"fixedDurationInMinutes": duration},
+        },
+        "productOptions": [
+            {"productOptionCode": f"TG{i}", "title": f"Option {i}", "description": _sentence(rng, 10)}
+            for i in range(rng.randint(1, 3))
+        ],
+        "supplier": {"name": supplier, "reference": f"SUPPLIER-{supplier}"},
+        "productUrl": f"https://www.viator.com/tours/Seattle/{code}",
+        "reviews": {
+            "sources": [{"provider": "VIATOR", "totalCount": rng.randint(0, 2000), "averageRating": 4.6}],
+            "totalReviews": rng.randint(0, 3000),
+            "combinedAverageRating": round(rng.uniform(3.5, 5.0), 6),
+        },
+    }
+
+
+def synthetic_schedule(rng: random.Random, product: dict) -> dict:
+    """The matching /availability/schedules/{code} response."""
+    bands = [b["ageBand"] for b in product["pricingInfo"]["ageBands"]]
+    adult = round(rng.uniform(25, 250), 2)
+    items = []
+    for option in product["productOptions"]:
+        seasons = []
+        for season in range(rng.randint(1, 3)):
+            details = []
+            for band in bands:
+                price: dict = {"original": {"recommendedRetailPrice": 0.0 if band == "INFANT" else adult}}
+                if rng.random() < 0.15:
+                    price["special"] = {"recommendedRetailPrice": round(adult * 0.9, 2), "percentageOff": 10}
+                details.append({"pricingPackageType": "PER_PERSON", "minTravelers": 0, "ageBand": band, "price": price})
+            seasons.append({
+                "startDate": f"2026-{season * 4 + 1:02d}-01",
+                "endDate": f"2026-{season * 4 + 4:02d}-28",
+                "pricingRecords": [{
+                    "daysOfWeek": rng.sample(DAYS, rng.randint(3, 7)),
+                    "timedEntries": [{"startTime": f"{h:02d}:00"} for h in sorted(rng.sample(range(8, 20), rng.randint(1, 5)))],
+                    "pricingDetails": details,
+                }],
+            })
+        items.append({"productOptionCode": option["productOptionCode"], "seasons": seasons})
+    return {
+        "productCode": product["productCode"],
+        "currency": "USD",
+        "summary": {"fromPrice": adult, "fromPriceBeforeDiscount": adult},
+        "bookableItems": items,
+    }
+
+
+def synthetic_path_a_product(rng: random.Random, viator_product: dict | None) -> dict:
+    """A Path A product: a retitled copy of ``viator_product``, or website-only when None."""
+    if viator_product is not None:
+        words = viator_product["title"].split()
+        rng.shuffle(words)
+        title = " ".join(words[: max(2, len(words) - 1)] + ["Tour"])
+        duration = viator_product["itinerary"]["duration"]["fixedDurationInMinutes"] + rng.choice([0, 0, 10, 30])
+    else:
+        title = f"{rng.choice(TITLE_WORDS)} Exclusive Package {rng.randint(1, 999)}"
+        duration = rng.choice([60, 120, 240])
+    features = (
+        [{"type": "INCLUSION", "value": v} for v in rng.sample(FEATURE_PHRASES, rng.randint(2, 6))]
+        + [{"type": "EXCLUSION", "value": v} for v in rng.sample(FEATURE_PHRASES, rng.randint(0, 3))]
+        + [{"type": "HIGHLIGHT", "value": _sentence(rng, 6)} for _ in range(rng.randint(0, 3))]
+    )
+    adult = rng.randint(2500, 25000)
+    return {
+        "title": title,
+        "shortDescription": _sentence(rng, 12),
+        "description": " ".join(_sentence(rng, 12) for _ in range(rng.randint(2, 6))),
+        "pricingModel": "PER_UNIT",
+        "currency": "USD",
+        "priceByUnit": [
+            {"unitType": "adult", "label": "Adult (13+)", "amount": adult},
+            {"unitType": "child", "label": "Youth (4-12)", "amount": adult // 2},
+            {"unitType": "infant", "label": "Kid (3 and under)", "amount": 0},
+        ],
+        "duration": duration,
+        "durationDisplay": f"{duration // 60} hours" if duration >= 120 else f"{duration} minutes",
+        "cancellationPolicy": rng.choice([None, "Full refund up to 24 hours before departure."]),
+        "features": features,
+        "locations": [{"type": "START", "name": _sentence(rng, 4)} for _ in range(rng.randint(0, 2))],
+        "media": [{"url": f"https://op.example.com/img/{i}.jpg"} for i in range(rng.randint(0, 6))],
+    }
+
+
+def synthetic_operator(rng: random.Random, index: int, product_count: int) -> dict:
+    """One operator's Viator payloads plus its Path A extraction result."""
+    slug = f"synthetic_operator_{index:05d}"
+    supplier = f"Synthetic Tours {index}"
+    products = [synthetic_viator_product(rng, f"{9000 + index}P{i}", supplier) for i in range(product_count)]
+    schedules = [synthetic_schedule(rng, p) for p in products]
+    path_a_products = [
+        synthetic_path_a_product(rng, p if rng.random() < MATCH_SHARE else None) for p in products
+    ]
+    return {
+        "slug": slug,
+        "products": products,
+        "schedules": schedules,
+        "pathA": {
+            "operator": {"name": supplier, "url": f"https://{slug}.example.com"},
+            "products": path_a_products,
+            "extractionMetadata": {"model": "synthetic"},
+        },
+    }
+
+
+def iter_catalog(size: int, per_operator: int, seed: int):
+    """Yield synthetic operators until ``size`` Viator products have been generated.
+
+    Operators are generated one at a time so a 136k-product catalog never
+    has to sit in memory as raw payloads.
+    """
+    rng = random.Random(f"{seed}:{size}")
+    index = 0
+    remaining = size
+    while remaining > 0:
+        count = min(per_operator, remaining)
+        yield synthetic_operator(rng, index, count)
+        remaining -= count
+        index += 1
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+class FunctionStats:
+    """Accumulated wall time, call count and peak traced memory for one function."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.peak_bytes = 0
+
+    def timed(self, fn, *args, trace_memory: bool = False):
+        if trace_memory:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        result = fn(*args)
+        self.seconds += time.perf_counter() - started
+        self.calls += 1
+        if trace_memory:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1] - baseline)
+        return result
+
+
+def run_pass(size: int, per_operator: int, seed: int, trace_memory: bool) -> tuple[dict[str, FunctionStats], int]:
+    """Push one synthetic catalog through the mapping + comparison path.
+
+    Returns per-function stats and the length of the generated report.
+    """
+    stats = {name: FunctionStats() for name in BENCHMARKED}
+    comparisons: dict[str, dict] = {}
+    discoveries: dict[str, dict] = {}
+    operators: list[dict] = []
+
+    for op in iter_catalog(size, per_operator, seed):
+        slug = op["slug"]
+        mapped = [
+            stats["map_viator_to_octo"].timed(map_viator_to_octo, product, schedule, trace_memory=trace_memory)
+            for product, schedule in zip(op["products"], op["schedules"])
+        ]
+        comp = stats["compare_operator"].timed(compare_operator, slug, op["pathA"], mapped, trace_memory=trace_memory)
+        comparisons[slug] = comp
+
+        # Re-run each matched pair through the single-pair entry point
+        by_title_a = {p["title"]: p for p in op["pathA"]["products"]}
+        by_title_c = {p["title"]: p for p in mapped}
+        for match in comp["productMatches"]:
+            stats["_compare_products"].timed(
+                _compare_products,
+                by_title_a[match["pathA_title"]], by_title_c[match["pathC_title"]], match["matchScore"],
+                trace_memory=trace_memory,
+            )
+
+        operators.append({"slug": slug})
+        discoveries[slug] = {
+            "operator": {"slug": slug},
+            "matched_products": {p["productCode"]: {"productCode": p["productCode"], "title": p["title"]} for p in mapped},
+            "product_codes": [p["productCode"] for p in mapped],
+        }
+
+    report = stats["generate_report"].timed(generate_report, comparisons, discoveries, operators, trace_memory=trace_memory)
+    return stats, len(report)
+
+
+def benchmark_size(size: int, per_operator: int, seed: int, repeat: int, trace_memory: bool) -> dict:
+    """Timings from the fastest of ``repeat`` passes, plus one traced pass for memory.
+
+    The whole fastest pass (lowest total seconds) is kept, so every number
+    reported for a size comes from the same run.
+    """
+    best: dict[str, FunctionStats] | None = None
+    report_chars = 0
+    for _ in range(repeat):
+        stats, chars = run_pass(size, per_operator, seed, trace_memory=False)
+        if best is None or sum(s.seconds for s in stats.values()) < sum(s.seconds for s in best.values()):
+            best, report_chars = stats, chars
+
+    peaks: dict[str, int | None] = {name: None for name in BENCHMARKED}
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            traced, _ = run_pass(size, per_operator, seed, trace_memory=True)
+        finally:
+            tracemalloc.stop()
+        peaks = {name: s.peak_bytes for name, s in traced.items()}
+
+    matched_pairs = best["_compare_products"].calls
+    functions = {}
+    for name in BENCHMARKED:
+        s = best[name]
+        unit = THROUGHPUT_UNITS[name]
+        items = matched_pairs if unit == "pairs" else size
+        functions[name] = {
+            "seconds": round(s.seconds, 4),
+            "calls": s.calls,
+            "usPerCall": round(s.seconds / s.calls * 1e6, 2) if s.calls else None,
+            "perSecond": round(items / s.seconds) if s.seconds else None,
+            "throughputUnit": unit,
+            "peakBytes": peaks[name],
+        }
+    functions["generate_report"]["reportChars"] = report_chars
+
+    return {
+        "products": size,
+        "operators": -(-size // per_operator),
+        "matchedPairs": matched_pairs,
+        "totalSeconds": round(sum(f["seconds"] for f in functions.values()), 4),
+        "functions": functions,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _mb(value: int | None) -> str:
+    return f"{value / 1e6:8.1f}" if value is not None else "       —"
+
+
+def print_size(result: dict):
+    print(
+        f"\n  {result['products']:,} products, {result['operators']:,} operators, "
+        f"{result['matchedPairs']:,} matched pairs"
+    )
+    print(f"    {'function':20s} {'seconds':>9s} {'calls':>9s} {'us/call':>10s} {'throughput':>21s} {'peak MB':>8s}")
+    for name, f in result["functions"].items():
+        us = f"{f['usPerCall']:10.1f}" if f["usPerCall"] is not None else f"{'—':>10s}"
+        rate = f"{f['perSecond']:12,} {f['throughputUnit'] + '/s':>8s}" if f["perSecond"] is not None else f"{'—':>21s}"
+        print(f"    {name:20s} {f['seconds']:9.3f} {f['calls']:9,} {us} {rate} {_mb(f['peakBytes'])}")
+
+
+def print_baseline_comparison(results: list[dict], baseline: dict):
+    """Per-function time ratios against an earlier run (>1.00x is slower now)."""
+    earlier = {r["products"]: r for r in baseline.get("results", [])}
+    print()
+    print("-" * 60)
+    print(f"VS BASELINE {baseline.get('commit') or '?'} ({baseline.get('generatedAt', '?')[:10]})")
+    print("-" * 60)
+    for result in results:
+        before = earlier.get(result["products"])
+        if not before:
+            print(f"  {result['products']:,} products: not in baseline")
+            continue
+        parts = []
+        for name, f in result["functions"].items():
+            old = before["functions"].get(name, {}).get("seconds")
+            if old:
+                parts.append(f"{name} {f['seconds'] / old:.2f}x")
+        print(f"  {result['products']:>9,} products: " + ", ".join(parts))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def parse_sizes(value: str) -> list[int]:
+    try:
+        sizes = [int(part.replace("_", "")) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated product counts, got {value!r}")
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError("sizes must be positive")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark viator_compare.py's mapping and comparison path on synthetic catalogs.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/bench_viator.py
+  python scripts/bench_viator.py --sizes 100,1000 --repeat 5
+  python scripts/bench_viator.py --baseline results/benchmarks/viator_1a2b3c4.json
+        """,
+    )
+    parser.add_argument(
+        "--sizes", type=parse_sizes, default=DEFAULT_SIZES,
+        help=f"Comma-separated catalog sizes in products (default: {','.join(map(str, DEFAULT_SIZES))}).",
+    )
+    parser.add_argument(
+        "--per-operator", type=int, default=DEFAULT_PRODUCTS_PER_OPERATOR,
+        help=f"Viator products per synthetic operator (default: {DEFAULT_PRODUCTS_PER_OPERATOR}).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1,
+        help="Timed passes per size; the fastest is kept (default: 1).",
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Catalog generator seed.")
+    parser.add_argument(
+        "--no-memory", action="store_true",
+        help="Skip the tracemalloc pass (timings only, roughly half the run time).",
+    )
+    parser.add_argument("--output", type=Path, help="Results JSON path (default: results/benchmarks/viator_<commit>.json).")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare timings against.")
+    args = parser.parse_args()
+
+    if args.per_operator < 1 or args.repeat < 1:
+        print("ERROR: --per-operator and --repeat must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = None
+    if args.baseline:
+        if not args.baseline.exists():
+            print(f"ERROR: Baseline not found: {args.baseline}", file=sys.stderr)
+            sys.exit(1)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    commit = git_commit()
+
+    print("=" * 60)
+    print("VIATOR MAPPING + COMPARISON BENCHMARK")
+    print("=" * 60)
+    print(f"  Sizes:        {', '.join(f'{s:,}' for s in args.sizes)} products")
+    print(f"  Per operator: {args.per_operator}")
+    print(f"  Repeat:       best of {args.repeat}")
+    print(f"  Memory:       {'skipped' if args.no_memory else 'tracemalloc pass'}")
+    print(f"  Commit:       {commit or 'unknown'}")
+
+    results = []
+    started = time.perf_counter()
+    for size in args.sizes:
+        result = benchmark_size(size, args.per_operator, args.seed, args.repeat, trace_memory=not args.no_memory)
+        print_size(result)
+        results.append(result)
+
+    output = {
+        "benchmark": "viator_compare",
+        "commit": commit,
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "perOperator": args.per_operator,
+        "repeat": args.repeat,
+        "wallSeconds": round(time.perf_counter() - started, 2),
+        # ru_maxrss is KiB on Linux
+        "maxRssBytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "results": results,
+    }
+
+    if baseline:
+        print_baseline_comparison(results, baseline)
+
+    out_path = args.output or BENCHMARKS_DIR / f"viator_{commit or 'uncommitted'}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\n  Results saved to: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Record/replay cassettes for external API calls.
+
+With --record DIR, every Firecrawl (app.scrape, app.extract), Claude
+(messages.create, messages.stream, messages.count_tokens), Viator
+(ViatorClient._request) and crawl planner robots.txt / sitemap response is
+saved under DIR, keyed by a hash of the request. With --replay DIR the same
+calls are served from DIR instead — no API keys, network or credits needed —
+so whole pipeline runs are reproducible offline and performance changes can
+be measured end to end. Replayed calls sleep for their recorded latency by
+default (--replay-latency).
+
+Shared by extract_operator.py, firecrawl_extract.py and viator_compare.py:
+
+    # Record a live run, then replay it offline at recorded speed
+    python scripts/extract_operator.py --url https://www.toursnorthwest.com/tours/ \\
+        --record cassettes/tours_northwest
+    python scripts/extract_operator.py --url https://www.toursnorthwest.com/tours/ \\
+        --replay cassettes/tours_northwest --refresh --force-extract
+
+    # Replay with no injected latency, or a fixed 0.5s per call
+    python scripts/viator_compare.py --replay cassettes/viator --replay-latency none
+    python scripts/viator_compare.py --replay cassettes/viator --replay-latency 0.5
+
+Layout:
+    DIR/<api>/<request-hash>.json   — {api, request, response, seconds, recordedAt}
+
+A replayed request with no recording fails with CassetteMiss; re-record
+after changing prompts, models or page sets. Message batches are not
+recorded.
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+
+# ---------------------------------------------------------------------------
+# Cassette state
+# ---------------------------------------------------------------------------
+
+# Active cassette: mode is None (live), "record" or "replay"; latency is
+# "recorded", "none" or a fixed number of seconds per call
+CASSETTE: dict = {"mode": None, "dir": None, "latency": "recorded", "lock": threading.Lock()}
+
+
+class CassetteMiss(LookupError):
+    """A replayed request has no recording in the cassette directory."""
+
+
+def replay_latency(value: str) -> str:
+    """argparse type for --replay-latency: 'recorded', 'none' or non-negative seconds."""
+    if value in ("recorded", "none"):
+        return value
+    try:
+        if float(value) >= 0:
+            return value
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"expected 'recorded', 'none' or seconds >= 0, got {value!r}")
+
+
+def configure(mode: str | None, directory: Path | None = None, latency: str = "recorded"):
+    """Switch every wrapped client to ``mode`` ("record", "replay" or None for live)."""
+    if mode is not None and directory is None:
+        raise ValueError("a cassette directory is required to record or replay")
+    try:
+        replay_latency(latency)
+    except argparse.ArgumentTypeError as e:
+        raise ValueError(str(e)) from None
+    CASSETTE.update(mode=mode, dir=Path(directory) if directory else None, latency=latency)
+    if mode == "replay":
+        # Replayed calls cost nothing; keep them out of the spend ledger
+        from api_ledger import set_ledger_path
+        set_ledger_path(None)
+
+
+def replaying() -> bool:
+    return CASSETTE["mode"] == "replay"
+
+
+def add_cassette_arguments(parser):
+    """The --record / --replay / --replay-latency options, shared by every script."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--record", type=Path, metavar="DIR",
+        help="Save every external API response under DIR for later --replay.",
+    )
+    group.add_argument(
+        "--replay", type=Path, metavar="DIR",
+        help="Serve external API calls from responses recorded in DIR (offline, no keys).",
+    )
+    parser.add_argument(
+        "--replay-latency", type=replay_latency, default="recorded",
+        help="With --replay: 'recorded' (default), 'none', or fixed seconds per call.",
+    )
+
+
+def configure_from_args(args):
+    if args.record:
+        configure("record", args.record)
+    elif args.replay:
+        configure("replay", args.replay, args.replay_latency)
+
+
+# ---------------------------------------------------------------------------
+# Recording / replay
+# ---------------------------------------------------------------------------
+
+def to_jsonable(value):
+    """Plain JSON data from SDK response objects (pydantic models or attribute bags)."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if hasattr(value, "__dict__"):
+        return {k: to_jsonable(v) for k, v in vars(value).items() if not k.startswith("_")}
+    return value
+
+
+def to_namespace(value):
+    """Attribute access over recorded JSON, standing in for SDK response objects."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [to_namespace(v) for v in value]
+    return value
+
+
+def cassette_path(api: str, request: dict) -> Path:
+    key = hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return CASSETTE["dir"] / api / f"{key[:24]}.json"
+
+
+def replay_delay(recorded_seconds: float) -> float:
+    latency = CASSETTE["latency"]
+    if latency == "recorded":
+        return recorded_seconds
+    if latency == "none":
+        return 0.0
+    return float(latency)
+
+
+def save_recording(api: str, request: dict, response, seconds: float):
+    path = cassette_path(api, request)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with CASSETTE["lock"], open(path, "w") as f:
+        json.dump({
+            "api": api,
+            "request": request,
+            "response": response,
+            "seconds": round(seconds, 4),
+            "recordedAt": datetime.now(timezone.utc).isoformat(),
+        }, f, indent=2, ensure_ascii=False, default=str)
+
+
+def load_recording(api: str, request: dict) -> dict:
+    path = cassette_path(api, request)
+    if not path.exists():
+        raise CassetteMiss(f"no recorded {api} response for this request in {CASSETTE['dir']} ({path.name})")
+    with open(path) as f:
+        return json.load(f)
+
+
+def cassette_call(api: str, request: dict, call, encode=to_jsonable, decode=lambda data: data):
+    """Run ``call()`` live, recording its response, or serve it from the cassette.
+
+    ``encode`` turns the live response into JSON data; ``decode`` turns the
+    recorded data back into what callers expect.
+    """
+    mode = CASSETTE["mode"]
+    if mode == "replay":
+        recording = load_recording(api, request)
+        time.sleep(replay_delay(recording["seconds"]))
+        return decode(recording["response"])
+    started = time.monotonic()
+    response = call()
+    if mode == "record":
+        save_recording(api, request, encode(response), time.monotonic() - started)
+    return response
+
+
+# ---------------------------------------------------------------------------
+# Client wrappers
+# ---------------------------------------------------------------------------
+
+class RecordedModel(SimpleNamespace):
+    """Replayed pydantic response: attribute access plus model_dump()."""
+
+    def model_dump(self, **kwargs) -> dict:
+        return to_jsonable(vars(self))
+
+
+class CassetteFirecrawl:
+    """FirecrawlApp proxy recording/replaying scrape and extract."""
+
+    def __init__(self, app):
+        self._app = app
+
+    def scrape(self, url: str, **kwargs):
+        return cassette_call(
+            "firecrawl_scrape", {"url": url, **kwargs},
+            lambda: self._app.scrape(url, **kwargs),
+            encode=lambda doc: {"markdown": doc.markdown, "raw_html": getattr(doc, "raw_html", None)},
+            decode=lambda data: SimpleNamespace(**data),
+        )
+
+    def extract(self, **kwargs):
+        return cassette_call(
+            "firecrawl_extract", kwargs,
+            lambda: self._app.extract(**kwargs),
+            decode=lambda data: RecordedModel(**data),
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+
+class _RecordingStream:
+    """Wraps a live messages.stream() context, capturing its text chunks."""
+
+    def __init__(self, manager, request: dict):
+        self._manager = manager
+        self._request = request
+        self._chunks: list[str] = []
+
+    def __enter__(self):
+        self._started = time.monotonic()
+        self._stream = self._manager.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._manager.__exit__(*exc)
+
+    @property
+    def text_stream(self):
+        for text in self._stream.text_stream:
+            self._chunks.append(text)
+            yield text
+
+    def get_final_message(self):
+        message = self._stream.get_final_message()
+        if CASSETTE["mode"] == "record":
+            save_recording(
+                "claude_stream", self._request,
+                {"chunks": self._chunks, "message": to_jsonable(message)},
+                time.monotonic() - self._started,
+            )
+        return message
+
+
+class _ReplayedStream:
+    """Serves a recorded stream, spreading its latency across the chunks."""
+
+    def __init__(self, recording: dict):
+        self._chunks = recording["response"]["chunks"]
+        self._message = to_namespace(recording["response"]["message"])
+        self._delay = replay_delay(recording["seconds"]) / max(1, len(self._chunks))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        for text in self._chunks:
+            time.sleep(self._delay)
+            yield text
+
+    def get_final_message(self):
+        return self._message
+
+
+class _CassetteMessages:
+    def __init__(self, messages):
+        self._messages = messages
+
+    def create(self, **kwargs):
+        return cassette_call(
+            "claude_create", kwargs,
+            lambda: self._messages.create(**kwargs),
+            decode=to_namespace,
+        )
+
+    def count_tokens(self, **kwargs):
+        return cassette_call(
+            "claude_count_tokens", kwargs,
+            lambda: self._messages.count_tokens(**kwargs),
+            decode=to_namespace,
+        )
+
+    def stream(self, **kwargs):
+        if CASSETTE["mode"] == "replay":
+            return _ReplayedStream(load_recording("claude_stream", kwargs))
+        return _RecordingStream(self._messages.stream(**kwargs), kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._messages, name)
+
+
+class CassetteAnthropic:
+    """anthropic.Anthropic proxy recording/replaying messages.create, .stream and .count_tokens."""
+
+    def __init__(self, client):
+        self._client = client
+        self.messages = _CassetteMessages(client.messages)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def wrap_firecrawl(app):
+    """``app`` routed through the active cassette (unchanged when live)."""
+    return app if CASSETTE["mode"] is None else CassetteFirecrawl(app)
+
+
+def wrap_anthropic(client):
+    """``client`` routed through the active cassette (unchanged when live)."""
+    return client if CASSETTE["mode"] is None else CassetteAnthropic(client)
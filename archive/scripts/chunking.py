@@ -0,0 +1,343 @@
+"""
+Chunked extraction — token-budgeted page groups extracted concurrently and
+merged back into one result.
+"""
+
+import contextvars
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from api_ledger import ledger_call
+from claude_costs import ledger_usage, usage_tokens
+from extraction_common import CHARS_PER_TOKEN, MAX_TOKENS, TEMPERATURE, api_slot, estimate_tokens
+from page_reduction import build_user_content
+from response_parsing import parse_response
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Chunked extraction: max user-message tokens per chunk, and concurrent
+# Claude calls
+DEFAULT_CHUNK_TOKENS = 30_000
+DEFAULT_CHUNK_WORKERS = 4
+PAGE_HEADER_TOKENS = 40
+
+
+# ---------------------------------------------------------------------------
+# Chunking
+#
+# Large operators overflow the context window or truncate at MAX_TOKENS when
+# every page goes into one message. Chunked mode packs pages into groups that
+# fit a token budget, extracts each group in its own concurrent Claude call,
+# and merges the partial results.
+# ---------------------------------------------------------------------------
+
+def split_page(page: dict, token_budget: int) -> list[dict]:
+    """Split a page too large for one chunk into parts on paragraph breaks."""
+    max_chars = int(token_budget * CHARS_PER_TOKEN)
+    if len(page["markdown"]) <= max_chars:
+        return [page]
+
+    bodies: list[str] = []
+    current = ""
+    for para in page["markdown"].split("\n\n"):
+        # A single oversized paragraph (e.g. a giant table) is hard-split
+        while len(para) > max_chars:
+            if current:
+                bodies.append(current)
+                current = ""
+            bodies.append(para[:max_chars])
+            para = para[max_chars:]
+        if current and len(current) + len(para) + 2 > max_chars:
+            bodies.append(current)
+            current = ""
+        current = f"{current}\n\n{para}" if current else para
+    if current:
+        bodies.append(current)
+
+    return [
+        {**page, "markdown": body, "chars": len(body), "part": (k, len(bodies))}
+        for k, body in enumerate(bodies, 1)
+    ]
+
+
+def chunk_pages(pages: list[dict], token_budget: int, first_chunk_reserve: int = 0) -> list[list[dict]]:
+    """Greedily pack pages, in order, into chunks of at most ``token_budget`` tokens.
+
+    ``first_chunk_reserve`` holds back room in the first chunk for content
+    only it carries (the raw HTML section).
+    """
+    chunks: list[list[dict]] = []
+    current: list[dict] = []
+    used = first_chunk_reserve
+
+    for page in pages:
+        for part in split_page(page, max(1, token_budget - PAGE_HEADER_TOKENS)):
+            cost = estimate_tokens(part["markdown"]) + PAGE_HEADER_TOKENS
+            if current and used + cost > token_budget:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(part)
+            used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def plan_chunks(
+    pages: list[dict],
+    include_raw_html: bool,
+    token_budget: int = DEFAULT_CHUNK_TOKENS,
+    site_chrome: list[str] | None = None,
+) -> list[list[dict]]:
+    """chunk_pages with room held back in the first chunk for its raw HTML and site chrome."""
+    reserve = 0
+    if pages and (include_raw_html or site_chrome):
+        first_only = build_user_content(pages[:1], include_raw_html, site_chrome)
+        reserve = estimate_tokens(first_only) - estimate_tokens(build_user_content(pages[:1], False))
+    return chunk_pages(pages, token_budget, first_chunk_reserve=reserve)
+
+
+def chunk_user_content(
+    chunk: list[dict], include_raw_html: bool, site_chrome: list[str] | None, first: bool,
+) -> str:
+    """The user message for one chunk; only the first carries raw HTML and site chrome."""
+    return build_user_content(chunk, include_raw_html and first, site_chrome if first else None)
+
+
+def extract_chunked(
+    client,
+    operator_slug: str,
+    pages: list[dict],
+    model: str,
+    system_blocks: list[dict],
+    include_raw_html: bool,
+    token_budget: int = DEFAULT_CHUNK_TOKENS,
+    workers: int = DEFAULT_CHUNK_WORKERS,
+    site_chrome: list[str] | None = None,
+    max_tokens: int = MAX_TOKENS,
+) -> dict | None:
+    """Step 2 (chunked) — extract token-budgeted page groups concurrently.
+
+    The first chunk also carries the raw HTML and site chrome sections.
+    A chunk whose response hits ``max_tokens`` is split in half and re-extracted
+    so no products are lost to truncated JSON; a single page still cut off
+    is reported in ``truncated`` (the chunk labels). Returns the merged
+    result, summed token usage, wall-clock Claude time, truncated chunks and
+    chunking metadata, or None if no chunk produced a parseable result.
+    """
+    chunks = plan_chunks(pages, include_raw_html, token_budget, site_chrome)
+    print(f"  Chunks: {len(chunks)} (≤ ~{token_budget:,} tokens each, {workers} concurrent)")
+
+    print_lock = threading.Lock()
+
+    def run_chunk(label: str, chunk: list[dict], first: bool) -> list[dict]:
+        user_content = chunk_user_content(chunk, include_raw_html, site_chrome, first)
+        try:
+            with api_slot("claude"), ledger_call("claude", "messages.create", model=model) as call:
+                started = time.monotonic()
+                response = client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=TEMPERATURE,
+                    system=system_blocks,
+                    messages=[{"role": "user", "content": user_content}],
+                )
+                elapsed = time.monotonic() - started
+                ledger_usage(call, model, response)
+        except Exception as e:
+            with print_lock:
+                print(f"  Chunk {label}: ERROR: Claude API call failed: {e}", file=sys.stderr)
+            return [{"label": label, "error": str(e)}]
+        tokens = usage_tokens(response.usage)
+
+        if response.stop_reason == "max_tokens" and len(chunk) > 1:
+            with print_lock:
+                print(f"  Chunk {label}: truncated at {max_tokens:,} tokens, splitting {len(chunk)} pages in half")
+            half = len(chunk) // 2
+            return (
+                [{"label": label, "tokens": tokens, "seconds": elapsed, "superseded": True}]
+                + run_chunk(f"{label}a", chunk[:half], first)
+                + run_chunk(f"{label}b", chunk[half:], False)
+            )
+
+        with print_lock:
+            print(
+                f"  Chunk {label}: {len(chunk)} page(s), {len(user_content):,} chars -> "
+                f"{tokens['input']:,} in / {tokens['output']:,} out ({elapsed:.1f}s)"
+            )
+            if response.stop_reason == "max_tokens":
+                print(f"  Chunk {label}: WARNING: single page still truncated at {max_tokens:,} tokens")
+        return [{
+            "label": label, "text": response.content[0].text, "tokens": tokens, "seconds": elapsed,
+            "truncated": response.stop_reason == "max_tokens",
+        }]
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, run_chunk, str(i), chunk, i == 1)
+            for i, chunk in enumerate(chunks, 1)
+        ]
+        outcomes = [o for f in futures for o in f.result()]
+    claude_seconds = time.monotonic() - started
+
+    tokens = {"input": 0, "output": 0, "cacheWrite": 0, "cacheRead": 0}
+    parsed: list[dict] = []
+    failed: list[str] = []
+    truncated: list[str] = []
+    for outcome in outcomes:
+        for key in tokens:
+            tokens[key] += outcome.get("tokens", {}).get(key, 0)
+        if outcome.get("superseded"):
+            continue
+        if "error" in outcome:
+            failed.append(outcome["label"])
+            continue
+        if outcome["truncated"]:
+            truncated.append(outcome["label"])
+        result = parse_response(operator_slug, outcome["text"], raw_suffix=f"_chunk{outcome['label']}")
+        if result is None:
+            failed.append(outcome["label"])
+        else:
+            parsed.append(result)
+
+    if not parsed:
+        print("ERROR: No chunk produced a parseable result.", file=sys.stderr)
+        return None
+    if failed:
+        print(f"  WARNING: {len(failed)} chunk(s) failed: {', '.join(failed)}")
+
+    merged = merge_extractions(parsed)
+    products_before = sum(len(r.get("products") or []) for r in parsed)
+    print(f"  Merged: {products_before} products from {len(parsed)} chunk(s) -> {len(merged['products'])} unique")
+
+    return {
+        "result": merged,
+        "tokens": tokens,
+        "claude_seconds": claude_seconds,
+        "truncated": truncated,
+        "metadata": {
+            "chunking": {
+                "tokenBudget": token_budget,
+                "chunks": len(chunks),
+                "calls": len(outcomes),
+                "failedChunks": failed,
+                "truncatedChunks": truncated,
+                "productsBeforeMerge": products_before,
+            },
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Merging chunk results
+# ---------------------------------------------------------------------------
+
+def _is_blank(value) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def merge_fields(base: dict, extra: dict) -> dict:
+    """Fill gaps in ``base`` from ``extra``; the first non-empty value wins.
+
+    Nested dicts merge recursively and lists of plain values are unioned;
+    lists of objects (price tables, FAQs) are kept from whichever chunk
+    supplied them first.
+    """
+    for key, value in extra.items():
+        if _is_blank(value):
+            continue
+        current = base.get(key)
+        if _is_blank(current):
+            base[key] = value
+        elif isinstance(current, dict) and isinstance(value, dict):
+            merge_fields(current, value)
+        elif (
+            isinstance(current, list) and isinstance(value, list)
+            and not any(isinstance(v, (dict, list)) for v in current + value)
+        ):
+            base[key] = current + [v for v in value if v not in current]
+    return base
+
+
+def normalize_title(title) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", str(title or "").lower()).split())
+
+
+def normalize_url(url) -> str:
+    parsed = urlparse(str(url or "").strip())
+    if not parsed.netloc:
+        return ""
+    host = parsed.netloc.lower().removeprefix("www.")
+    return f"{host}{parsed.path.rstrip('/')}"
+
+
+def _titles_compatible(a: str, b: str) -> bool:
+    """True if two normalized titles could name the same product."""
+    if not a or not b:
+        return True
+    words_a, words_b = set(a.split()), set(b.split())
+    return len(words_a & words_b) / min(len(words_a), len(words_b)) > 0.5
+
+
+def merge_products(product_lists: list[list[dict]]) -> list[dict]:
+    """Combine products from every chunk, deduping by title and URL.
+
+    Two products are the same if their normalized titles match, or if they
+    share a product URL and their titles overlap ("Mt Rainier Tour" vs
+    "Mount Rainier Day Tour"). A URL shared by several products within one
+    chunk is a listing page, not a product page, so it is not used as a key.
+    """
+    merged: list[dict] = []
+    by_title: dict[str, int] = {}
+    by_url: dict[str, int] = {}
+
+    for products in product_lists:
+        url_counts: dict[str, int] = {}
+        for product in products:
+            url = normalize_url(product.get("url"))
+            url_counts[url] = url_counts.get(url, 0) + 1
+
+        for product in products:
+            title = normalize_title(product.get("title"))
+            url = normalize_url(product.get("url"))
+            if url_counts.get(url, 0) > 1:
+                url = ""
+
+            index = by_title.get(title) if title else None
+            if index is None and url in by_url:
+                candidate = by_url[url]
+                if _titles_compatible(title, normalize_title(merged[candidate].get("title"))):
+                    index = candidate
+            if index is None:
+                index = len(merged)
+                merged.append(json.loads(json.dumps(product)))
+            else:
+                merge_fields(merged[index], product)
+
+            if title:
+                by_title.setdefault(title, index)
+            if url:
+                by_url.setdefault(url, index)
+
+    return merged
+
+
+def merge_extractions(results: list[dict]) -> dict:
+    """Merge per-chunk extraction results into one operator result."""
+    merged: dict = {"operator": {}, "products": []}
+    for result in results:
+        merge_fields(merged["operator"], result.get("operator") or {})
+        for key, value in result.items():
+            if key not in ("operator", "products"):
+                merge_fields(merged, {key: value})
+    merged["products"] = merge_products([r.get("products") or [] for r in results])
+    return merged
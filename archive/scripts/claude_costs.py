@@ -0,0 +1,114 @@
+"""
+Claude API pricing — per-call cost from token counts, with prompt-cache and
+Message Batches discounts, and the usage bookkeeping shared by the
+streaming, chunked, repair and batch calls.
+"""
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Prompt caching multipliers on the input rate: writing the cached prefix
+# costs 1.25x, reading it back costs 0.1x
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.10
+
+# Message Batches API requests are billed at half the standard rate
+BATCH_PRICE_MULTIPLIER = 0.5
+
+# Claude API pricing ($ per million tokens)
+CLAUDE_PRICING = {
+    "claude-opus-4-6": {"input": 15.0, "output": 75.0},
+    "claude-sonnet-4-5-20250929": {"input": 3.0, "output": 15.0},
+    "claude-haiku-4-5-20251001": {"input": 0.80, "output": 4.0},
+}
+
+
+# ---------------------------------------------------------------------------
+# Costs
+# ---------------------------------------------------------------------------
+
+def claude_cost_usd(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_write_tokens: int = 0,
+    cache_read_tokens: int = 0,
+    batch: bool = False,
+) -> float:
+    """Claude API cost in dollars; input_tokens excludes cached prefix tokens."""
+    rates = CLAUDE_PRICING.get(model, {"input": 3.0, "output": 15.0})
+    input_cost = (
+        input_tokens
+        + cache_write_tokens * CACHE_WRITE_MULTIPLIER
+        + cache_read_tokens * CACHE_READ_MULTIPLIER
+    ) * rates["input"]
+    cost = (input_cost + output_tokens * rates["output"]) / 1_000_000
+    return cost * BATCH_PRICE_MULTIPLIER if batch else cost
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_write_tokens: int = 0,
+    cache_read_tokens: int = 0,
+    batch: bool = False,
+) -> str:
+    """Estimate Claude API cost from token counts."""
+    cost = claude_cost_usd(
+        model, input_tokens, output_tokens, cache_write_tokens, cache_read_tokens, batch=batch,
+    )
+    return format_usd(cost)
+
+
+def format_usd(amount: float) -> str:
+    """Format a dollar amount, sign before the currency symbol (-$0.01)."""
+    return f"-${-amount:.2f}" if amount < 0 else f"${amount:.2f}"
+
+
+def cache_savings(model: str, tokens: dict, batch: bool = False) -> tuple[float, float]:
+    """Return (savings, uncached cost) for a call that used the prompt cache."""
+    # What the same call would have cost with every prompt token billed as plain input
+    uncached = claude_cost_usd(
+        model, tokens["input"] + tokens["cacheWrite"] + tokens["cacheRead"], tokens["output"],
+        batch=batch,
+    )
+    actual = claude_cost_usd(
+        model, tokens["input"], tokens["output"], tokens["cacheWrite"], tokens["cacheRead"],
+        batch=batch,
+    )
+    return uncached - actual, uncached
+
+
+# ---------------------------------------------------------------------------
+# Usage
+# ---------------------------------------------------------------------------
+
+def usage_tokens(usage) -> dict:
+    """Normalize a Claude usage object into plain token counts."""
+    return {
+        "input": usage.input_tokens,
+        "output": usage.output_tokens,
+        "cacheWrite": getattr(usage, "cache_creation_input_tokens", None) or 0,
+        "cacheRead": getattr(usage, "cache_read_input_tokens", None) or 0,
+    }
+
+
+def ledger_usage(call: dict, model: str, message, batch: bool = False):
+    """Fill a ledger_call record with a Claude message's tokens and cost."""
+    tokens = usage_tokens(message.usage)
+    call.update(
+        model=model,
+        tokens_in=tokens["input"],
+        tokens_out=tokens["output"],
+        cache_write=tokens["cacheWrite"],
+        cache_read=tokens["cacheRead"],
+        cost_usd=round(claude_cost_usd(
+            model, tokens["input"], tokens["output"], tokens["cacheWrite"], tokens["cacheRead"],
+            batch=batch,
+        ), 6),
+    )
+    if message.stop_reason == "max_tokens":
+        call["status"] = "truncated"
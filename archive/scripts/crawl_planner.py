@@ -0,0 +1,245 @@
+"""
+Crawl planning — pick an operator's pages from its sitemap and listing page.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+
+from api_ledger import ledger_call
+from cassettes import cassette_call
+from chunking import PAGE_HEADER_TOKENS
+from extraction_common import estimate_tokens
+from scraping import DEFAULT_SCRAPE_MAX_AGE_HOURS, cached_pages_only, scrape_pages
+
+if TYPE_CHECKING:
+    from firecrawl import FirecrawlApp
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Crawl planning: default page (= Firecrawl credit) and token budgets for the
+# pages picked from an operator's sitemap and listing page
+DEFAULT_PLAN_MAX_PAGES = 8
+DEFAULT_PLAN_TOKEN_BUDGET = 60_000
+DEFAULT_PLAN_MAX_SITEMAPS = 5
+
+
+# ---------------------------------------------------------------------------
+# Crawl planning
+#
+# Picks an operator's pages instead of hand-curating --url lists: candidate
+# URLs come from the site's sitemap(s) and the links on its listing page,
+# are deduped (query strings, fragments, trailing slashes, www.), scored as
+# likely product pages, and the best are kept within a page (credit) and
+# token budget. The listing page itself is always scraped first.
+# ---------------------------------------------------------------------------
+
+PRODUCT_PATH_RE = re.compile(
+    r"tour|cruise|experience|excursion|trip|activit|adventure|charter|"
+    r"package|escape|room|game|class|ticket|product|book",
+    re.IGNORECASE,
+)
+NON_PRODUCT_PATH_RE = re.compile(
+    r"blog|news|press|career|job|about|contact|privacy|terms|policy|login|"
+    r"account|cart|checkout|wp-|feed|tag/|category/|author/|gallery|review|"
+    r"sitemap|search|faq",
+    re.IGNORECASE,
+)
+ASSET_EXTENSIONS = (
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".pdf",
+    ".css", ".js", ".xml", ".zip", ".mp4", ".ico",
+)
+MARKDOWN_LINK_RE = re.compile(r"\]\((https?://[^)\s]+|/[^)\s]*)")
+
+
+def canonical_page_url(url: str) -> str:
+    """Collapse URL variants that serve the same page: query, fragment, trailing slash."""
+    parsed = urlparse(url.strip())
+    path = re.sub(r"/(index|default)\.(html?|php|aspx?)$", "/", parsed.path or "/")
+    path = path.rstrip("/") + "/" if not re.search(r"\.\w+$", path) else path
+    return f"{parsed.scheme or 'https'}://{parsed.netloc.lower()}{path}"
+
+
+def fetch_site_file(url: str) -> dict:
+    """GET one robots.txt or sitemap: {"status", "text", "error"}, recorded/replayed like every API call.
+
+    Network errors and non-2xx responses come back in the dict rather than
+    raised, so they replay the same way. A replay with no recording raises
+    CassetteMiss.
+    """
+    def fetch() -> dict:
+        import requests
+
+        endpoint = "GET robots.txt" if url.endswith("/robots.txt") else "GET sitemap"
+        with ledger_call("site", endpoint) as call:
+            try:
+                response = requests.get(url, timeout=15)
+            except requests.RequestException as e:
+                call.update(status="error", error=f"{type(e).__name__}: {e}"[:500])
+                return {"status": None, "text": "", "error": str(e)}
+            if not response.ok:
+                call.update(status="error", error=f"HTTP {response.status_code}")
+            return {
+                "status": response.status_code,
+                "text": response.content.decode("utf-8", errors="replace"),
+                "error": None if response.ok else f"HTTP {response.status_code}",
+            }
+
+    return cassette_call("site", {"method": "GET", "url": url}, fetch)
+
+
+def fetch_sitemap_urls(site_url: str, max_sitemaps: int = DEFAULT_PLAN_MAX_SITEMAPS) -> list[str]:
+    """Page URLs from the site's sitemap(s): robots.txt entries or /sitemap.xml.
+
+    Sitemap indexes are followed up to ``max_sitemaps`` files. Missing or
+    malformed sitemaps just yield fewer URLs.
+    """
+    parsed = urlparse(site_url)
+    root = f"{parsed.scheme}://{parsed.netloc}"
+    robots = fetch_site_file(f"{root}/robots.txt")
+    queue = re.findall(r"(?im)^\s*sitemap:\s*(\S+)", robots["text"]) if robots["error"] is None else []
+    queue = queue or [f"{root}/sitemap.xml"]
+
+    urls, seen = [], set()
+    while queue and len(seen) < max_sitemaps:
+        sitemap_url = queue.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        response = fetch_site_file(sitemap_url)
+        if response["error"] is not None:
+            print(f"  Sitemap {sitemap_url}: skipped ({response['error']})")
+            continue
+        try:
+            tree = ElementTree.fromstring(response["text"])
+        except ElementTree.ParseError as e:
+            print(f"  Sitemap {sitemap_url}: skipped ({e})")
+            continue
+        # Namespace-agnostic: <sitemapindex><sitemap><loc> or <urlset><url><loc>
+        for element in tree.iter():
+            if not element.tag.endswith("loc") or not (element.text or "").strip():
+                continue
+            loc = element.text.strip()
+            if tree.tag.endswith("sitemapindex"):
+                queue.append(loc)
+            else:
+                urls.append(loc)
+    return urls
+
+
+def listing_links(page: dict) -> list[str]:
+    """Absolute link targets in a scraped page's markdown."""
+    base = page["url"]
+    return [urljoin(base, link) for link in MARKDOWN_LINK_RE.findall(page.get("markdown") or "")]
+
+
+def score_candidate(url: str, listing_url: str, linked: bool, in_sitemap: bool) -> tuple[int, list[str]]:
+    """Likelihood that ``url`` is a product page, with the reasons; < 0 means skip."""
+    path = urlparse(url).path.lower()
+    if path.endswith(ASSET_EXTENSIONS) or NON_PRODUCT_PATH_RE.search(path):
+        return -1, ["excluded path"]
+    score, reasons = 0, []
+    listing_path = urlparse(listing_url).path.rstrip("/")
+    if linked:
+        score += 3
+        reasons.append("linked from listing")
+    if listing_path and path.startswith(listing_path + "/") and path.rstrip("/") != listing_path:
+        score += 2
+        reasons.append("under listing path")
+    if PRODUCT_PATH_RE.search(path):
+        score += 2
+        reasons.append("product-like path")
+    if in_sitemap:
+        score += 1
+        reasons.append("in sitemap")
+    depth = len([part for part in path.split("/") if part])
+    if depth == 0 or depth > 4:
+        score -= 2
+        reasons.append(f"depth {depth}")
+    return score, reasons
+
+
+def plan_pages(
+    app: "FirecrawlApp | None",
+    listing_url: str,
+    max_pages: int = DEFAULT_PLAN_MAX_PAGES,
+    token_budget: int = DEFAULT_PLAN_TOKEN_BUDGET,
+    include_raw_html: bool = False,
+    **scrape_kwargs,
+) -> dict:
+    """
+    Choose the pages to scrape for one operator, starting from its listing page.
+
+    The listing page is scraped for its links, then sitemap URLs on the
+    same host are added. With ``app`` None (a dry run) nothing is fetched:
+    the listing page comes from the scrape cache and sitemaps are skipped.
+    Candidates are ranked by score_candidate and taken greedily while the
+    page count stays within ``max_pages`` (1 Firecrawl credit each) and the
+    estimated tokens within ``token_budget``. Uncached pages are assumed to
+    be the size of the listing page.
+    """
+    host = (urlparse(listing_url).hostname or "").removeprefix("www.")
+    max_age_hours = scrape_kwargs.get("max_age_hours", DEFAULT_SCRAPE_MAX_AGE_HOURS)
+    if app is not None:
+        listing = scrape_pages(app, [listing_url], include_raw_html, **scrape_kwargs)
+    else:
+        listing = cached_pages_only([listing_url], include_raw_html, max_age_hours)
+    listing_page = listing["pages"][0] if listing["pages"] else {"url": listing_url, "markdown": ""}
+    listing_tokens = estimate_tokens(listing_page.get("markdown") or "") or PAGE_HEADER_TOKENS
+
+    linked = {canonical_page_url(u) for u in listing_links(listing_page)}
+    sitemap = {canonical_page_url(u) for u in fetch_sitemap_urls(listing_url)} if app is not None else set()
+    listing_key = canonical_page_url(listing_url)
+
+    candidates = []
+    for url in sorted(linked | sitemap):
+        if url == listing_key or (urlparse(url).hostname or "").removeprefix("www.") != host:
+            continue
+        score, reasons = score_candidate(url, listing_url, url in linked, url in sitemap)
+        if score > 0:
+            candidates.append({"url": url, "score": score, "reasons": reasons})
+    candidates.sort(key=lambda c: (-c["score"], c["url"]))
+
+    selected = [{"url": listing_url, "score": None, "reasons": ["listing page"], "estimatedTokens": listing_tokens}]
+    total_tokens = listing_tokens
+    for candidate in candidates:
+        if len(selected) >= max_pages:
+            break
+        cached = cached_pages_only([candidate["url"]], include_raw_html, max_age_hours)
+        tokens = estimate_tokens(cached["pages"][0]["markdown"]) if cached["pages"] else listing_tokens
+        if total_tokens + tokens > token_budget:
+            continue
+        selected.append({**candidate, "estimatedTokens": tokens})
+        total_tokens += tokens
+
+    return {
+        "listingUrl": listing_url,
+        "plannedAt": datetime.now(timezone.utc).isoformat(),
+        "listingLinks": len(linked),
+        "sitemapUrls": len(sitemap),
+        "candidates": len(candidates),
+        "maxPages": max_pages,
+        "tokenBudget": token_budget,
+        "selected": selected,
+        "estimatedTokens": total_tokens,
+        "listingCredits": listing["total_credits"],
+    }
+
+
+def print_plan(plan: dict):
+    print(
+        f"  {plan['listingLinks']} listing links + {plan['sitemapUrls']} sitemap URLs "
+        f"-> {plan['candidates']} product-like candidates"
+    )
+    print(
+        f"  Selected {len(plan['selected'])} page(s), ~{plan['estimatedTokens']:,} tokens "
+        f"(budget {plan['maxPages']} pages / {plan['tokenBudget']:,} tokens)"
+    )
+    for page in plan["selected"]:
+        reasons = ", ".join(page["reasons"])
+        print(f"    {page['url']}  (~{page['estimatedTokens']:,} tokens; {reasons})")
@@ -0,0 +1,170 @@
+"""
+Shared pieces of the Path 2 extraction pipeline (extract_operator.py).
+
+Paths, the default model and its call settings, the local token estimate,
+the operator manifest loader, and the API key / client factories every
+pipeline module uses. The Firecrawl and Anthropic SDKs are imported when a
+client is first built, not when this module is.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+from cassettes import replaying, wrap_anthropic, wrap_firecrawl
+
+if TYPE_CHECKING:
+    from firecrawl import FirecrawlApp
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = PROJECT_ROOT / "results"
+PROMPT_PATH = PROJECT_ROOT / "prompts" / "extraction_prompt_v01.md"
+
+DEFAULT_MODEL = "claude-opus-4-6"
+MAX_TOKENS = 16384
+TEMPERATURE = 0.0
+
+# Local token estimate: ~3.2 chars/token, calibrated against the Phase 0
+# runs (claudeTokensIn vs totalMarkdownChars + prompt)
+CHARS_PER_TOKEN = 3.2
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def operator_slug_from_url(url: str) -> str:
+    """Derive a filesystem-safe operator name from URL."""
+    hostname = urlparse(url.rstrip("/*")).hostname or "unknown"
+    slug = hostname.replace("www.", "").split(".")[0]
+    slug = slug.replace("-", "_")
+    return slug
+
+
+def load_extraction_prompt() -> str:
+    """Load the domain-specific extraction prompt from file."""
+    if not PROMPT_PATH.exists():
+        print(f"ERROR: Extraction prompt not found at {PROMPT_PATH}", file=sys.stderr)
+        sys.exit(1)
+    return PROMPT_PATH.read_text()
+
+
+def build_system_blocks(extraction_prompt: str, prompt_cache: bool = True) -> list[dict]:
+    """System prompt blocks, with the stable extraction prompt marked cacheable.
+
+    The extraction prompt (instructions + schema guidance) is identical for
+    every operator, so back-to-back runs read it from the prompt cache
+    instead of paying full input price and prefill latency each time.
+    """
+    block: dict = {"type": "text", "text": extraction_prompt}
+    if prompt_cache:
+        block["cache_control"] = {"type": "ephemeral"}
+    return [block]
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token count estimate (calibrated chars/token, see CHARS_PER_TOKEN)."""
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+# ---------------------------------------------------------------------------
+# API clients
+# ---------------------------------------------------------------------------
+
+def require_api_keys() -> tuple[str, str]:
+    """Load .env and return (Firecrawl key, Anthropic key), exiting if unset."""
+    if replaying():
+        return "replay", "replay"
+    load_dotenv(PROJECT_ROOT / ".env")
+
+    fc_key = os.getenv("FIRECRAWL_API_KEY")
+    if not fc_key or fc_key == "fc-your-key-here":
+        print("ERROR: FIRECRAWL_API_KEY not set in .env", file=sys.stderr)
+        sys.exit(1)
+
+    anth_key = os.getenv("ANTHROPIC_API_KEY")
+    if not anth_key or anth_key == "sk-ant-your-key-here":
+        print("ERROR: ANTHROPIC_API_KEY not set in .env", file=sys.stderr)
+        sys.exit(1)
+
+    return fc_key, anth_key
+
+
+def firecrawl_app(api_key: str) -> "FirecrawlApp":
+    """A Firecrawl client, routed through the active cassette."""
+    from firecrawl import FirecrawlApp
+
+    return wrap_firecrawl(FirecrawlApp(api_key=api_key))
+
+
+def anthropic_client(api_key: str):
+    """An Anthropic client, routed through the active cassette."""
+    import anthropic
+
+    return wrap_anthropic(anthropic.Anthropic(api_key=api_key))
+
+
+# ---------------------------------------------------------------------------
+# API limits
+# ---------------------------------------------------------------------------
+
+# Process-wide caps on in-flight API calls, set by the multi-operator runner
+API_LIMITS: dict[str, threading.BoundedSemaphore] = {}
+
+
+def set_api_limits(claude: int | None = None, firecrawl: int | None = None):
+    """Cap concurrent Claude / Firecrawl calls across every thread (None = no cap)."""
+    API_LIMITS.clear()
+    if claude:
+        API_LIMITS["claude"] = threading.BoundedSemaphore(claude)
+    if firecrawl:
+        API_LIMITS["firecrawl"] = threading.BoundedSemaphore(firecrawl)
+
+
+def api_slot(api: str):
+    """Context manager holding one of the global slots for ``api``, if capped."""
+    return API_LIMITS.get(api) or contextlib.nullcontext()
+
+
+# ---------------------------------------------------------------------------
+# Operator manifests
+# ---------------------------------------------------------------------------
+
+def load_operator_manifest(path: Path) -> list[dict]:
+    """Load operators with their page URLs from a manifest JSON file.
+
+    Uses the same manifest files as viator_compare.py; only "slug" (optional,
+    derived from the first URL) and "urls" are read here. Operators without
+    URLs are skipped.
+    """
+    if not path.exists():
+        print(f"ERROR: Operator manifest not found at {path}", file=sys.stderr)
+        sys.exit(1)
+    with open(path) as f:
+        manifest = json.load(f)
+
+    operators = []
+    seen: set[str] = set()
+    for entry in manifest.get("operators", []):
+        urls = entry.get("urls") or []
+        if not urls:
+            continue
+        slug = entry.get("slug") or operator_slug_from_url(urls[0])
+        if slug in seen:
+            print(f"ERROR: Duplicate operator slug '{slug}' in {path.name}", file=sys.stderr)
+            sys.exit(1)
+        seen.add(slug)
+        operators.append({"slug": slug, "urls": urls})
+    return operators
@@ -0,0 +1,66 @@
+"""
+Extraction options — how operators are scraped, assembled and extracted.
+
+One ExtractionOptions is built from the command line and passed to
+run_extraction, run_manifest, run_batch_extraction and run_preflight in
+place of a keyword argument per setting. Every field defaults to the CLI's
+default, so library callers only name what they change.
+"""
+
+from dataclasses import dataclass
+
+from chunking import DEFAULT_CHUNK_TOKENS, DEFAULT_CHUNK_WORKERS
+from crawl_planner import DEFAULT_PLAN_MAX_PAGES, DEFAULT_PLAN_TOKEN_BUDGET
+from extraction_common import DEFAULT_MODEL, MAX_TOKENS
+from scraping import DEFAULT_SCRAPES_PER_HOST, DEFAULT_SCRAPE_MAX_AGE_HOURS, DEFAULT_SCRAPE_WORKERS
+
+
+# ---------------------------------------------------------------------------
+# Options
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ExtractionOptions:
+    """Settings for an extraction run, shared by every operator in it."""
+
+    # Claude
+    model: str = DEFAULT_MODEL
+    max_tokens: int | None = MAX_TOKENS  # None = the preflight suggestion per operator and model
+    cascade_models: list[str] | None = None  # tiers, cheapest first; None = just ``model``
+    prompt_cache: bool = True
+    repair_products: bool = True
+    force_extract: bool = False
+
+    # Scraping
+    include_raw_html: bool = False
+    timeout: int = 60000
+    scrape_workers: int = DEFAULT_SCRAPE_WORKERS
+    scrapes_per_host: int = DEFAULT_SCRAPES_PER_HOST
+    max_age_hours: float = DEFAULT_SCRAPE_MAX_AGE_HOURS
+    refresh: bool = False
+
+    # Prompt assembly and chunking
+    strip_boilerplate: bool = True
+    chunked: bool = False
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS
+    chunk_workers: int = DEFAULT_CHUNK_WORKERS
+
+    # Crawl planning
+    plan: bool = False
+    plan_max_pages: int = DEFAULT_PLAN_MAX_PAGES
+    plan_token_budget: int = DEFAULT_PLAN_TOKEN_BUDGET
+
+    @property
+    def tiers(self) -> list[str]:
+        """Models to try in order: the cascade, or just the one model."""
+        return self.cascade_models or [self.model]
+
+    def scrape_kwargs(self) -> dict:
+        """Keyword arguments for scrape_pages, scrape_operator and plan_pages."""
+        return {
+            "timeout": self.timeout,
+            "max_workers": self.scrape_workers,
+            "per_host": self.scrapes_per_host,
+            "max_age_hours": self.max_age_hours,
+            "refresh": self.refresh,
+        }
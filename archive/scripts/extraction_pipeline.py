@@ -0,0 +1,751 @@
+"""
+Single-operator extraction pipeline — scrape, reduce, extract with Claude
+(streamed or chunked, optionally through a model cascade), repair, validate
+and save. run_extraction is the entry point; extract_operator.py is the CLI.
+"""
+
+import hashlib
+import json
+import re
+import sys
+import time
+from datetime import datetime, timezone
+
+from api_ledger import ledger_call, set_operator as set_ledger_operator
+from cassettes import CassetteMiss
+from chunking import chunk_user_content, extract_chunked, plan_chunks
+from claude_costs import (
+    cache_savings, claude_cost_usd, estimate_cost, format_usd, ledger_usage, usage_tokens,
+)
+from crawl_planner import plan_pages, print_plan
+from extraction_common import (
+    MAX_TOKENS, PROMPT_PATH, RESULTS_DIR, TEMPERATURE, anthropic_client, api_slot,
+    build_system_blocks, estimate_tokens, firecrawl_app, load_extraction_prompt,
+    operator_slug_from_url, require_api_keys,
+)
+from extraction_options import ExtractionOptions
+from extraction_validation import check_extraction
+from page_reduction import build_user_content, reduce_pages
+from preflight import auto_max_tokens, predict_product_count, run_preflight
+from product_repair import repair_invalid_products
+from response_parsing import IncrementalExtractionParser, parse_response
+from scraping import scrape_operator
+from stage_metrics import print_stage_timings, stage_seconds, stage_span, start_stage_spans
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Model cascade: cheapest tier first, escalating when a result fails
+# check_extraction (schema errors, or too few products / prices)
+DEFAULT_CASCADE = [
+    "claude-haiku-4-5-20251001",
+    "claude-sonnet-4-5-20250929",
+    "claude-opus-4-6",
+]
+
+
+# ---------------------------------------------------------------------------
+# Saving results
+# ---------------------------------------------------------------------------
+
+def finalize_extraction(
+    operator_slug: str,
+    result: dict,
+    model: str,
+    tokens: dict,
+    scrape_result: dict,
+    include_raw_html: bool,
+    claude_seconds: float | None = None,
+    method: str = "firecrawl_scrape_claude_api",
+    batch: bool = False,
+    extra_metadata: dict | None = None,
+) -> dict:
+    """Steps 4-5 — attach extraction metadata to a parsed result and save it."""
+    # --- Step 4: Add extraction metadata ---
+    savings, _ = cache_savings(model, tokens, batch=batch)
+    result["extractionMetadata"] = {
+        "extractedAt": datetime.now(timezone.utc).isoformat(),
+        "method": method,
+        "claudeModel": model,
+        "claudeTokensIn": tokens["input"],
+        "claudeTokensOut": tokens["output"],
+        "claudeCacheWriteTokens": tokens["cacheWrite"],
+        "claudeCacheReadTokens": tokens["cacheRead"],
+        "claudeCostEstimate": estimate_cost(
+            model, tokens["input"], tokens["output"], tokens["cacheWrite"], tokens["cacheRead"],
+            batch=batch,
+        ),
+        "claudeCacheSavings": format_usd(savings),
+        "claudeLatencySeconds": round(claude_seconds, 2) if claude_seconds is not None else None,
+        "firecrawlCreditsUsed": scrape_result["total_credits"],
+        "pagesFromCache": scrape_result["cached_pages"],
+        "pagesUsed": [p["url"] for p in scrape_result["pages"]],
+        "totalMarkdownChars": scrape_result["total_chars"],
+        "rawHtmlIncluded": include_raw_html,
+        "scriptVersion": "extract_operator_v1",
+        **(extra_metadata or {}),
+    }
+
+    # --- Step 5: Save results ---
+    output_dir = RESULTS_DIR / operator_slug
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / "extract_operator_v1.json"
+
+    with open(output_path, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(f"  Result saved to: {output_path}")
+    print()
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Content fingerprint
+#
+# A result records a hash of the normalized user message(s) actually sent
+# (one per chunk in chunked mode), the prompt version and model(s), and the
+# settings that change what Claude returns. If a later run would send
+# identical messages with the same prompt, models and settings, the Claude
+# call is skipped and the saved result reused — scheduled re-extraction only
+# pays for sites that changed.
+# ---------------------------------------------------------------------------
+
+def normalize_content(text: str) -> str:
+    """Ignore whitespace-only differences (trailing spaces, blank-line runs)."""
+    lines = [line.rstrip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+def extraction_settings(options: ExtractionOptions) -> dict:
+    """The options, beyond content, prompt and model, that change the saved result."""
+    return {
+        "maxTokens": "auto" if options.max_tokens is None else options.max_tokens,
+        "rawHtml": options.include_raw_html,
+        "stripBoilerplate": options.strip_boilerplate,
+        "chunkTokens": options.chunk_tokens if options.chunked else None,
+        "repairProducts": options.repair_products,
+    }
+
+
+def content_fingerprint(
+    user_contents: list[str], extraction_prompt: str, models: list[str], settings: dict,
+) -> dict:
+    prompt_hash = hashlib.sha256(extraction_prompt.encode("utf-8")).hexdigest()[:12]
+    content_hash = hashlib.sha256()
+    for user_content in user_contents:
+        content_hash.update(hashlib.sha256(normalize_content(user_content).encode("utf-8")).digest())
+    return {
+        "contentSha256": content_hash.hexdigest(),
+        "messages": len(user_contents),
+        "promptVersion": f"{PROMPT_PATH.stem}@{prompt_hash}",
+        "model": " → ".join(models),
+        "settings": settings,
+    }
+
+
+def load_unchanged_result(operator_slug: str, fingerprint: dict) -> dict | None:
+    """The saved result if it was extracted from identical content, else None."""
+    path = RESULTS_DIR / operator_slug / "extract_operator_v1.json"
+    try:
+        with open(path) as f:
+            prior = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    meta = prior.get("extractionMetadata") or {}
+    # A truncated result is worth retrying even on unchanged pages
+    if meta.get("contentFingerprint") != fingerprint or "truncated" in meta:
+        return None
+    return prior
+
+
+def reuse_unchanged_result(operator_slug: str, prior: dict, scrape_result: dict) -> dict:
+    """Record the no-op check on the saved result and return it."""
+    meta = prior["extractionMetadata"]
+    print(f"  Content unchanged since {meta['extractedAt']} — skipping Claude, reusing saved result")
+    meta["reusedUnchanged"] = {
+        "checkedAt": datetime.now(timezone.utc).isoformat(),
+        "firecrawlCreditsUsed": scrape_result["total_credits"],
+    }
+    output_path = RESULTS_DIR / operator_slug / "extract_operator_v1.json"
+    with open(output_path, "w") as f:
+        json.dump(prior, f, indent=2, ensure_ascii=False)
+    print(f"  Result: {output_path} ({len(prior.get('products', []))} products)")
+    print()
+    return prior
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+def stream_extraction(
+    client,
+    operator_slug: str,
+    model: str,
+    system_blocks: list[dict],
+    user_content: str,
+    max_tokens: int = MAX_TOKENS,
+    parser: IncrementalExtractionParser | None = None,
+) -> dict:
+    """Step 2 (streaming) — stream Claude's response, saving products as they arrive.
+
+    Each product is appended to results/<operator>/extract_operator_v1_products.jsonl
+    the moment its JSON object closes, so a crash or cut-off stream still
+    leaves every finished product on disk (and in ``parser``, if the caller
+    passes one). Returns the final message, the incremental parser, the call
+    duration and the time to the first complete product.
+    """
+    parser = parser or IncrementalExtractionParser()
+    output_dir = RESULTS_DIR / operator_slug
+    output_dir.mkdir(parents=True, exist_ok=True)
+    partial_path = output_dir / "extract_operator_v1_products.jsonl"
+
+    first_product_seconds = None
+    with api_slot("claude"), ledger_call("claude", "messages.stream", model=model) as call:
+        started = time.monotonic()
+        with open(partial_path, "w") as partial, client.messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=TEMPERATURE,
+            system=system_blocks,
+            messages=[{"role": "user", "content": user_content}],
+        ) as stream:
+            for text in stream.text_stream:
+                for product in parser.feed(text):
+                    partial.write(json.dumps(product, ensure_ascii=False) + "\n")
+                    partial.flush()
+                    elapsed = time.monotonic() - started
+                    if first_product_seconds is None:
+                        first_product_seconds = elapsed
+                    print(f"    + [{elapsed:5.1f}s] {product.get('title', '?')}")
+            message = stream.get_final_message()
+        seconds = time.monotonic() - started
+        ledger_usage(call, model, message)
+
+    return {
+        "message": message,
+        "seconds": seconds,
+        "parser": parser,
+        "first_product_seconds": first_product_seconds,
+        "partial_path": partial_path,
+    }
+
+
+def extract_with_model(
+    client,
+    operator_slug: str,
+    model: str,
+    system_blocks: list[dict],
+    pages: list[dict],
+    site_chrome: list[str] | None,
+    max_tokens: int,
+    options: ExtractionOptions,
+) -> dict | None:
+    """Steps 2-3 — extract reduced pages with one model and parse the response.
+
+    Returns {result, tokens, claude_seconds, metadata, truncated, partial_path}
+    or None if the call failed or nothing usable came back. A stream that
+    fails after some products finished returns those as a truncated result.
+    """
+    metadata = {}
+    partial_path = None
+
+    if options.chunked:
+        # Chunk responses are parsed and merged inside this span
+        with stage_span("claude", model=model, chunked=True) as span:
+            outcome = extract_chunked(
+                client, operator_slug, pages, model, system_blocks, options.include_raw_html,
+                options.chunk_tokens, options.chunk_workers, site_chrome, max_tokens,
+            )
+            if outcome is not None:
+                span.update(tokensIn=outcome["tokens"]["input"], tokensOut=outcome["tokens"]["output"])
+        if outcome is None:
+            return None
+        result = outcome["result"]
+        tokens = outcome["tokens"]
+        claude_seconds = outcome["claude_seconds"]
+        metadata.update(outcome["metadata"])
+        truncated = bool(outcome["truncated"])
+        if truncated:
+            metadata["truncated"] = {"stopReason": "max_tokens", "chunks": outcome["truncated"]}
+    else:
+        user_content = build_user_content(pages, options.include_raw_html, site_chrome)
+        print(f"  User message: {len(user_content):,} chars")
+
+        stream_parser = IncrementalExtractionParser()
+        started = time.monotonic()
+        try:
+            with stage_span("claude", model=model) as span:
+                streamed = stream_extraction(
+                    client, operator_slug, model, system_blocks, user_content, max_tokens, stream_parser,
+                )
+                tokens = usage_tokens(streamed["message"].usage)
+                span.update(tokensIn=tokens["input"], tokensOut=tokens["output"])
+        except Exception as e:
+            print(f"ERROR: Claude API call failed: {e}", file=sys.stderr)
+            if not stream_parser.products:
+                return None
+            # Keep the products that finished streaming before the failure
+            resume = stream_parser.resume_point()
+            print(f"  Recovered {len(stream_parser.products)} complete product(s) from the stream")
+            print(f"  Resume after '{resume['lastCompleteProduct']}'")
+            print()
+            return {
+                "result": stream_parser.partial_result(),
+                # Usage arrives with the final message, which never came
+                "tokens": {"input": 0, "output": 0, "cacheWrite": 0, "cacheRead": 0},
+                "claude_seconds": time.monotonic() - started,
+                "metadata": {
+                    **metadata,
+                    "truncated": {"stopReason": "error", "error": str(e)[:500], "resumePoint": resume},
+                },
+                "truncated": True,
+                "partial_path": RESULTS_DIR / operator_slug / "extract_operator_v1_products.jsonl",
+            }
+        claude_seconds = streamed["seconds"]
+        partial_path = streamed["partial_path"]
+        response = streamed["message"]
+        if streamed["first_product_seconds"] is not None:
+            metadata["claudeFirstProductSeconds"] = round(streamed["first_product_seconds"], 2)
+        truncated = response.stop_reason == "max_tokens"
+        if truncated:
+            print(f"  WARNING: response truncated at {max_tokens:,} tokens (try --chunked)")
+        result = None
+
+    # Token usage
+    cost_est = estimate_cost(
+        model, tokens["input"], tokens["output"], tokens["cacheWrite"], tokens["cacheRead"],
+    )
+    print(f"  Tokens: {tokens['input']:,} in / {tokens['output']:,} out")
+    if tokens["cacheWrite"] or tokens["cacheRead"]:
+        print(f"  Cache:  {tokens['cacheRead']:,} read / {tokens['cacheWrite']:,} written")
+    print(f"  Cost:   {cost_est}")
+    print(f"  Time:   {claude_seconds:.1f}s")
+    print()
+
+    # --- Step 3: Parse (chunked results are parsed and merged already) ---
+    if result is None:
+        print("Step 3: Parsing extraction result...")
+        with stage_span("parse", bytes=len(response.content[0].text)):
+            result = parse_response(operator_slug, response.content[0].text)
+        if result is None:
+            # Fall back to whatever products finished streaming before the cut-off
+            if not stream_parser.products:
+                return None
+            result = stream_parser.partial_result()
+            print(f"  Recovered {len(stream_parser.products)} complete product(s) from the stream")
+        if truncated:
+            metadata["truncated"] = {
+                "stopReason": response.stop_reason,
+                "resumePoint": stream_parser.resume_point(),
+            }
+            print(f"  Resume after '{stream_parser.resume_point()['lastCompleteProduct']}'")
+
+    return {
+        "result": result,
+        "tokens": tokens,
+        "claude_seconds": claude_seconds,
+        "metadata": metadata,
+        "truncated": truncated,
+        "partial_path": partial_path,
+    }
+
+
+def run_extraction(
+    urls: list[str],
+    operator: str | None = None,
+    options: ExtractionOptions | None = None,
+    dry_run: bool = False,
+    preflight: bool = False,
+) -> dict | None:
+    """
+    Run the Path 2 extraction pipeline.
+
+    Scrapes pages via Firecrawl /scrape, extracts via Claude API,
+    saves results and prints summary. ``options`` holds every setting
+    (default: the CLI defaults). With ``chunked``, pages are split
+    into token-budgeted groups extracted concurrently and merged.
+    With ``plan``, the first URL is treated as the listing page and the
+    pages to scrape are chosen by plan_pages.
+    The Claude call is skipped when the assembled content, prompt and model
+    match the saved result's fingerprint, unless ``force_extract``.
+    Products that fail the schema are re-requested individually and
+    spliced back in (``repair_products``). With ``cascade_models``, each
+    model is tried cheapest-first and the run escalates only while the
+    result fails check_extraction. Each stage is timed (see stage_span).
+    ``max_tokens=None`` sizes each call from the preflight estimate.
+    ``dry_run`` and ``preflight`` estimate the run instead (see run_preflight).
+    """
+    options = options or ExtractionOptions()
+    model = options.model
+    max_tokens = options.max_tokens
+
+    # Load prompt
+    extraction_prompt = load_extraction_prompt()
+    operator_slug = operator or operator_slug_from_url(urls[0])
+    spans = start_stage_spans(operator_slug)
+    set_ledger_operator(operator_slug)
+
+    # Print config
+    print()
+    print("=" * 60)
+    print("EXTRACT OPERATOR — Path 2 (Firecrawl /scrape + Claude API)")
+    print("=" * 60)
+    print(f"  Operator:       {operator_slug}")
+    print(f"  URLs:           {len(urls)}")
+    for i, u in enumerate(urls, 1):
+        print(f"    {i}. {u}")
+    print(f"  Raw HTML:       {'Yes' if options.include_raw_html else 'No'}")
+    print(f"  Scraping:       {options.scrape_workers} workers, {options.scrapes_per_host} per host")
+    cache_note = "refresh" if options.refresh else f"reuse pages < {options.max_age_hours:g}h old"
+    print(f"  Scrape cache:   {cache_note}")
+    max_tokens_label = "auto" if max_tokens is None else f"{max_tokens:,}"
+    if options.cascade_models:
+        print(f"  Claude models:  {' → '.join(options.cascade_models)} (max_tokens {max_tokens_label})")
+    else:
+        print(f"  Claude model:   {model} (max_tokens {max_tokens_label})")
+    print(f"  Prompt cache:   {'Yes' if options.prompt_cache else 'No'}")
+    print(f"  Site chrome:    {'Strip repeated blocks' if options.strip_boilerplate else 'Keep'}")
+    print(f"  Product repair: {'Re-ask for products failing the schema' if options.repair_products else 'Off'}")
+    if options.chunked:
+        print(f"  Chunking:       ≤ ~{options.chunk_tokens:,} tokens/chunk, {options.chunk_workers} concurrent calls")
+    print(f"  Prompt:         {PROMPT_PATH.name} ({len(extraction_prompt):,} chars)")
+    print(f"  Output:         results/{operator_slug}/extract_operator_v1.json")
+    print()
+
+    # Crawl planning (cached listing links only in a dry run)
+    crawl_plan = None
+    if options.plan:
+        app = None
+        if dry_run:
+            print(f"Step 0: Planning pages from {urls[0]} (cached listing links only)...")
+        else:
+            print(f"Step 0: Planning pages from {urls[0]} (sitemap + listing links)...")
+            fc_key, _ = require_api_keys()
+            app = firecrawl_app(fc_key)
+        try:
+            with stage_span("plan") as span:
+                crawl_plan = plan_pages(
+                    app, urls[0], options.plan_max_pages, options.plan_token_budget,
+                    options.include_raw_html, **options.scrape_kwargs(),
+                )
+                span.update(pages=len(crawl_plan["selected"]), credits=crawl_plan["listingCredits"])
+        except CassetteMiss as e:
+            print(f"ERROR: crawl planning cannot be replayed: {e}", file=sys.stderr)
+            print("  Re-record the run with --plan, or replay it with the planned pages as --url.", file=sys.stderr)
+            return None
+        print_plan(crawl_plan)
+        plan_path = RESULTS_DIR / operator_slug / "crawl_plan.json"
+        plan_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(plan_path, "w") as f:
+            json.dump(crawl_plan, f, indent=2)
+        print(f"  Plan saved to: {plan_path}")
+        print()
+        urls = [page["url"] for page in crawl_plan["selected"]]
+
+    # Dry run (scrape cache only) / preflight (scrape, no Claude calls)
+    if dry_run or preflight:
+        print("--- PREFLIGHT ---" if preflight else "--- DRY RUN ---")
+        run_preflight([{"slug": operator_slug, "urls": urls}], options, scrape=preflight)
+        print()
+        print("Prompt preview (first 300 chars):")
+        print(extraction_prompt[:300] + "...")
+        return None
+
+    fc_key, anth_key = require_api_keys()
+
+    # --- Step 1: Scrape pages ---
+    print("Step 1: Scraping pages via Firecrawl /scrape...")
+    app = firecrawl_app(fc_key)
+    with stage_span("scrape") as span:
+        scrape_result = scrape_operator(app, urls, options.include_raw_html, **options.scrape_kwargs())
+        if scrape_result is not None:
+            span.update(
+                pages=len(scrape_result["pages"]), bytes=scrape_result["total_chars"],
+                credits=scrape_result["total_credits"], cachedPages=scrape_result["cached_pages"],
+            )
+    if scrape_result is None:
+        return None
+    print()
+
+    # --- Step 2: Build prompt and call Claude API ---
+    tiers = options.tiers
+    if len(tiers) > 1:
+        print(f"Step 2: Extracting via Claude API (cascade: {' → '.join(tiers)})...")
+    else:
+        print(f"Step 2: Extracting via Claude API ({model})...")
+    client = anthropic_client(anth_key)
+    system_blocks = build_system_blocks(extraction_prompt, options.prompt_cache)
+    with stage_span("assemble") as span:
+        pages, site_chrome, reduction = reduce_pages(scrape_result["pages"], options.strip_boilerplate)
+        user_content = build_user_content(pages, options.include_raw_html, site_chrome)
+        if options.chunked:
+            chunks = plan_chunks(pages, options.include_raw_html, options.chunk_tokens, site_chrome)
+            sent = [
+                chunk_user_content(chunk, options.include_raw_html, site_chrome, i == 0)
+                for i, chunk in enumerate(chunks)
+            ]
+        else:
+            sent = [user_content]
+        fingerprint = content_fingerprint(sent, extraction_prompt, tiers, extraction_settings(options))
+        span.update(bytes=len(user_content), tokensIn=estimate_tokens(user_content))
+    prior = None if options.force_extract else load_unchanged_result(operator_slug, fingerprint)
+    if prior is not None:
+        return reuse_unchanged_result(operator_slug, prior, scrape_result)
+    extra_metadata = {**reduction, "contentFingerprint": fingerprint}
+    if crawl_plan is not None:
+        extra_metadata["crawlPlan"] = {
+            "listingUrl": crawl_plan["listingUrl"],
+            "candidates": crawl_plan["candidates"],
+            "pagesSelected": len(crawl_plan["selected"]),
+        }
+    # Predict from the unstripped pages: chrome stripping moves product blocks
+    predicted_products = predict_product_count(scrape_result["pages"])
+
+    # Each tier runs only if the one before it failed validation; the last
+    # tier's result is kept even if it still has issues.
+    outcome = None
+    attempts = []
+    for tier, tier_model in enumerate(tiers, 1):
+        if len(tiers) > 1:
+            print(f"  Tier {tier}/{len(tiers)}: {tier_model}")
+        tier_max_tokens = max_tokens
+        if max_tokens is None:
+            tier_max_tokens = auto_max_tokens(predicted_products, sent, tier_model)
+            print(f"  max_tokens:   {tier_max_tokens:,} (auto, from the preflight estimate)")
+        attempt = extract_with_model(
+            client, operator_slug, tier_model, system_blocks, pages, site_chrome,
+            tier_max_tokens, options,
+        )
+        if attempt is not None and max_tokens is None:
+            attempt["metadata"]["maxTokensAuto"] = tier_max_tokens
+        if attempt is None:
+            issues = ["extraction failed"]
+        else:
+            with stage_span("validate", model=tier_model) as span:
+                if options.repair_products:
+                    repair = repair_invalid_products(
+                        client, tier_model, system_blocks, scrape_result["pages"], attempt["result"],
+                    )
+                    if repair:
+                        for key, value in repair["tokens"].items():
+                            attempt["tokens"][key] += value
+                        attempt["metadata"]["productRepair"] = repair["metadata"]
+                        span.update(tokensIn=repair["tokens"]["input"], tokensOut=repair["tokens"]["output"])
+                issues = check_extraction(attempt["result"], predicted_products, attempt["truncated"])
+            outcome, model = attempt, tier_model
+            tokens = attempt["tokens"]
+            attempts.append({
+                "tier": tier,
+                "model": tier_model,
+                "tokensIn": tokens["input"],
+                "tokensOut": tokens["output"],
+                "costUsd": round(claude_cost_usd(
+                    tier_model, tokens["input"], tokens["output"],
+                    tokens["cacheWrite"], tokens["cacheRead"],
+                ), 4),
+                "seconds": round(attempt["claude_seconds"], 2),
+                "issues": issues,
+            })
+        if len(tiers) == 1:
+            break
+        if not issues:
+            print(f"  Tier {tier} passed validation")
+            print()
+            break
+        print(f"  Tier {tier} failed validation: {'; '.join(issues[:3])}")
+        if tier < len(tiers):
+            print("  Escalating to the next tier...")
+        print()
+
+    if outcome is None:
+        return None
+    result = outcome["result"]
+    tokens = outcome["tokens"]
+    claude_seconds = outcome["claude_seconds"]
+    extra_metadata.update(outcome["metadata"])
+    cost_est = estimate_cost(
+        model, tokens["input"], tokens["output"], tokens["cacheWrite"], tokens["cacheRead"],
+    )
+    savings, uncached_cost = cache_savings(model, tokens)
+    if len(tiers) > 1:
+        total_cost = sum(a["costUsd"] for a in attempts)
+        extra_metadata["cascade"] = {
+            "tier": attempts[-1]["tier"],
+            "model": model,
+            "tiers": tiers,
+            "attempts": attempts,
+            "totalCostUsd": round(total_cost, 4),
+            "validationIssues": attempts[-1]["issues"],
+        }
+        cost_est = format_usd(total_cost)
+
+    # --- Steps 4-5: Add metadata, save ---
+    extra_metadata["stageSeconds"] = stage_seconds(spans)
+    with stage_span("save") as span:
+        finalize_extraction(
+            operator_slug, result, model, tokens, scrape_result,
+            options.include_raw_html, claude_seconds=claude_seconds, extra_metadata=extra_metadata,
+        )
+        span["bytes"] = (RESULTS_DIR / operator_slug / "extract_operator_v1.json").stat().st_size
+
+    if outcome["partial_path"] is not None:
+        # The saved result supersedes the products streamed in as they arrived
+        outcome["partial_path"].unlink(missing_ok=True)
+
+    # --- Step 6: Print summary ---
+    print_summary(result)
+
+    # Cost summary
+    print()
+    print("=" * 60)
+    print("COST SUMMARY")
+    print("=" * 60)
+    print(
+        f"  Firecrawl:  {scrape_result['total_credits']} credits "
+        f"({len(scrape_result['pages'])} pages, {scrape_result['cached_pages']} from cache)"
+    )
+    print(f"  Claude:     {tokens['input']:,} input + {tokens['output']:,} output tokens")
+    print(
+        f"  Cache:      {tokens['cacheRead']:,} read + {tokens['cacheWrite']:,} written "
+        f"(saved {format_usd(savings)} vs uncached {format_usd(uncached_cost)})"
+    )
+    chrome_stats = reduction.get("siteChrome")
+    if chrome_stats and chrome_stats["chromeBlocks"]:
+        print(
+            f"  Chrome:     ~{chrome_stats['estimatedTokensSaved']:,} input tokens saved "
+            f"({chrome_stats['chromeBlocks']} repeated blocks sent once)"
+        )
+    if "cascade" in extra_metadata:
+        print(f"  Cascade:    tier {extra_metadata['cascade']['tier']} of {len(tiers)} ({len(attempts)} attempt(s))")
+    print(f"  Claude est: {cost_est} ({model.split('-')[1].title()}, {claude_seconds:.1f}s)")
+    print(f"  Total est:  {cost_est} + {scrape_result['total_credits']} Firecrawl credits")
+    print("=" * 60)
+    print_stage_timings(spans)
+
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Summary display
+# ---------------------------------------------------------------------------
+
+def print_summary(result: dict):
+    """Print formatted extraction results to console."""
+    # Operator info
+    op = result.get("operator", {})
+    print()
+    print("=" * 60)
+    print("EXTRACTION RESULTS")
+    print("=" * 60)
+    print()
+    print(f"  Operator:       {op.get('name', 'N/A')}")
+    print(f"  URL:            {op.get('url', 'N/A')}")
+    print(f"  Address:        {op.get('location', 'N/A')}")
+    print(f"  Phone:          {op.get('phone', 'N/A')}")
+    print(f"  Email:          {op.get('email', 'N/A')}")
+
+    booking = op.get("bookingSystem", {})
+    if isinstance(booking, dict):
+        print(f"  Booking system: {booking.get('name', 'N/A')}")
+    elif booking:
+        print(f"  Booking system: {booking}")
+
+    print(f"  Operator type:  {op.get('operatorType', 'N/A')}")
+    print(f"  OTA presence:   {op.get('otaPresence', 'N/A')}")
+
+    # Products
+    products = result.get("products", [])
+    print()
+    print(f"  Products found: {len(products)}")
+    print("-" * 60)
+
+    for i, p in enumerate(products, 1):
+        title = p.get("title", "Untitled")
+        pricing_model = p.get("pricingModel", "?")
+        duration = p.get("durationDisplay") or (
+            f"{p['duration']}min" if p.get("duration") else "?"
+        )
+        private_tag = " [PRIVATE]" if p.get("isPrivate") else ""
+
+        # Price display
+        price_str = ""
+        units = p.get("priceByUnit") or []
+        if units:
+            parts = []
+            for u in units:
+                amt = u.get("amount", 0)
+                label = u.get("label") or u.get("unitType", "")
+                parts.append(f"${amt / 100:.0f} {label}")
+            price_str = ", ".join(parts)
+        elif p.get("pricingNotes"):
+            price_str = p["pricingNotes"]
+        else:
+            price_str = "No pricing"
+
+        print(f"\n  {i}. {title}{private_tag}")
+        print(f"     Pricing: {price_str} ({pricing_model})")
+        print(f"     Duration: {duration}")
+
+        age = p.get("ageRestrictions", {})
+        if isinstance(age, dict) and (age.get("minAge") or age.get("label")):
+            age_str = age.get("label") or f"Min age: {age.get('minAge')}"
+            print(f"     Age: {age_str}")
+        elif p.get("ageRestrictions"):
+            print(f"     Age: {p['ageRestrictions']}")
+
+        if p.get("seasonality"):
+            season = p["seasonality"]
+            if isinstance(season, dict):
+                notes = season.get("notes", "")
+                print(f"     Season: {notes}" if notes else f"     Season: {season}")
+            else:
+                print(f"     Season: {season}")
+
+        if p.get("url"):
+            print(f"     URL: {p['url']}")
+
+        # Features summary
+        features = p.get("features") or []
+        if features:
+            by_type: dict[str, list[str]] = {}
+            for f_item in features:
+                ft = f_item.get("type", "OTHER")
+                by_type.setdefault(ft, []).append(f_item.get("value", ""))
+            for ft, vals in by_type.items():
+                print(f"     {ft}: {'; '.join(vals[:3])}")
+
+        # Locations
+        locs = p.get("locations") or []
+        if locs:
+            starts = [loc for loc in locs if loc.get("type") == "START"]
+            if starts:
+                print(f"     Pickup locations: {len(starts)}")
+
+        # Promos
+        promos = p.get("activePromotions") or []
+        if promos:
+            for promo in promos:
+                code = promo.get("code", "")
+                desc = promo.get("description", "")
+                where = promo.get("displayLocation", "")
+                print(f"     PROMO: {code} — {desc} ({where})")
+
+        # Cross-operator bundles
+        bundles = p.get("crossOperatorBundles") or []
+        if bundles:
+            for b in bundles:
+                print(
+                    f"     BUNDLE: includes {b.get('partnerOperator')} "
+                    f"— {b.get('partnerProduct')}"
+                )
+
+        # Booking
+        bs = p.get("bookingSystem", {})
+        if isinstance(bs, dict) and (bs.get("name") or bs.get("bookingUrl")):
+            print(f"     Booking: {bs.get('name', 'N/A')} — {bs.get('bookingUrl', 'N/A')}")
+
+    print()
+    print("=" * 60)
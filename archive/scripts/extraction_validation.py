@@ -0,0 +1,118 @@
+"""
+Validation of extraction results against schemas/octo_extraction_v01.json
+plus completeness heuristics (used to decide cascade escalation and which
+products to repair).
+"""
+
+import functools
+import json
+from typing import TYPE_CHECKING
+
+from extraction_common import PROJECT_ROOT
+
+if TYPE_CHECKING:
+    from jsonschema import Draft7Validator
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SCHEMA_PATH = PROJECT_ROOT / "schemas" / "octo_extraction_v01.json"
+
+# A result is incomplete with fewer products than this share of the count
+# predicted from its pages, or with pricing missing for most of them
+CASCADE_MIN_PRODUCT_SHARE = 0.5
+CASCADE_MIN_PRICED_SHARE = 0.5
+
+
+# ---------------------------------------------------------------------------
+# Validation
+#
+# Checks an extraction result against schemas/octo_extraction_v01.json plus
+# completeness heuristics. The prompt allows null for "not found", so nulls
+# are dropped before schema validation rather than reported as type errors.
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def load_schema() -> dict:
+    with open(SCHEMA_PATH) as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=1)
+def load_schema_validator() -> "Draft7Validator":
+    """Compile the extraction schema once per process."""
+    from jsonschema import Draft7Validator
+
+    return Draft7Validator(load_schema(), format_checker=Draft7Validator.FORMAT_CHECKER)
+
+
+@functools.lru_cache(maxsize=1)
+def load_product_validator() -> "Draft7Validator":
+    """Compile the products[] item schema once, for checking products one at a time."""
+    from jsonschema import Draft7Validator
+
+    return Draft7Validator(
+        load_schema()["properties"]["products"]["items"],
+        format_checker=Draft7Validator.FORMAT_CHECKER,
+    )
+
+
+def drop_nulls(value):
+    """Recursively remove null values (null means "not on the page")."""
+    if isinstance(value, dict):
+        return {k: drop_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [drop_nulls(v) for v in value if v is not None]
+    return value
+
+
+def _error_path(error) -> str:
+    return "/".join(str(p) for p in error.absolute_path) or "(root)"
+
+
+def schema_errors(result: dict) -> list[str]:
+    """Schema violations in an extraction result, as "path: message" strings."""
+    candidate = {k: v for k, v in result.items() if k != "extractionMetadata"}
+    return [
+        f"{_error_path(e)}: {e.message}"
+        for e in load_schema_validator().iter_errors(drop_nulls(candidate))
+    ]
+
+
+def product_errors(product: dict) -> list[str]:
+    """Schema violations in a single product, with paths relative to the product."""
+    return [
+        f"{_error_path(e)}: {e.message}"
+        for e in load_product_validator().iter_errors(drop_nulls(product))
+    ]
+
+
+def completeness_issues(result: dict, predicted_products: int) -> list[str]:
+    """Heuristic signs that an extraction missed content a larger model would catch."""
+    issues = []
+    products = result.get("products") or []
+    if not (result.get("operator") or {}).get("name"):
+        issues.append("operator name missing")
+    if not products:
+        issues.append("no products extracted")
+        return issues
+    if predicted_products > 1 and len(products) < predicted_products * CASCADE_MIN_PRODUCT_SHARE:
+        issues.append(f"only {len(products)} products for ~{predicted_products} expected from the pages")
+    priced = sum(
+        1 for p in products
+        if isinstance(p, dict) and (p.get("priceByUnit") or p.get("priceTiers") or p.get("pricingNotes"))
+    )
+    if priced < len(products) * CASCADE_MIN_PRICED_SHARE:
+        issues.append(f"pricing captured for only {priced}/{len(products)} products")
+    return issues
+
+
+def check_extraction(result: dict, predicted_products: int, truncated: bool = False) -> list[str]:
+    """All reasons to distrust an extraction: truncation, schema errors, gaps."""
+    issues = ["response truncated"] if truncated else []
+    errors = schema_errors(result)
+    if errors:
+        issues.append(f"{len(errors)} schema error(s), e.g. {errors[0]}")
+    return issues + completeness_issues(result, predicted_products)
@@ -21,133 +21,15 @@ import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
-from firecrawl import FirecrawlApp
-from pydantic import BaseModel, Field
 
+from api_ledger import ledger_call
+from cassettes import add_cassette_arguments, configure_from_args, replaying, wrap_firecrawl
 
-# ---------------------------------------------------------------------------
-# Pydantic models — OCTO-aligned extraction schema for Firecrawl /extract
-#
-# Firecrawl requires Pydantic-generated JSON schemas ($ref/$defs style).
-# Hand-written JSON Schema draft-07 is rejected by their API.
-#
-# These models mirror schemas/octo_extraction_v01.json but in a format
-# Firecrawl's /extract endpoint accepts.
-# ---------------------------------------------------------------------------
-
-
-class PriceUnit(BaseModel):
-    unit_type: str = Field(description="Unit category: adult, child, infant, senior, or group")
-    label: Optional[str] = Field(default=None, description="Age range as displayed (e.g., 'Ages 13+', 'Ages 5-12')")
-    amount_cents: int = Field(description="Price in cents. $179.00 = 17900")
-
-
-class Feature(BaseModel):
-    type: str = Field(
-        description="One of: INCLUSION, EXCLUSION, HIGHLIGHT, ACCESSIBILITY_INFORMATION, CANCELLATION_TERM, ADDITIONAL_INFORMATION"
-    )
-    value: str = Field(description="Feature description")
-
-
-class Location(BaseModel):
-    type: str = Field(description="START (meeting/pickup point), END (drop-off), or POINT_OF_INTEREST")
-    name: Optional[str] = Field(default=None, description="Location name")
-    address: Optional[str] = Field(default=None, description="Street address")
-    pickup_time: Optional[str] = Field(default=None, description="Pickup/departure time if stated")
-    notes: Optional[str] = Field(default=None, description="Additional location notes (parking tips, etc.)")
-
-
-class FAQ(BaseModel):
-    question: str
-    answer: str
-
-
-class Promotion(BaseModel):
-    code: Optional[str] = Field(default=None, description="Promo code if applicable (e.g., RAINIER10)")
-    description: str = Field(description="What the promotion offers (e.g., '10% off Mt. Rainier Tour')")
-    display_location: Optional[str] = Field(
-        default=None, description="Where on the site this appears (site-wide banner, product page, deals page)"
-    )
-
-
-class CrossOperatorBundle(BaseModel):
-    partner_operator: str = Field(description="Name of the partner operator")
-    partner_product: str = Field(description="Name of the partner's product in the bundle")
-    partner_duration_minutes: Optional[int] = Field(default=None, description="Duration of partner's portion in minutes")
-
-
-class Product(BaseModel):
-    title: str = Field(description="Product name exactly as displayed on the site")
-    short_description: Optional[str] = Field(default=None, description="1-2 sentence summary")
-    description: Optional[str] = Field(default=None, description="Full narrative description")
-    url: Optional[str] = Field(default=None, description="Product detail page URL")
-    pricing_model: Optional[str] = Field(
-        default=None, description="PER_UNIT (per person) or PER_BOOKING (per group/flat rate)"
-    )
-    currency: str = Field(default="USD", description="ISO currency code")
-    price_by_unit: Optional[list[PriceUnit]] = Field(
-        default=None, description="Prices per unit type. Amounts in cents."
-    )
-    pricing_notes: Optional[str] = Field(
-        default=None, description="Notes when full pricing not available (e.g., 'From $89. Child pricing not visible.')"
-    )
-    duration_minutes: Optional[int] = Field(default=None, description="Duration in minutes")
-    duration_display: Optional[str] = Field(
-        default=None, description="Duration as stated on site (e.g., '10-11 hours')"
-    )
-    min_age: Optional[int] = Field(default=None, description="Minimum age requirement")
-    age_restriction_label: Optional[str] = Field(
-        default=None, description="Age restriction as displayed (e.g., 'Ages 5+', 'All ages')"
-    )
-    seasonality: Optional[str] = Field(
-        default=None, description="Operating season (e.g., 'Year-round', 'May 15 - Sep 14')"
-    )
-    features: Optional[list[Feature]] = Field(
-        default=None, description="Typed list of inclusions, exclusions, highlights, accessibility info"
-    )
-    locations: Optional[list[Location]] = Field(
-        default=None, description="Meeting points, drop-offs, and points of interest"
-    )
-    faqs: Optional[list[FAQ]] = Field(default=None, description="FAQ question/answer pairs from the page")
-    is_private: Optional[bool] = Field(default=None, description="True if private tour (your group only)")
-    max_group_size: Optional[int] = Field(default=None, description="Maximum group/player count")
-    cancellation_policy: Optional[str] = Field(default=None, description="Cancellation policy as stated on site")
-    active_promotions: Optional[list[Promotion]] = Field(
-        default=None, description="Promo codes and deals visible on the site, including from banners"
-    )
-    cross_operator_bundles: Optional[list[CrossOperatorBundle]] = Field(
-        default=None, description="Products bundling another operator's service"
-    )
-    booking_system: Optional[str] = Field(
-        default=None, description="Booking platform name (FareHarbor, Peek Pro, Bookeo, RocketRez, Gatemaster)"
-    )
-    booking_url: Optional[str] = Field(default=None, description="Direct booking URL for this product")
-
-
-class OperatorInfo(BaseModel):
-    name: str = Field(description="Business name as displayed on the website")
-    url: str = Field(description="Primary website URL")
-    address: Optional[str] = Field(default=None, description="Business address (from footer or contact page)")
-    phone: Optional[str] = Field(default=None, description="Phone number (from footer or contact page)")
-    email: Optional[str] = Field(default=None, description="Contact email (from footer or contact page)")
-    booking_system: Optional[str] = Field(
-        default=None, description="Primary booking platform (FareHarbor, Peek, Bookeo, etc.)"
-    )
-    operator_type: Optional[str] = Field(
-        default=None, description="Brief characterization (e.g., 'Family-owned tour company, 30+ years')"
-    )
-
-
-class ExtractionResult(BaseModel):
-    operator: OperatorInfo
-    products: list[Product]
-    ota_presence: Optional[list[str]] = Field(
-        default=None, description="OTA/review platforms identified on the site (TripAdvisor, Viator, Yelp, Expedia)"
-    )
+# firecrawl and pydantic (via firecrawl_schema.py) are imported inside
+# run_extract, so --help doesn't pay for either
 
 
 # ---------------------------------------------------------------------------
@@ -208,11 +90,13 @@ def run_extract(
     """
     load_dotenv(PROJECT_ROOT / ".env")
 
-    api_key = os.getenv("FIRECRAWL_API_KEY")
+    api_key = "replay" if replaying() else os.getenv("FIRECRAWL_API_KEY")
     if not api_key or api_key == "fc-your-key-here":
         print("ERROR: FIRECRAWL_API_KEY not set in .env", file=sys.stderr)
         sys.exit(1)
 
+    from firecrawl_schema import ExtractionResult
+
     schema = ExtractionResult.model_json_schema()
     operator_slug = operator or operator_slug_from_url(url)
 
@@ -238,16 +122,20 @@ def run_extract(
     print("Calling Firecrawl /extract... (this may take 1-3 minutes)")
     print()
 
-    app = FirecrawlApp(api_key=api_key)
+    from firecrawl import FirecrawlApp
+
+    app = wrap_firecrawl(FirecrawlApp(api_key=api_key))
 
     try:
-        result = app.extract(
-            urls=[url],
-            prompt=EXTRACTION_PROMPT,
-            schema=schema,
-            show_sources=True,
-            timeout=timeout,
-        )
+        with ledger_call("firecrawl", "extract", operator=operator_slug) as call:
+            result = app.extract(
+                urls=[url],
+                prompt=EXTRACTION_PROMPT,
+                schema=schema,
+                show_sources=True,
+                timeout=timeout,
+            )
+            call["credits"] = getattr(result, "credits_used", None) or 0
     except Exception as e:
         print(f"ERROR: Firecrawl /extract failed: {e}", file=sys.stderr)
         return None
@@ -400,6 +288,10 @@ Examples:
 
   # Custom operator slug and timeout
   python scripts/firecrawl_extract.py --url "https://shuttertours.com/*" --operator shutter_tours --timeout 600
+
+  # Record the /extract response, then replay it offline
+  python scripts/firecrawl_extract.py --url https://www.toursnorthwest.com/tours/ --record cassettes/fc
+  python scripts/firecrawl_extract.py --url https://www.toursnorthwest.com/tours/ --replay cassettes/fc
         """,
     )
     parser.add_argument(
@@ -419,7 +311,10 @@ Examples:
         help="Max seconds to wait for extraction (default: 300).",
     )
 
+    add_cassette_arguments(parser)
+
     args = parser.parse_args()
+    configure_from_args(args)
     run_extract(
         url=args.url,
         operator=args.operator,
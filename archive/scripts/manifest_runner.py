@@ -0,0 +1,265 @@
+"""
+Multi-operator runner — extract every operator in a manifest concurrently.
+"""
+
+import contextvars
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from api_ledger import percentile
+from claude_costs import claude_cost_usd, format_usd
+from extraction_common import RESULTS_DIR, load_operator_manifest, require_api_keys, set_api_limits
+from extraction_options import ExtractionOptions
+from extraction_pipeline import run_extraction
+from stage_metrics import STAGE_SPANS, print_stage_metrics, stage_seconds, summarize_stage_metrics
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+RUNS_DIR = RESULTS_DIR / "runs"
+
+# Manifest runs: operators extracted at once, and process-wide caps on
+# in-flight Claude and Firecrawl calls across all of them
+DEFAULT_OPERATOR_WORKERS = 4
+DEFAULT_CLAUDE_CONCURRENCY = 4
+DEFAULT_FIRECRAWL_CONCURRENCY = 8
+
+
+# ---------------------------------------------------------------------------
+# Multi-operator runner
+#
+# Runs run_extraction for every operator in a manifest on a thread pool,
+# under process-wide caps on in-flight Claude and Firecrawl calls. Each
+# operator's console output goes to results/<operator>/extract_operator_v1.log
+# so the terminal only shows one progress line per operator, followed by an
+# aggregate throughput / latency / cost report.
+# ---------------------------------------------------------------------------
+
+# Log file for the operator being extracted in the current context (None = console)
+OPERATOR_LOG: contextvars.ContextVar = contextvars.ContextVar("operator_log", default=None)
+
+
+class ThreadLogRouter:
+    """sys.stdout/sys.stderr stand-in that sends an operator's output to its log file."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def _target(self):
+        return OPERATOR_LOG.get() or self.stream
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def summarize_run(outcomes: list[dict], wall_seconds: float) -> dict:
+    """Aggregate per-operator outcomes into throughput, latency and cost figures."""
+    succeeded = [o for o in outcomes if o["status"] == "ok"]
+    unchanged = [o for o in outcomes if o["status"] == "unchanged"]
+    operator_seconds = [o["seconds"] for o in succeeded]
+    claude_seconds = [o["claudeSeconds"] for o in succeeded if o.get("claudeSeconds") is not None]
+    minutes = max(wall_seconds, 1e-9) / 60
+
+    def spread(values):
+        return {
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p95": percentile(values, 95),
+            "max": max(values) if values else None,
+        }
+
+    return {
+        "operators": len(outcomes),
+        "succeeded": len(succeeded),
+        "unchanged": len(unchanged),
+        "failed": len(outcomes) - len(succeeded) - len(unchanged),
+        "wallSeconds": round(wall_seconds, 2),
+        "throughput": {
+            "operatorsPerMinute": round(len(succeeded) / minutes, 2),
+            "productsPerMinute": round(sum(o["products"] for o in succeeded) / minutes, 2),
+            "pagesPerMinute": round(sum(o["pages"] for o in succeeded) / minutes, 2),
+        },
+        "operatorLatencySeconds": spread(operator_seconds),
+        "claudeLatencySeconds": spread(claude_seconds),
+        "products": sum(o["products"] for o in succeeded),
+        "tokensIn": sum(o["tokensIn"] for o in succeeded),
+        "tokensOut": sum(o["tokensOut"] for o in succeeded),
+        "claudeCostUsd": round(sum(o["costUsd"] for o in succeeded), 4),
+        "firecrawlCredits": sum(o["credits"] for o in succeeded + unchanged),
+    }
+
+
+def _operator_outcome(slug: str, result: dict | None, seconds: float, error: str | None) -> dict:
+    if result is None:
+        return {"operator": slug, "status": "failed", "seconds": round(seconds, 2),
+                "error": error or "extraction returned no result (see log)"}
+    meta = result["extractionMetadata"]
+    if "reusedUnchanged" in meta:
+        return {
+            "operator": slug, "status": "unchanged", "seconds": round(seconds, 2),
+            "products": len(result.get("products", [])), "pages": len(meta.get("pagesUsed", [])),
+            "credits": meta["reusedUnchanged"]["firecrawlCreditsUsed"],
+        }
+    return {
+        "operator": slug,
+        "status": "ok",
+        "seconds": round(seconds, 2),
+        "claudeSeconds": meta.get("claudeLatencySeconds"),
+        "products": len(result.get("products", [])),
+        "pages": len(meta.get("pagesUsed", [])),
+        "tokensIn": meta["claudeTokensIn"],
+        "tokensOut": meta["claudeTokensOut"],
+        "costUsd": meta["cascade"]["totalCostUsd"] if "cascade" in meta else claude_cost_usd(
+            meta["claudeModel"], meta["claudeTokensIn"], meta["claudeTokensOut"],
+            meta.get("claudeCacheWriteTokens", 0), meta.get("claudeCacheReadTokens", 0),
+        ),
+        "credits": meta.get("firecrawlCreditsUsed", 0),
+    }
+
+
+def print_run_report(summary: dict, outcomes: list[dict]):
+    """Print the aggregate report for a multi-operator run."""
+    def fmt(value):
+        return "-" if value is None else f"{value:.1f}s"
+
+    print()
+    print("=" * 60)
+    print("RUN SUMMARY")
+    print("=" * 60)
+    print(f"  Operators:  {summary['succeeded']}/{summary['operators']} succeeded in {summary['wallSeconds']:.1f}s")
+    if summary["unchanged"]:
+        print(f"  Unchanged:  {summary['unchanged']} (content matched the saved result; Claude skipped)")
+    for o in outcomes:
+        if o["status"] == "failed":
+            print(f"    - {o['operator']}: {o['error']}")
+    t = summary["throughput"]
+    print(
+        f"  Throughput: {t['operatorsPerMinute']:.2f} operators/min, "
+        f"{t['productsPerMinute']:.1f} products/min, {t['pagesPerMinute']:.1f} pages/min"
+    )
+    for label, key in (("Latency:", "operatorLatencySeconds"), ("", "claudeLatencySeconds")):
+        lat = summary[key]
+        print(
+            f"  {label:<11} {'operator' if label else 'claude':<8} p50 {fmt(lat['p50'])}, "
+            f"p90 {fmt(lat['p90'])}, p95 {fmt(lat['p95'])}, max {fmt(lat['max'])}"
+        )
+    print(f"  Products:   {summary['products']}")
+    print(f"  Claude:     {summary['tokensIn']:,} input + {summary['tokensOut']:,} output tokens")
+    print(f"  Total est:  {format_usd(summary['claudeCostUsd'])} + {summary['firecrawlCredits']} Firecrawl credits")
+    if summary.get("stages"):
+        print("  Stages (per operator):")
+        print_stage_metrics(summary["stages"])
+    print("=" * 60)
+
+
+def run_manifest(
+    manifest_path: Path,
+    options: ExtractionOptions | None = None,
+    operator_workers: int = DEFAULT_OPERATOR_WORKERS,
+    claude_concurrency: int = DEFAULT_CLAUDE_CONCURRENCY,
+    firecrawl_concurrency: int = DEFAULT_FIRECRAWL_CONCURRENCY,
+) -> dict:
+    """Extract every operator in a manifest concurrently and report on the run.
+
+    Failures are recorded and the run continues. Returns the run report,
+    which is also saved under results/runs/.
+    """
+    options = options or ExtractionOptions()
+    operators = load_operator_manifest(manifest_path)
+    require_api_keys()
+    set_api_limits(claude=claude_concurrency, firecrawl=firecrawl_concurrency)
+
+    print()
+    print("=" * 60)
+    print("EXTRACT OPERATORS — Manifest run (Firecrawl /scrape + Claude API)")
+    print("=" * 60)
+    print(f"  Manifest:       {manifest_path} ({len(operators)} operator(s))")
+    print(f"  Concurrency:    {operator_workers} operators, {claude_concurrency} Claude calls, "
+          f"{firecrawl_concurrency} Firecrawl scrapes")
+    print(f"  Logs:           results/<operator>/extract_operator_v1.log")
+    print()
+
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    progress_lock = threading.Lock()
+    done = 0
+    all_spans: list[dict] = []
+
+    def run_one(op: dict) -> dict:
+        nonlocal done
+        log_dir = RESULTS_DIR / op["slug"]
+        log_dir.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+        result, error = None, None
+        with open(log_dir / "extract_operator_v1.log", "w") as log:
+            token = OPERATOR_LOG.set(log)
+            try:
+                result = run_extraction(op["urls"], operator=op["slug"], options=options)
+            except (Exception, SystemExit) as e:
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                OPERATOR_LOG.reset(token)
+        outcome = _operator_outcome(op["slug"], result, time.monotonic() - started, error)
+        current = STAGE_SPANS.get()
+        if current is not None:
+            outcome["stageSeconds"] = stage_seconds(current["spans"])
+            all_spans.extend(current["spans"])
+        with progress_lock:
+            done += 1
+            if outcome["status"] == "ok":
+                detail = (f"{outcome['products']} products, {outcome['seconds']:.1f}s, "
+                          f"{format_usd(outcome['costUsd'])}")
+            elif outcome["status"] == "unchanged":
+                detail = f"unchanged, reused {outcome['products']} products ({outcome['seconds']:.1f}s)"
+            else:
+                detail = f"FAILED after {outcome['seconds']:.1f}s: {outcome['error']}"
+            print(f"  [{done}/{len(operators)}] {op['slug']}: {detail}", file=real_stdout)
+        return outcome
+
+    started_at = datetime.now(timezone.utc)
+    started = time.monotonic()
+    sys.stdout = ThreadLogRouter(real_stdout)
+    sys.stderr = ThreadLogRouter(real_stderr)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, operator_workers)) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, run_one, op) for op in operators]
+            outcomes = [f.result() for f in futures]
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+        set_api_limits()
+    wall_seconds = time.monotonic() - started
+
+    summary = summarize_run(outcomes, wall_seconds)
+    summary["stages"] = summarize_stage_metrics(all_spans)
+    print_run_report(summary, outcomes)
+
+    report = {
+        "manifest": str(manifest_path),
+        "startedAt": started_at.isoformat(),
+        "model": options.model,
+        "concurrency": {
+            "operators": operator_workers,
+            "claude": claude_concurrency,
+            "firecrawl": firecrawl_concurrency,
+        },
+        "summary": summary,
+        "operators": outcomes,
+    }
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    report_path = RUNS_DIR / f"{started_at.strftime('%Y%m%d_%H%M%S')}_{manifest_path.stem}.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"  Report saved to: {report_path}")
+    return report
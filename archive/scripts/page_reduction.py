@@ -0,0 +1,327 @@
+"""
+Page reduction and prompt assembly.
+
+Shrinks scraped pages before they reach Claude — repeated site chrome is
+sent once, raw HTML becomes a structural digest — and assembles the user
+message from what is left.
+"""
+
+import math
+import re
+from html.parser import HTMLParser
+
+from extraction_common import CHARS_PER_TOKEN
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Raw HTML is reduced to a digest of nav/header/banner/footer/booking-widget
+# text; the digest is capped as a backstop, and HTML is parsed in pieces
+RAW_HTML_DIGEST_MAX_CHARS = 20_000
+HTML_FEED_CHARS = 64 * 1024
+
+# Boilerplate stripping: a block repeated on at least this share of an
+# operator's pages (and this long) is treated as site chrome
+CHROME_MIN_PAGE_SHARE = 0.5
+CHROME_MIN_BLOCK_CHARS = 40
+
+
+# ---------------------------------------------------------------------------
+# Boilerplate stripping
+#
+# Pages scraped from one site repeat the same nav menus, footers and cookie
+# banners. Blocks that recur across an operator's pages are pulled out into
+# a single SITE CHROME section so the prompt carries them once, not N times.
+# ---------------------------------------------------------------------------
+
+def _block_key(block: str) -> str:
+    return " ".join(block.split())
+
+
+def strip_site_chrome(pages: list[dict]) -> tuple[list[dict], list[str], dict]:
+    """Move markdown blocks repeated across pages into one site-chrome list.
+
+    A block (blank-line separated) counts as chrome when it appears on at
+    least CHROME_MIN_PAGE_SHARE of the pages (and at least two) and is
+    CHROME_MIN_BLOCK_CHARS or longer, so short repeated headings stay put.
+
+    Returns (stripped pages, chrome blocks in first-seen order, stats).
+    """
+    stats = {"chromeBlocks": 0, "charsRemoved": 0, "estimatedTokensSaved": 0}
+    if len(pages) < 2:
+        return pages, [], stats
+
+    page_blocks = [re.split(r"\n\s*\n", p["markdown"]) for p in pages]
+    counts: dict[str, int] = {}
+    for blocks in page_blocks:
+        for key in {_block_key(b) for b in blocks}:
+            counts[key] = counts.get(key, 0) + 1
+
+    needed = max(2, math.ceil(len(pages) * CHROME_MIN_PAGE_SHARE))
+    chrome_keys = {
+        key for key, count in counts.items()
+        if count >= needed and len(key) >= CHROME_MIN_BLOCK_CHARS
+    }
+    if not chrome_keys:
+        return pages, [], stats
+
+    chrome: list[str] = []
+    seen: set[str] = set()
+    stripped: list[dict] = []
+    for page, blocks in zip(pages, page_blocks):
+        kept = []
+        for block in blocks:
+            key = _block_key(block)
+            if key not in chrome_keys:
+                kept.append(block)
+            elif key not in seen:
+                seen.add(key)
+                chrome.append(block.strip())
+        stripped.append({**page, "markdown": "\n\n".join(kept)})
+
+    before = sum(len(p["markdown"]) for p in pages)
+    after = sum(len(p["markdown"]) for p in stripped) + sum(len(b) + 2 for b in chrome)
+    stats["chromeBlocks"] = len(chrome)
+    stats["charsRemoved"] = max(0, before - after)
+    stats["estimatedTokensSaved"] = int(stats["charsRemoved"] / CHARS_PER_TOKEN)
+    return stripped, chrome, stats
+
+
+# ---------------------------------------------------------------------------
+# Raw HTML reduction
+#
+# Most of a page's raw HTML is scripts, styles and inline SVG. The parts the
+# prompt wants from it (nav menus, headers, promo banners, footers, booking
+# widgets) are a small fraction, so instead of truncating the raw HTML we
+# stream it through a parser and keep only those subtrees as text, plus any
+# booking-platform embed URLs found anywhere in the page.
+# ---------------------------------------------------------------------------
+
+# Booking platforms named in the extraction prompt, matched in any attribute
+# or inline script
+BOOKING_URL_RE = re.compile(
+    r"(?:https?:)?//[\w.-]*(?:fareharbor\.com|peek\.com|bookeo\.com|rocket-rez\.com|gatemaster[\w.-]*)"
+    r"[^\s\"'<>)\\]*",
+    re.IGNORECASE,
+)
+
+# Subtrees kept in the digest, by id/class when there is no semantic tag or role
+REGION_PATTERNS = [
+    ("booking widget", re.compile(r"fareharbor|peek|bookeo|rocket-?rez|booking|book-now", re.I)),
+    ("banner", re.compile(r"banner|announcement|promo|top-?bar|hello-?bar|notice", re.I)),
+    ("nav", re.compile(r"\bnav|\bmenu\b", re.I)),
+    ("header", re.compile(r"\bheader\b", re.I)),
+    ("footer", re.compile(r"\bfooter\b", re.I)),
+]
+SEMANTIC_REGIONS = {"nav": "nav", "header": "header", "footer": "footer"}
+ROLE_REGIONS = {"navigation": "nav", "banner": "header", "contentinfo": "footer"}
+
+SKIP_TAGS = {"script", "style", "svg", "noscript", "template"}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+BLOCK_TAGS = {
+    "p", "div", "li", "ul", "ol", "tr", "section", "article", "aside",
+    "h1", "h2", "h3", "h4", "h5", "h6", "nav", "header", "footer", "form",
+}
+
+
+class HtmlDigestParser(HTMLParser):
+    """Streaming parser that collects chrome subtrees and booking URLs."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: list[str] = []
+        self.skip_depth: int | None = None
+        self.capture: dict | None = None
+        self.regions: list[tuple[str, str]] = []
+        self.booking_urls: dict[str, None] = {}
+
+    def _add_booking_urls(self, text: str):
+        for match in BOOKING_URL_RE.findall(text):
+            url = match.rstrip(".,;")
+            if url.startswith("//"):
+                url = "https:" + url
+            self.booking_urls.setdefault(url, None)
+
+    def _region_label(self, tag: str, attrs: dict) -> str | None:
+        if tag in SEMANTIC_REGIONS:
+            return SEMANTIC_REGIONS[tag]
+        role = (attrs.get("role") or "").lower()
+        if role in ROLE_REGIONS:
+            return ROLE_REGIONS[role]
+        if tag in ("html", "body", "main"):
+            return None
+        ident = f"{attrs.get('id') or ''} {attrs.get('class') or ''}"
+        for label, pattern in REGION_PATTERNS:
+            if pattern.search(ident):
+                return label
+        return None
+
+    def _finish_capture(self):
+        lines = [" ".join(line.split()) for line in "".join(self.capture["parts"]).splitlines()]
+        text = "\n".join(line for line in lines if line)
+        if text and all(text != existing for _, existing in self.regions):
+            self.regions.append((self.capture["label"], text))
+        self.capture = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        for value in attrs.values():
+            if value:
+                self._add_booking_urls(value)
+
+        if tag in VOID_TAGS:
+            if self.capture and self.skip_depth is None and tag == "br":
+                self.capture["parts"].append("\n")
+            return
+
+        self.stack.append(tag)
+        depth = len(self.stack)
+        if self.skip_depth is None and tag in SKIP_TAGS:
+            self.skip_depth = depth
+        if self.skip_depth is not None:
+            return
+
+        if self.capture is None:
+            label = self._region_label(tag, attrs)
+            if label:
+                self.capture = {"label": label, "depth": depth, "parts": [], "links": {}}
+        if self.capture:
+            if tag in BLOCK_TAGS:
+                self.capture["parts"].append("\n")
+            href = attrs.get("href") or ""
+            if tag == "a" and href and not href.startswith(("#", "javascript:")):
+                self.capture["links"][depth] = href
+
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return
+        # Pop to the matching open tag, closing anything left unclosed inside it
+        index = len(self.stack) - 1 - self.stack[::-1].index(tag)
+        while len(self.stack) > index:
+            depth = len(self.stack)
+            closed = self.stack.pop()
+            if self.skip_depth == depth:
+                self.skip_depth = None
+            if self.capture:
+                href = self.capture["links"].pop(depth, None)
+                if href:
+                    self.capture["parts"].append(f" ({href})")
+                if closed in BLOCK_TAGS:
+                    self.capture["parts"].append("\n")
+                if self.capture["depth"] == depth:
+                    self._finish_capture()
+
+    def handle_data(self, data):
+        if self.skip_depth is not None:
+            # Booking widgets are often configured from inline scripts
+            self._add_booking_urls(data)
+            return
+        if self.capture:
+            self.capture["parts"].append(data)
+
+    def close(self):
+        super().close()
+        if self.capture:
+            self._finish_capture()
+
+
+def reduce_raw_html(raw_html: str) -> dict:
+    """Reduce raw HTML to a compact digest of chrome subtrees and booking URLs.
+
+    The HTML is fed to the parser in pieces, so memory stays flat however
+    large the page is. Returns the digest text plus size/URL stats.
+    """
+    parser = HtmlDigestParser()
+    for start in range(0, len(raw_html), HTML_FEED_CHARS):
+        parser.feed(raw_html[start:start + HTML_FEED_CHARS])
+    parser.close()
+
+    parts = [f"[{label}]\n{text}" for label, text in parser.regions]
+    if parser.booking_urls:
+        parts.append("[booking embed URLs]\n" + "\n".join(parser.booking_urls))
+    digest = "\n\n".join(parts)
+    if len(digest) > RAW_HTML_DIGEST_MAX_CHARS:
+        digest = digest[:RAW_HTML_DIGEST_MAX_CHARS] + f"\n[... digest truncated at {RAW_HTML_DIGEST_MAX_CHARS:,} chars ...]"
+
+    return {
+        "digest": digest,
+        "rawChars": len(raw_html),
+        "digestChars": len(digest),
+        "regions": [label for label, _ in parser.regions],
+        "bookingUrls": list(parser.booking_urls),
+    }
+
+
+def reduce_pages(pages: list[dict], strip_boilerplate: bool = True) -> tuple[list[dict], list[str], dict]:
+    """Pre-reduction stage before prompt assembly; prints the savings.
+
+    Moves repeated blocks into site chrome (unless ``strip_boilerplate`` is
+    off) and reduces the first page's raw HTML to a digest. Returns the
+    reduced pages, the chrome blocks, and extraction metadata describing
+    both reductions.
+    """
+    reduction: dict = {}
+    chrome: list[str] = []
+    if strip_boilerplate:
+        pages, chrome, stats = strip_site_chrome(pages)
+        reduction["siteChrome"] = stats
+        if chrome:
+            print(
+                f"  Site chrome: {stats['chromeBlocks']} repeated block(s) kept once, "
+                f"{stats['charsRemoved']:,} chars removed (~{stats['estimatedTokensSaved']:,} tokens saved)"
+            )
+
+    if pages and pages[0].get("raw_html"):
+        html = reduce_raw_html(pages[0]["raw_html"])
+        pages = [{**pages[0], "raw_html_digest": html["digest"]}] + pages[1:]
+        reduction["rawHtmlDigest"] = {k: v for k, v in html.items() if k != "digest"}
+        print(
+            f"  Raw HTML: {html['rawChars']:,} chars -> {html['digestChars']:,} char digest "
+            f"({len(html['regions'])} regions, {len(html['bookingUrls'])} booking URLs)"
+        )
+
+    return pages, chrome, reduction
+
+
+# ---------------------------------------------------------------------------
+# Prompt assembly
+# ---------------------------------------------------------------------------
+
+def build_user_content(pages: list[dict], include_raw_html: bool, site_chrome: list[str] | None = None) -> str:
+    """Build the user message content from scraped pages."""
+    parts = []
+
+    # Shared nav/banner/footer blocks, shown once ahead of the pages
+    if site_chrome:
+        parts.append(f"\n{'=' * 60}")
+        parts.append("SITE CHROME (navigation, banners and footer repeated on every page — shown once, removed from the pages below)")
+        parts.append(f"{'=' * 60}\n")
+        parts.append("\n\n".join(site_chrome))
+
+    for i, page in enumerate(pages, 1):
+        parts.append(f"\n{'=' * 60}")
+        part = f" (part {page['part'][0]} of {page['part'][1]})" if page.get("part") else ""
+        parts.append(f"PAGE {i} of {len(pages)}: {page['url']}{part}")
+        parts.append(f"{'=' * 60}\n")
+        parts.append(page["markdown"])
+
+    # Append a digest of the first page's raw HTML for nav/banner/footer capture
+    if include_raw_html and pages and pages[0].get("raw_html"):
+        digest = pages[0].get("raw_html_digest")
+        if digest is None:
+            digest = reduce_raw_html(pages[0]["raw_html"])["digest"]
+        parts.append(f"\n{'=' * 60}")
+        parts.append(
+            "RAW HTML DIGEST (supplementary — nav, header, banner, footer and booking-widget "
+            "content from the raw HTML, scripts/styles/SVG removed)"
+        )
+        parts.append(f"URL: {pages[0]['url']}")
+        parts.append(f"{'=' * 60}\n")
+        parts.append(digest)
+
+    return "\n".join(parts)
@@ -0,0 +1,304 @@
+"""
+Preflight estimation — tokens, output size, max_tokens, cost and latency
+for an extraction, computed from scraped (or cached) pages before any
+Claude call.
+"""
+
+import json
+import math
+import re
+
+from api_ledger import ledger_call, set_operator as set_ledger_operator
+from chunking import chunk_user_content, normalize_title, plan_chunks
+from claude_costs import claude_cost_usd, format_usd
+from extraction_common import (
+    CHARS_PER_TOKEN, MAX_TOKENS, RESULTS_DIR, anthropic_client, build_system_blocks, estimate_tokens, firecrawl_app,
+    load_extraction_prompt, require_api_keys,
+)
+from extraction_options import ExtractionOptions
+from page_reduction import build_user_content, reduce_pages
+from scraping import cached_pages_only, scrape_operator
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Preflight: output size per operator block and per product (Phase 0 runs
+# averaged ~800 output tokens/product), max_tokens headroom over the
+# prediction, and per-model output limits
+OUTPUT_TOKENS_BASE = 1_500
+OUTPUT_TOKENS_PER_PRODUCT = 800
+MAX_TOKENS_HEADROOM = 1.3
+MIN_MAX_TOKENS = 4_096
+MODEL_MAX_OUTPUT_TOKENS = {
+    "claude-opus-4-6": 32_000,
+    "claude-sonnet-4-5-20250929": 64_000,
+    "claude-haiku-4-5-20251001": 64_000,
+}
+
+# Preflight latency model; output rates are replaced by the median observed
+# rate once saved results record claudeLatencySeconds for the model
+LATENCY_BASE_SECONDS = 2.0
+INPUT_TOKENS_PER_SECOND = 10_000
+DEFAULT_OUTPUT_TOKENS_PER_SECOND = {
+    "claude-opus-4-6": 35.0,
+    "claude-sonnet-4-5-20250929": 60.0,
+    "claude-haiku-4-5-20251001": 110.0,
+}
+
+
+# ---------------------------------------------------------------------------
+# Preflight estimation
+#
+# Assembles the exact prompt from scraped (or cached) pages and estimates
+# tokens, output size, max_tokens, cost and latency before any Claude call.
+# ---------------------------------------------------------------------------
+
+def predict_product_count(pages: list[dict]) -> int:
+    """Guess how many products the extraction will return from page content.
+
+    Counts distinct booking-item URLs (FareHarbor items, Peek activities)
+    and distinct headed sections that mention a price, and takes the larger.
+    """
+    item_ids: set[str] = set()
+    priced_sections: set[str] = set()
+    for page in pages:
+        text = page["markdown"] + (page.get("raw_html") or "")
+        item_ids.update(re.findall(r"fareharbor\.com/embeds/book/[\w-]+/items/(\d+)", text))
+        item_ids.update(re.findall(r"book\.peek\.com/s/[\w-]+/([\w-]+)", text))
+        for section in re.split(r"^#{1,4} ", page["markdown"], flags=re.MULTILINE)[1:]:
+            heading, _, body = section.partition("\n")
+            if re.search(r"\$\s?\d", body):
+                priced_sections.add(normalize_title(heading))
+    return max(1, len(item_ids), len(priced_sections))
+
+
+def predict_output_tokens(product_count: int) -> int:
+    return OUTPUT_TOKENS_BASE + product_count * OUTPUT_TOKENS_PER_PRODUCT
+
+
+def choose_max_tokens(output_tokens: int, model: str) -> int:
+    """Smallest 1k-rounded max_tokens with headroom over the predicted output."""
+    wanted = math.ceil(output_tokens * MAX_TOKENS_HEADROOM / 1024) * 1024
+    return min(max(wanted, MIN_MAX_TOKENS), MODEL_MAX_OUTPUT_TOKENS.get(model, MAX_TOKENS))
+
+
+def output_tokens_per_second(model: str) -> float:
+    """Median observed output rate for a model from saved results, else the default."""
+    rates = []
+    for path in RESULTS_DIR.glob("*/extract_operator_v1.json"):
+        try:
+            with open(path) as f:
+                meta = json.load(f).get("extractionMetadata", {})
+        except (OSError, ValueError):
+            continue
+        latency = meta.get("claudeLatencySeconds")
+        if meta.get("claudeModel") == model and latency and not meta.get("chunking"):
+            rates.append(meta["claudeTokensOut"] / latency)
+    if rates:
+        return sorted(rates)[len(rates) // 2]
+    return DEFAULT_OUTPUT_TOKENS_PER_SECOND.get(model, 40.0)
+
+
+def estimate_latency(input_tokens: int, output_tokens: int, output_tps: float) -> float:
+    return LATENCY_BASE_SECONDS + input_tokens / INPUT_TOKENS_PER_SECOND + output_tokens / output_tps
+
+
+def predict_call_outputs(product_count: int, user_tokens: list[int]) -> list[float]:
+    """Predicted output tokens per call; chunk outputs split in proportion to their input."""
+    output_tokens = predict_output_tokens(product_count)
+    if len(user_tokens) == 1:
+        return [float(output_tokens)]
+    share = [t / max(1, sum(user_tokens)) for t in user_tokens]
+    return [OUTPUT_TOKENS_BASE + (output_tokens - OUTPUT_TOKENS_BASE) * s for s in share]
+
+
+def planned_messages(
+    pages: list[dict], site_chrome: list[str] | None, options: ExtractionOptions,
+) -> list[str]:
+    """The user message(s) a run sends for reduced ``pages``: one, or one per chunk."""
+    if not options.chunked:
+        return [build_user_content(pages, options.include_raw_html, site_chrome)]
+    chunks = plan_chunks(pages, options.include_raw_html, options.chunk_tokens, site_chrome)
+    return [chunk_user_content(c, options.include_raw_html, site_chrome, i == 0) for i, c in enumerate(chunks)]
+
+
+def count_input_tokens(client, model: str, system_blocks: list[dict], user_content: str) -> int:
+    """Exact input tokens for one call, from the Messages token-counting endpoint."""
+    with ledger_call("claude", "messages.count_tokens", model=model):
+        return client.messages.count_tokens(
+            model=model,
+            system=system_blocks,
+            messages=[{"role": "user", "content": user_content}],
+        ).input_tokens
+
+
+def preflight_operator(
+    slug: str,
+    products: int,
+    pages: list[dict],
+    site_chrome: list[str] | None,
+    extraction_prompt: str,
+    model: str,
+    options: ExtractionOptions,
+    cache_read: bool = False,
+    output_tps: float | None = None,
+    client=None,
+) -> dict:
+    """Estimate tokens, max_tokens, cost and latency for one operator's extraction with ``model``.
+
+    ``pages`` and ``site_chrome`` come from reduce_pages; ``products`` is
+    the predicted product count. Input tokens come from
+    ``client.messages.count_tokens`` when a client is given, else from the
+    local chars/token estimate. ``cache_read`` prices the system prompt as a
+    prompt-cache read (an earlier call in the same run wrote it); otherwise
+    the first call writes it.
+    """
+    messages = planned_messages(pages, site_chrome, options)
+    system_tokens = estimate_tokens(extraction_prompt)
+    user_tokens = [estimate_tokens(m) for m in messages]
+    token_source = "estimate"
+    if client is not None:
+        try:
+            system_blocks = build_system_blocks(extraction_prompt, options.prompt_cache)
+            # A one-character message measures the system prompt and message overhead
+            base = count_input_tokens(client, model, system_blocks, ".")
+            user_tokens = [count_input_tokens(client, model, system_blocks, m) - base for m in messages]
+            system_tokens, token_source = base, "count_tokens"
+        except Exception as e:
+            print(f"  WARNING: token counting failed ({e}); using the local estimate")
+    output_tps = output_tps or output_tokens_per_second(model)
+
+    call_outputs = predict_call_outputs(products, user_tokens)
+    output_tokens = int(sum(call_outputs))
+    largest_output = int(max(call_outputs))
+    calls = len(messages)
+    waves = math.ceil(calls / max(1, options.chunk_workers)) if options.chunked else 1
+    latency = waves * max(
+        estimate_latency(system_tokens + u, o, output_tps) for u, o in zip(user_tokens, call_outputs)
+    )
+
+    # Only the first call of a run writes the cached system prompt
+    if options.prompt_cache:
+        cache_write = 0 if cache_read else system_tokens
+        cache_reads = system_tokens * (calls - (0 if cache_read else 1))
+        plain_input = sum(user_tokens)
+    else:
+        cache_write = cache_reads = 0
+        plain_input = sum(user_tokens) + system_tokens * calls
+    cost = claude_cost_usd(model, plain_input, output_tokens, cache_write, cache_reads)
+
+    max_tokens = choose_max_tokens(largest_output, model)
+    return {
+        "operator": slug,
+        "model": model,
+        "pages": len(pages),
+        "calls": calls,
+        "tokenSource": token_source,
+        "systemTokens": system_tokens,
+        "userTokens": sum(user_tokens),
+        "predictedProducts": products,
+        "outputTokens": output_tokens,
+        "maxTokens": max_tokens,
+        "fitsMaxTokens": largest_output * MAX_TOKENS_HEADROOM <= max_tokens,
+        "costUsd": cost,
+        "latencySeconds": latency,
+    }
+
+
+def auto_max_tokens(predicted_products: int, messages: list[str], model: str) -> int:
+    """The max_tokens --preflight suggests for the messages a run sends (--max-tokens auto)."""
+    call_outputs = predict_call_outputs(predicted_products, [estimate_tokens(m) for m in messages])
+    return choose_max_tokens(int(max(call_outputs)), model)
+
+
+def print_preflight(estimates: list[dict], model: str, credits: int, scraped: bool, missing: dict[str, list[str]]):
+    """Print per-operator and total preflight estimates."""
+    print()
+    print("=" * 60)
+    print(f"PREFLIGHT ESTIMATE ({model})")
+    print("=" * 60)
+    print(f"  {'Operator':<22} {'Pages':>5} {'Calls':>5} {'Input':>8} {'Prod':>5} {'Output':>7} {'max_tok':>8} {'Cost':>7} {'Time':>7}")
+    for est in estimates:
+        flag = "" if est["fitsMaxTokens"] else "  !"
+        print(
+            f"  {est['operator']:<22} {est['pages']:>5} {est['calls']:>5} "
+            f"{est['systemTokens'] * est['calls'] + est['userTokens']:>8,} "
+            f"{est['predictedProducts']:>5} {est['outputTokens']:>7,} {est['maxTokens']:>8,} "
+            f"{format_usd(est['costUsd']):>7} {est['latencySeconds']:>6.0f}s{flag}"
+        )
+    total_cost = sum(e["costUsd"] for e in estimates)
+    total_time = sum(e["latencySeconds"] for e in estimates)
+    print(f"  {'-' * 62}")
+    print(f"  Claude:     {format_usd(total_cost)}, ~{total_time:.0f}s if run sequentially")
+    if estimates and all(e["tokenSource"] == "count_tokens" for e in estimates):
+        print("  Input:      counted with messages.count_tokens")
+    else:
+        print(f"  Input:      estimated locally (~{CHARS_PER_TOKEN} chars/token)")
+    print(f"  Firecrawl:  {credits} credits ({'spent by this preflight' if scraped else 'needed for uncached pages'})")
+    if any(not e["fitsMaxTokens"] for e in estimates):
+        print("  ! predicted output exceeds the model's output limit — use --chunked")
+    for slug, urls in missing.items():
+        print(f"  {slug}: {len(urls)} page(s) not in the scrape cache (excluded; use --preflight to scrape)")
+    print("=" * 60)
+
+
+def run_preflight(
+    operators: list[dict],
+    options: ExtractionOptions | None = None,
+    scrape: bool = True,
+) -> list[dict]:
+    """Estimate a run over one or more operators without extracting anything.
+
+    Every cascade tier is estimated (just ``options.model`` without a
+    cascade). With ``scrape``, uncached pages are fetched from Firecrawl
+    (spending credits) and input tokens are counted exactly with Claude's
+    free token-counting endpoint. Without it, only the scrape cache is read,
+    tokens are estimated locally and nothing is called at all.
+    """
+    options = options or ExtractionOptions()
+    extraction_prompt = load_extraction_prompt()
+    app = client = None
+    if scrape:
+        fc_key, anth_key = require_api_keys()
+        app = firecrawl_app(fc_key)
+        client = anthropic_client(anth_key)
+
+    tiers = options.tiers
+    output_tps = {model: output_tokens_per_second(model) for model in tiers}
+    estimates: dict[str, list[dict]] = {model: [] for model in tiers}
+    credits = 0
+    missing: dict[str, list[str]] = {}
+    for op in operators:
+        print(f"\n{op['slug']}: {len(op['urls'])} page(s)")
+        set_ledger_operator(op["slug"])
+        if scrape:
+            scraped = scrape_operator(app, op["urls"], options.include_raw_html, **options.scrape_kwargs())
+            if scraped is None:
+                continue
+            credits += scraped["total_credits"]
+        else:
+            max_age = 0 if options.refresh else options.max_age_hours
+            scraped = cached_pages_only(op["urls"], options.include_raw_html, max_age)
+            print(f"  {len(scraped['pages'])} cached, {len(scraped['missing'])} not cached")
+            if scraped["missing"]:
+                missing[op["slug"]] = scraped["missing"]
+                credits += len(scraped["missing"])
+            if not scraped["pages"]:
+                continue
+        # Predict from the full pages: stripping may move product blocks into site chrome
+        products = predict_product_count(scraped["pages"])
+        pages, site_chrome, _ = reduce_pages(scraped["pages"], options.strip_boilerplate)
+        for model in tiers:
+            estimates[model].append(preflight_operator(
+                op["slug"], products, pages, site_chrome, extraction_prompt, model, options,
+                cache_read=bool(estimates[model]), output_tps=output_tps[model], client=client,
+            ))
+    set_ledger_operator(None)
+
+    for tier, model in enumerate(tiers, 1):
+        print_preflight(estimates[model], model, credits, scrape, missing)
+        if len(tiers) > 1 and tier < len(tiers):
+            print(f"  (cascade: tier {tier + 1} only runs for operators that fail validation at tier {tier})")
+    return [estimate for model in tiers for estimate in estimates[model]]
@@ -0,0 +1,161 @@
+"""
+Product repair — re-ask Claude for just the products that fail the schema.
+"""
+
+import json
+import sys
+
+from api_ledger import ledger_call
+from chunking import normalize_url
+from claude_costs import ledger_usage, usage_tokens
+from extraction_common import TEMPERATURE, api_slot
+from extraction_validation import product_errors
+from preflight import choose_max_tokens, predict_output_tokens
+from response_parsing import parse_extraction_json
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Product repair: products failing the schema are re-requested in groups,
+# each with up to this much of the page text it came from
+REPAIR_PRODUCTS_PER_CALL = 10
+REPAIR_CONTEXT_CHARS = 6_000
+
+
+# ---------------------------------------------------------------------------
+# Product repair
+#
+# Products are validated one at a time against the compiled product schema.
+# Only the failing ones are sent back to Claude, each with its validation
+# errors and the page text it came from, and the corrected products are
+# spliced back in place — one bad product no longer means rerunning the
+# whole operator.
+# ---------------------------------------------------------------------------
+
+def repair_errors(product) -> list[str]:
+    """Schema violations in one entry of "products"; a non-object is reported as such."""
+    return product_errors(product) if isinstance(product, dict) else ["not an object"]
+
+
+def product_title(product, default: str = "?") -> str:
+    """A product's title for messages, tolerating entries that are not objects."""
+    return product.get("title", default) if isinstance(product, dict) else default
+
+
+def product_context(product, pages: list[dict], max_chars: int = REPAIR_CONTEXT_CHARS) -> str:
+    """Page text around a product: its own page if known, else where its title appears."""
+    title = str(product_title(product, "") or "").strip()
+    product_url = normalize_url(product.get("url") if isinstance(product, dict) else None)
+    ordered = sorted(pages, key=lambda p: normalize_url(p["url"]) != product_url)
+
+    for page in ordered:
+        markdown = page.get("markdown") or ""
+        at = markdown.lower().find(title.lower()) if title else -1
+        if at < 0 and normalize_url(page["url"]) != product_url:
+            continue
+        start = max(0, at - max_chars // 4) if at >= 0 else 0
+        return f"URL: {page['url']}\n\n{markdown[start:start + max_chars]}"
+    return "(no page text mentions this product)"
+
+
+def build_repair_content(products: list, errors: list[list[str]], pages: list[dict]) -> str:
+    """User message asking Claude to correct specific products."""
+    parts = [
+        "The products below come from your extraction of this operator's website "
+        "but fail schema validation. Using the page text given for each, return ONLY "
+        'a JSON object of the form {"products": [...]} with one corrected product per '
+        "entry, in the same order. Fix the listed errors, keep every other field, and "
+        "omit any field the page does not support."
+    ]
+    for i, (product, errs) in enumerate(zip(products, errors), 1):
+        parts.append(
+            f"=== PRODUCT {i} ===\n"
+            "Validation errors:\n"
+            + "\n".join(f"- {e}" for e in errs)
+            + f"\n\nExtracted JSON:\n{json.dumps(product, indent=2, ensure_ascii=False)}"
+            + f"\n\nPage text:\n{product_context(product, pages)}"
+        )
+    return "\n\n".join(parts)
+
+
+def repair_invalid_products(
+    client,
+    model: str,
+    system_blocks: list[dict],
+    pages: list[dict],
+    result: dict,
+) -> dict | None:
+    """Re-ask Claude for just the products that fail validation, splicing fixes into ``result``.
+
+    Returns {tokens, metadata} describing the repair, or None if every
+    product was already valid.
+    """
+    products = result.get("products") or []
+    invalid = {i: errs for i, errs in enumerate(map(repair_errors, products)) if errs}
+    if not invalid:
+        return None
+
+    print(f"  Validation: {len(invalid)}/{len(products)} product(s) fail the schema — re-asking for those only")
+    tokens = {"input": 0, "output": 0, "cacheWrite": 0, "cacheRead": 0}
+    repaired = 0
+    indices = list(invalid)
+    for start in range(0, len(indices), REPAIR_PRODUCTS_PER_CALL):
+        group = indices[start:start + REPAIR_PRODUCTS_PER_CALL]
+        user_content = build_repair_content(
+            [products[i] for i in group], [invalid[i] for i in group], pages,
+        )
+        try:
+            with api_slot("claude"), ledger_call("claude", "messages.create", model=model) as call:
+                response = client.messages.create(
+                    model=model,
+                    max_tokens=choose_max_tokens(predict_output_tokens(len(group)), model),
+                    temperature=TEMPERATURE,
+                    system=system_blocks,
+                    messages=[{"role": "user", "content": user_content}],
+                )
+                ledger_usage(call, model, response)
+        except Exception as e:
+            print(f"  WARNING: product re-ask failed: {e}", file=sys.stderr)
+            continue
+        for key, value in usage_tokens(response.usage).items():
+            tokens[key] += value
+
+        try:
+            fixed = parse_extraction_json(response.content[0].text).get("products") or []
+        except (json.JSONDecodeError, IndexError) as e:
+            print(f"  WARNING: could not parse product re-ask: {e}", file=sys.stderr)
+            continue
+        if len(fixed) != len(group):
+            print(
+                f"  WARNING: re-ask returned {len(fixed)} product(s) for {len(group)}; keeping originals",
+                file=sys.stderr,
+            )
+            continue
+
+        # Splice back only products that now validate
+        for i, product in zip(group, fixed):
+            remaining = repair_errors(product)
+            if remaining:
+                invalid[i] = remaining
+                continue
+            products[i] = product
+            del invalid[i]
+            repaired += 1
+            print(f"    ✓ {product_title(product)}")
+
+    for i, errs in invalid.items():
+        print(f"    ✗ {product_title(products[i])}: {errs[0]}")
+    print(f"  Repair: {repaired} fixed, {len(invalid)} still invalid ({tokens['input']:,} in / {tokens['output']:,} out)")
+    print()
+    return {
+        "tokens": tokens,
+        "metadata": {
+            "invalidProducts": repaired + len(invalid),
+            "repairedProducts": repaired,
+            "remainingErrors": {str(product_title(products[i], str(i))): errs for i, errs in invalid.items()},
+            "repairTokensIn": tokens["input"],
+            "repairTokensOut": tokens["output"],
+        },
+    }
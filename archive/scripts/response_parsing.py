@@ -0,0 +1,278 @@
+"""
+Parsing Claude's extraction responses — tolerant JSON scanning, incremental
+product parsing for streamed responses, and saving unparseable output.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from extraction_common import RESULTS_DIR
+
+
+# ---------------------------------------------------------------------------
+# JSON parsing
+# ---------------------------------------------------------------------------
+
+def _first_parsable(text: str, spans: list[tuple[int, int]]):
+    """The first of ``spans`` (start, end offsets into ``text``) that parses as JSON, else None."""
+    for begin, end in spans:
+        try:
+            return json.loads(text[begin:end])
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def scan_json_object(text: str) -> tuple[dict, bool]:
+    """
+    Find the outermost JSON object in Claude's response text.
+
+    One left-to-right pass tracking string/escape state and nesting, so
+    surrounding prose, markdown fences (even stray ``` inside strings) and
+    text after the object are ignored. A candidate "{" that turns out not to
+    be JSON (mismatched bracket, or a balanced span json.loads rejects)
+    falls back to the complete objects directly inside it, and the scan
+    carries on after the point where it broke; no character is scanned
+    twice. (So a "{" inside quoted prose ahead of the object, which throws
+    off string tracking for the rest of that candidate, is not retried from
+    later braces.) If the text ends mid-object (output cut off at max_tokens), the
+    object is cut back to the last complete element of its top-level
+    "products" array (an empty array if none is complete), or to its last
+    complete top-level member if that comes later, and its open structures
+    closed. A half-written product is never returned, matching
+    IncrementalExtractionParser.
+
+    Returns (object, repaired). Raises json.JSONDecodeError if no object
+    can be recovered.
+    """
+    stack: list[str] = []  # open brackets of the current candidate
+    start = child_start = string_start = 0
+    in_string = escape = False
+    last_key = None  # the last string closed directly inside the candidate
+    in_products = False  # inside the candidate's top-level "products" array
+    cut = None  # (end offset, closing brackets) after the last complete product
+    member_cut = None  # (end offset, closing brackets) after a complete top-level member
+    children: list[tuple[int, int]] = []  # complete objects directly inside the candidate
+
+    i = text.find("{")
+    while i != -1 and i < len(text):
+        ch = text[i]
+        if not stack:
+            # A new candidate always starts on a "{"
+            stack = ["{"]
+            start = i
+            in_string = escape = in_products = False
+            last_key = cut = member_cut = None
+            children = []
+        elif in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+                if len(stack) == 1:
+                    last_key = text[string_start:i]
+        elif ch == '"':
+            in_string = True
+            string_start = i + 1
+        elif ch in "{[":
+            stack.append(ch)
+            if ch == "{" and len(stack) == 2:
+                child_start = i
+            elif ch == "[" and len(stack) == 2:
+                in_products = last_key == "products"
+                if in_products:
+                    cut = (i + 1, "]}")
+        elif ch in "}]":
+            closes = not stack or (ch == "}") == (stack[-1] == "{")
+            if closes:
+                stack.pop()
+            if not closes or not stack:
+                # The candidate ended: return it if it is JSON, else the
+                # first complete object inside it, else keep scanning
+                if closes:
+                    try:
+                        return json.loads(text[start:i + 1]), False
+                    except json.JSONDecodeError:
+                        pass
+                found = _first_parsable(text, children)
+                if found is not None:
+                    return found, False
+                stack = []
+                i = text.find("{", i + 1)
+                continue
+            if len(stack) == 1:
+                if ch == "}":
+                    children.append((child_start, i + 1))
+                in_products = False
+                member_cut = (i + 1, "}")
+            elif len(stack) == 2 and in_products:
+                cut = (i + 1, "]}")
+        i += 1
+
+    if stack:
+        # Ran off the end still inside the candidate: truncated output
+        candidates = [c for c in (cut, member_cut) if c is not None]
+        if candidates:
+            end, closers = max(candidates, key=lambda c: c[0])
+            try:
+                return json.loads(text[start:end] + closers), True
+            except json.JSONDecodeError:
+                pass
+        found = _first_parsable(text, children)
+        if found is not None:
+            return found, False
+    raise json.JSONDecodeError("no complete or repairable JSON object found", text, 0)
+
+
+def parse_extraction_json(response_text: str) -> dict:
+    """Extract the JSON object from Claude's response text (see scan_json_object)."""
+    return scan_json_object(response_text)[0]
+
+
+class IncrementalExtractionParser:
+    """Parse the extraction JSON as it streams in, one product at a time.
+
+    Tracks string/escape state and nesting depth character by character, so
+    each call to ``feed`` only scans the new text. Whenever an element of the
+    top-level "products" array closes it is parsed and returned; the
+    "operator" object is parsed as soon as it closes. Only the unconsumed
+    tail (the product or operator still being streamed) is buffered, so a
+    long response costs linear time and constant memory. If the stream is cut
+    off, ``products`` still holds every complete product and
+    ``resume_offset`` marks where the next product would have started.
+    """
+
+    def __init__(self):
+        # buffer holds the response from absolute offset ``base`` on; pos,
+        # string_start and value_start index into the buffer
+        self.buffer = ""
+        self.base = 0
+        self.pos = 0
+        self.started = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+        self.last_string = ""
+        self.key = None
+        self.value_start = 0
+        self.operator: dict | None = None
+        self.products: list[dict] = []
+        self.resume_offset = 0
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume more response text; return products completed by it."""
+        text = self.buffer + chunk
+        completed = []
+        while self.pos < len(text):
+            i = self.pos
+            c = text[i]
+            self.pos += 1
+
+            if not self.started:
+                # Skip any preamble or ```json fence before the root object
+                if c == "{":
+                    self.started = True
+                    self.depth = 1
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    if self.depth == 1:
+                        self.last_string = text[self.string_start:i]
+                continue
+
+            if c == '"':
+                self.in_string = True
+                self.string_start = i + 1
+            elif c == ":" and self.depth == 1:
+                self.key = self.last_string
+            elif c in "{[":
+                self.depth += 1
+                if self.depth == 2 or (self.depth == 3 and self.key == "products"):
+                    self.value_start = i
+            elif c in "}]":
+                self.depth -= 1
+                if self.depth == 2 and self.key == "products" and c == "}":
+                    product = self._loads(text[self.value_start:i + 1])
+                    if isinstance(product, dict):
+                        self.products.append(product)
+                        self.resume_offset = self.base + i + 1
+                        completed.append(product)
+                elif self.depth == 1 and self.key == "operator":
+                    operator = self._loads(text[self.value_start:i + 1])
+                    if isinstance(operator, dict):
+                        self.operator = operator
+
+        # Drop everything no open value still needs
+        keep = self._needed_from()
+        self.buffer = text[keep:]
+        self.base += keep
+        self.pos -= keep
+        self.string_start -= keep
+        self.value_start -= keep
+        return completed
+
+    def _needed_from(self) -> int:
+        """Earliest buffer index a later ``feed`` may still slice from."""
+        if self.in_string and self.depth == 1:
+            return self.string_start  # a top-level key still being read
+        if (self.key == "operator" and self.depth >= 2) or (self.key == "products" and self.depth >= 3):
+            return self.value_start
+        return self.pos
+
+    @staticmethod
+    def _loads(fragment: str):
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError:
+            return None
+
+    def partial_result(self) -> dict:
+        """Everything recovered so far, shaped like a full extraction result."""
+        return {"operator": self.operator or {}, "products": list(self.products)}
+
+    def resume_point(self) -> dict:
+        """Where a follow-up extraction should pick up after a cut-off stream."""
+        last = self.products[-1] if self.products else {}
+        return {
+            "productsComplete": len(self.products),
+            "lastCompleteProduct": last.get("title"),
+            "responseOffset": self.resume_offset,
+        }
+
+
+def save_raw_response(operator_slug: str, response_text: str, suffix: str = "") -> Path:
+    """Save an unparseable Claude response for debugging."""
+    output_dir = RESULTS_DIR / operator_slug
+    output_dir.mkdir(parents=True, exist_ok=True)
+    raw_path = output_dir / f"extract_operator_v1_raw{suffix}.txt"
+    with open(raw_path, "w") as f:
+        f.write(response_text)
+    return raw_path
+
+
+def parse_response(operator_slug: str, response_text: str, raw_suffix: str = "") -> dict | None:
+    """Parse Claude's response, saving the raw text if no JSON can be recovered."""
+    try:
+        result, repaired = scan_json_object(response_text)
+    except json.JSONDecodeError as e:
+        print(f"ERROR: Failed to parse JSON from Claude response: {e}", file=sys.stderr)
+        print(f"  Response preview: {response_text[:500]}", file=sys.stderr)
+        raw_path = save_raw_response(operator_slug, response_text, raw_suffix)
+        print(f"  Raw response saved to: {raw_path}", file=sys.stderr)
+        return None
+    if repaired:
+        print(
+            f"  WARNING: response JSON was cut off; closed it after the last complete element "
+            f"({len(result.get('products') or [])} products kept)"
+        )
+    return result
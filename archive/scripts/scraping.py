@@ -0,0 +1,248 @@
+"""
+Firecrawl scraping with a local scrape cache.
+
+Pages are scraped concurrently under a per-host cap, and every fresh scrape
+is cached under cache/scrapes/ so later runs (and --dry-run estimates) can
+reuse it without spending another credit.
+"""
+
+import contextvars
+import hashlib
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from api_ledger import ledger_call
+from extraction_common import PROJECT_ROOT, api_slot
+
+if TYPE_CHECKING:
+    from firecrawl import FirecrawlApp
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SCRAPE_CACHE_DIR = PROJECT_ROOT / "cache" / "scrapes"
+
+# Concurrent scraping: total in-flight Firecrawl requests, and per hostname
+# so a single operator site is not hammered
+DEFAULT_SCRAPE_WORKERS = 4
+DEFAULT_SCRAPES_PER_HOST = 2
+
+# Scraped pages younger than this are reused from the local cache instead of
+# spending another Firecrawl credit
+DEFAULT_SCRAPE_MAX_AGE_HOURS = 24 * 7
+
+
+# ---------------------------------------------------------------------------
+# Scrape cache
+# ---------------------------------------------------------------------------
+
+def scrape_cache_path(url: str, formats: list[str], only_main_content: bool) -> Path:
+    """Cache file for one URL scraped with a given format set and content mode."""
+    key = json.dumps(
+        {"url": url, "formats": sorted(formats), "onlyMainContent": only_main_content},
+        sort_keys=True,
+    )
+    return SCRAPE_CACHE_DIR / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+
+def load_cached_scrape(
+    url: str, formats: list[str], only_main_content: bool, max_age_hours: float,
+) -> dict | None:
+    """Return the cached scrape for a URL if present and younger than max_age_hours."""
+    path = scrape_cache_path(url, formats, only_main_content)
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        fetched_at = datetime.fromisoformat(cached["fetchedAt"])
+    except (OSError, ValueError, KeyError):
+        return None
+    if datetime.now(timezone.utc) - fetched_at > timedelta(hours=max_age_hours):
+        return None
+    return cached
+
+
+def save_cached_scrape(
+    url: str,
+    formats: list[str],
+    only_main_content: bool,
+    markdown: str,
+    raw_html: str | None,
+):
+    """Store a fresh scrape so later runs can reuse it without spending a credit."""
+    SCRAPE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = scrape_cache_path(url, formats, only_main_content)
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "url": url,
+                "formats": sorted(formats),
+                "onlyMainContent": only_main_content,
+                "fetchedAt": datetime.now(timezone.utc).isoformat(),
+                "markdown": markdown,
+                "rawHtml": raw_html,
+            },
+            f,
+            ensure_ascii=False,
+        )
+
+
+def cached_pages_only(urls: list[str], include_raw_html: bool, max_age_hours: float) -> dict:
+    """Read pages from the scrape cache without calling Firecrawl."""
+    formats = ["markdown"] + (["rawHtml"] if include_raw_html else [])
+    pages, missing = [], []
+    for url in urls:
+        cached = load_cached_scrape(url, formats, False, max_age_hours)
+        if cached is None:
+            missing.append(url)
+            continue
+        markdown = cached.get("markdown") or ""
+        pages.append({
+            "url": url,
+            "markdown": markdown,
+            "raw_html": cached.get("rawHtml") if include_raw_html else None,
+            "chars": len(markdown),
+            "cached": True,
+        })
+    return {"pages": pages, "missing": missing, "total_credits": 0}
+
+
+# ---------------------------------------------------------------------------
+# Scraping
+# ---------------------------------------------------------------------------
+
+def scrape_pages(
+    app: "FirecrawlApp",
+    urls: list[str],
+    include_raw_html: bool = False,
+    timeout: int = 60000,
+    max_workers: int = DEFAULT_SCRAPE_WORKERS,
+    per_host: int = DEFAULT_SCRAPES_PER_HOST,
+    max_age_hours: float = DEFAULT_SCRAPE_MAX_AGE_HOURS,
+    refresh: bool = False,
+) -> dict:
+    """
+    Scrape all provided URLs via Firecrawl /scrape.
+
+    Pages are fetched concurrently by up to ``max_workers`` threads, with at
+    most ``per_host`` in-flight requests to any one hostname. Pages come
+    back in the order the URLs were given, regardless of completion order.
+
+    Pages scraped within ``max_age_hours`` are served from the local scrape
+    cache for free; ``refresh`` forces a fresh scrape (and re-caches it).
+
+    Returns dict with pages, total_credits, cached_pages, and any errors.
+    """
+    formats = ["markdown"]
+    if include_raw_html:
+        formats.append("rawHtml")
+    only_main_content = False
+
+    host_slots: dict[str, threading.BoundedSemaphore] = {}
+    for url in urls:
+        host = urlparse(url).hostname or ""
+        host_slots.setdefault(host, threading.BoundedSemaphore(max(1, per_host)))
+    print_lock = threading.Lock()
+
+    def scrape_one(i: int, url: str) -> tuple[dict | None, dict | None]:
+        if not refresh:
+            cached = load_cached_scrape(url, formats, only_main_content, max_age_hours)
+            if cached is not None:
+                markdown = cached.get("markdown") or ""
+                raw_html = cached.get("rawHtml") if include_raw_html else None
+                with print_lock:
+                    print(f"  Scraping [{i}/{len(urls)}]: {url}")
+                    print(f"    -> {len(markdown)} chars markdown (cached {cached['fetchedAt'][:16]})")
+                return {
+                    "url": url,
+                    "markdown": markdown,
+                    "raw_html": raw_html,
+                    "chars": len(markdown),
+                    "cached": True,
+                }, None
+
+        with host_slots[urlparse(url).hostname or ""], api_slot("firecrawl"):
+            started = time.monotonic()
+            try:
+                with ledger_call("firecrawl", "scrape", credits=1):
+                    doc = app.scrape(
+                        url,
+                        formats=formats,
+                        only_main_content=only_main_content,
+                        timeout=timeout,
+                    )
+            except Exception as e:
+                with print_lock:
+                    print(f"  Scraping [{i}/{len(urls)}]: {url}")
+                    print(f"    -> ERROR: {e}", file=sys.stderr)
+                return None, {"url": url, "error": str(e)}
+            elapsed = time.monotonic() - started
+
+        markdown = doc.markdown or ""
+        raw_html = doc.raw_html if include_raw_html else None
+        save_cached_scrape(url, formats, only_main_content, markdown, raw_html)
+        raw_note = f" + {len(raw_html)} chars raw HTML" if raw_html else ""
+        with print_lock:
+            print(f"  Scraping [{i}/{len(urls)}]: {url}")
+            print(f"    -> {len(markdown)} chars markdown{raw_note} ({elapsed:.1f}s)")
+        return {
+            "url": url,
+            "markdown": markdown,
+            "raw_html": raw_html,
+            "chars": len(markdown),
+            "cached": False,
+        }, None
+
+    workers = max(1, min(max_workers, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # copy_context keeps a manifest run's per-operator log routing in worker threads
+        futures = [
+            pool.submit(contextvars.copy_context().run, scrape_one, i, url)
+            for i, url in enumerate(urls, 1)
+        ]
+        results = [future.result() for future in futures]
+
+    pages = [page for page, _ in results if page]
+    errors = [error for _, error in results if error]
+    cached_pages = sum(1 for page in pages if page["cached"])
+
+    return {
+        "pages": pages,
+        "total_credits": len(pages) - cached_pages,  # 1 credit per fresh scrape
+        "cached_pages": cached_pages,
+        "errors": errors,
+    }
+
+
+def scrape_operator(app: "FirecrawlApp", urls: list[str], include_raw_html: bool, **scrape_kwargs) -> dict | None:
+    """Step 1 — scrape an operator's pages and report failures.
+
+    Returns the scrape_pages result, or None if every page failed.
+    """
+    scrape_result = scrape_pages(app, urls, include_raw_html, **scrape_kwargs)
+
+    if not scrape_result["pages"]:
+        print("ERROR: All pages failed to scrape. Aborting.", file=sys.stderr)
+        return None
+
+    if scrape_result["errors"]:
+        print(f"\n  WARNING: {len(scrape_result['errors'])} page(s) failed to scrape:")
+        for err in scrape_result["errors"]:
+            print(f"    - {err['url']}: {err['error']}")
+
+    scrape_result["total_chars"] = sum(p["chars"] for p in scrape_result["pages"])
+    print(
+        f"\n  Total: {len(scrape_result['pages'])} pages, "
+        f"{scrape_result['total_chars']:,} chars markdown"
+    )
+    return scrape_result
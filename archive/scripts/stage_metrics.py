@@ -0,0 +1,129 @@
+"""
+Per-stage timing spans for extraction runs.
+"""
+
+import contextlib
+import contextvars
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from api_ledger import percentile
+
+
+# ---------------------------------------------------------------------------
+# Stage metrics
+#
+# run_extraction wraps each stage (plan, scrape, assemble, claude, parse,
+# repair, save) in a timing span recording wall time plus whatever bytes,
+# tokens and credits the stage handled. Spans collect per operator (a
+# ContextVar, so concurrent manifest operators keep their own) and, with
+# --metrics-file, are appended as JSON lines for offline p50/p95 analysis.
+# ---------------------------------------------------------------------------
+
+# Spans recorded for the operator being extracted in the current context
+STAGE_SPANS: contextvars.ContextVar[dict | None] = contextvars.ContextVar("stage_spans", default=None)
+
+# JSON-lines sink shared by every thread (None = spans are only kept in memory)
+METRICS_SINK: dict = {"path": None, "lock": threading.Lock()}
+
+
+def set_metrics_file(path: Path | None):
+    """Append every finished span to ``path`` as one JSON line (None = off)."""
+    METRICS_SINK["path"] = path
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+
+def start_stage_spans(operator_slug: str) -> list[dict]:
+    """Begin collecting spans for one operator's run in the current context."""
+    spans: list[dict] = []
+    STAGE_SPANS.set({"operator": operator_slug, "spans": spans})
+    return spans
+
+
+@contextlib.contextmanager
+def stage_span(stage: str, **fields):
+    """Time a pipeline stage. Yields a dict the caller can add counters to."""
+    span = dict(fields)
+    status = "ok"
+    started = time.monotonic()
+    try:
+        yield span
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        current = STAGE_SPANS.get()
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "operator": current["operator"] if current else None,
+            "stage": stage,
+            "seconds": round(time.monotonic() - started, 4),
+            "status": status,
+            **span,
+        }
+        if current is not None:
+            current["spans"].append(record)
+        if METRICS_SINK["path"] is not None:
+            with METRICS_SINK["lock"], open(METRICS_SINK["path"], "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+def stage_seconds(spans: list[dict]) -> dict[str, float]:
+    """Total wall seconds per stage, in first-seen stage order."""
+    totals: dict[str, float] = {}
+    for span in spans:
+        totals[span["stage"]] = round(totals.get(span["stage"], 0.0) + span["seconds"], 4)
+    return totals
+
+
+def print_stage_timings(spans: list[dict]):
+    """Per-stage wall time and share for one operator's run."""
+    totals = stage_seconds(spans)
+    overall = sum(totals.values()) or 1e-9
+    print()
+    print("=" * 60)
+    print("STAGE TIMINGS")
+    print("=" * 60)
+    for stage, seconds in totals.items():
+        counters = {}
+        for span in spans:
+            if span["stage"] != stage:
+                continue
+            for key in ("bytes", "tokensIn", "tokensOut", "credits"):
+                if span.get(key):
+                    counters[key] = counters.get(key, 0) + span[key]
+        detail = ", ".join(f"{k} {v:,}" for k, v in counters.items())
+        print(f"  {stage:<9} {seconds:8.2f}s  {seconds / overall:5.1%}  {detail}".rstrip())
+    print("=" * 60)
+
+
+def summarize_stage_metrics(records: list[dict]) -> dict[str, dict]:
+    """p50/p95/max of per-operator stage time across a bulk run's spans."""
+    per_stage: dict[str, dict[str, float]] = {}
+    for record in records:
+        by_operator = per_stage.setdefault(record["stage"], {})
+        key = record.get("operator") or ""
+        by_operator[key] = by_operator.get(key, 0.0) + record["seconds"]
+    return {
+        stage: {
+            "operators": len(values),
+            "p50": percentile(list(values.values()), 50),
+            "p95": percentile(list(values.values()), 95),
+            "max": max(values.values()),
+            "total": round(sum(values.values()), 2),
+        }
+        for stage, values in per_stage.items()
+    }
+
+
+def print_stage_metrics(summary: dict[str, dict]):
+    print(f"  {'Stage':<9} {'ops':>4} {'p50':>8} {'p95':>8} {'max':>8} {'total':>9}")
+    for stage, s in summary.items():
+        print(
+            f"  {stage:<9} {s['operators']:>4} {s['p50']:>7.2f}s {s['p95']:>7.2f}s "
+            f"{s['max']:>7.2f}s {s['total']:>8.1f}s"
+        )
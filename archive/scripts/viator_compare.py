@@ -2,13 +2,22 @@
 """
 Viator API comparison — Path A (extraction) vs Path C (Viator API).
 
-Queries the Viator Partner API for the same operators tested in Phase 0,
-pulls full product details, and produces a side-by-side comparison report.
+Queries the Viator Partner API for the operators listed in a manifest
+(default: the Phase 0 Seattle operators), pulls full product details, and
+produces a side-by-side comparison report.
 
 Usage:
-    # Full run — discover, pull, and compare all 7 operators
+    # Full run — discover, pull, and compare all operators in the manifest
     python scripts/viator_compare.py
 
+    # Use a different operator manifest
+    python scripts/viator_compare.py --manifest manifests/phase0_seattle.json
+
+    # Sharded run — each process takes a disjoint slice, then merge
+    python scripts/viator_compare.py --shard 0/2
+    python scripts/viator_compare.py --shard 1/2
+    python scripts/viator_compare.py --merge-shards 2
+
     # Discovery only — just find operators on Viator
     python scripts/viator_compare.py --discover-only
 
@@ -18,23 +27,40 @@ Usage:
     # Use production API instead of sandbox
     python scripts/viator_compare.py --production
 
+    # Recompare every operator, ignoring the per-operator comparison cache
+    python scripts/viator_compare.py --no-cache
+
+    # Compare operators in parallel, one worker process per CPU core
+    python scripts/viator_compare.py --workers 0
+
 Output:
     results/viator_raw/                    — Raw API responses
     results/viator_mapped/                 — Viator data mapped to our schema
     results/comparisons/path_a_vs_path_c.md  — Comparison report
+    results/comparisons/cache/             — Per-operator comparison cache
+    *.shard-i-of-N.json / .md              — Per-shard outputs (with --shard)
 """
 
 import argparse
+import hashlib
 import json
 import os
+import re
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
-import requests
 from dotenv import load_dotenv
 
+from api_ledger import ledger_call, set_operator as set_ledger_operator
+from cassettes import add_cassette_arguments, cassette_call, configure_from_args, replaying
+
+# requests is imported only where Viator is actually called, so --dry-run,
+# --merge-shards and report-only runs start fast
+
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -45,78 +71,114 @@ RESULTS_DIR = PROJECT_ROOT / "results"
 VIATOR_RAW_DIR = RESULTS_DIR / "viator_raw"
 VIATOR_MAPPED_DIR = RESULTS_DIR / "viator_mapped"
 COMPARISONS_DIR = RESULTS_DIR / "comparisons"
+COMPARISON_CACHE_DIR = COMPARISONS_DIR / "cache"
+
+# Bump when compare_operator / _compare_products change shape so cached
+# per-operator comparisons are invalidated.
+COMPARE_VERSION = "compare_v2"
 
 SANDBOX_BASE_URL = "https://api.sandbox.viator.com/partner"
 PROD_BASE_URL = "https://api.viator.com/partner"
 
-SEATTLE_DEST_ID = "704"
-
-# Our 7 Phase 0 operators — search terms and supplier matching keywords
-# Search terms are fed to freetext search; supplier_keywords match against
-# the supplier.name field from full product details.
-OPERATORS = [
-    {
-        "slug": "tours_northwest",
-        "search_terms": [
-            "Tours Northwest Seattle",
-            "Seattle City Highlights Tour",
-            "Seattle Mt Rainier tour Northwest",
-            "Seattle Pre-Cruise Tour",
-        ],
-        "supplier_keywords": ["tours northwest"],
-        # Known product codes found via manual supplier verification
-        "known_codes": ["5396P10", "5396MTR", "5396P18", "5396PRTSEACITY"],
-    },
-    {
-        "slug": "shutter_tours",
-        "search_terms": [
-            "Shutter Tours Seattle",
-            "Seattle photography walking tour",
-        ],
-        "supplier_keywords": ["shutter tours"],
-    },
-    {
-        "slug": "totally_seattle",
-        "search_terms": [
-            "Totally Seattle",
-            "Seattle private custom driving tour",
-        ],
-        "supplier_keywords": ["totally seattle"],
-    },
-    {
-        "slug": "conundroom",
-        "search_terms": [
-            "Conundroom escape room",
-            "Conundroom Redmond",
-        ],
-        "supplier_keywords": ["conundroom"],
-    },
-    {
-        "slug": "bill_speidels",
-        "search_terms": [
-            "Bill Speidel Underground Tour Seattle",
-            "Seattle Pioneer Square underground tour",
-        ],
-        "supplier_keywords": ["bill speidel"],
-    },
-    {
-        "slug": "evergreen_escapes",
-        "search_terms": [
-            "Evergreen Escapes Seattle",
-            "Evergreen Escapes Olympic Rainier",
-        ],
-        "supplier_keywords": ["evergreen escapes"],
-    },
-    {
-        "slug": "argosy_cruises",
-        "search_terms": [
-            "Argosy Cruises Seattle",
-            "Seattle Harbor Cruise Argosy",
-            "Seattle Locks Cruise Argosy",
-        ],
-        "supplier_keywords": ["argosy"],
-    },
-]
+DEFAULT_MANIFEST_PATH = PROJECT_ROOT / "manifests" / "phase0_seattle.json"
+
+
+# ---------------------------------------------------------------------------
+# Operator manifest + sharding
+# ---------------------------------------------------------------------------
+
+def load_manifest(path: Path) -> dict:
+    """Load the operator/destination manifest.
+
+    Manifest format::
+
+        {
+          "name": "phase0_seattle",
+          "destinations": {"704": {"name": "Seattle"}},
+          "operators": [
+            {"slug": "...", "destination": "704", "search_terms": [...],
+             "supplier_keywords": [...], "known_codes": [...]}
+          ]
+        }
+
+    Search terms are fed to freetext search; supplier_keywords match against
+    the supplier.name field from full product details; known_codes are
+    optional pre-verified product codes.
+    """
+    if not path.exists():
+        print(f"ERROR: Operator manifest not found at {path}", file=sys.stderr)
+        sys.exit(1)
+    with open(path) as f:
+        manifest = json.load(f)
+
+    destinations = manifest.get("destinations", {})
+    seen: set[str] = set()
+    for op in manifest.get("operators", []):
+        slug = op.get("slug")
+        problem = None
+        if not slug:
+            problem = "operator without a slug"
+        elif slug in seen:
+            problem = f"duplicate operator slug '{slug}'"
+        elif not op.get("search_terms") or not op.get("supplier_keywords"):
+            problem = f"{slug}: search_terms and supplier_keywords are required"
+        elif op.get("destination") not in destinations:
+            problem = f"{slug}: unknown destination '{op.get('destination')}'"
+        if problem:
+            print(f"ERROR: Invalid manifest {path.name}: {problem}", file=sys.stderr)
+            sys.exit(1)
+        seen.add(slug)
+
+    return manifest
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """argparse type for ``--shard i/N`` (0-based shard index out of N)."""
+    try:
+        index_str, count_str = value.split("/")
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got '{value}'")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..N-1, got '{value}'")
+    return index, count
+
+
+def parse_shard_count(value: str) -> int:
+    """argparse type for ``--merge-shards N`` (N >= 1)."""
+    try:
+        count = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a shard count, got '{value}'")
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"shard count must be at least 1, got '{value}'")
+    return count
+
+
+def shard_of(slug: str, count: int) -> int:
+    """Stable shard assignment for an operator.
+
+    Hash-based rather than positional so an operator stays in the same shard
+    when the manifest grows or is reordered.
+    """
+    digest = hashlib.sha256(slug.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def select_shard(operators: list[dict], shard: tuple[int, int] | None) -> list[dict]:
+    """Return this shard's disjoint slice of the operators, in manifest order."""
+    if shard is None:
+        return operators
+    index, count = shard
+    return [op for op in operators if shard_of(op["slug"], count) == index]
+
+
+def shard_suffix(shard: tuple[int, int] | None) -> str:
+    """Filename suffix for per-shard output files (empty when unsharded)."""
+    if shard is None:
+        return ""
+    index, count = shard
+    return f".shard-{index}-of-{count}"
 
 
 # ---------------------------------------------------------------------------
@@ -138,27 +200,40 @@ class ViatorClient:
         self.request_count = 0
 
     def _request(self, method: str, path: str, json_body: dict | None = None) -> dict:
-        """Make an API request with basic rate-limit awareness."""
-        url = f"{self.base_url}{path}"
+        """Make an API request (or replay a recorded one, see cassettes.py)."""
         self.request_count += 1
+        return cassette_call(
+            "viator",
+            {"baseUrl": self.base_url, "method": method, "path": path, "body": json_body},
+            lambda: self._send(method, path, json_body),
+        )
+
+    def _send(self, method: str, path: str, json_body: dict | None = None) -> dict:
+        """Make a live API request with basic rate-limit awareness."""
+        import requests
+
+        url = f"{self.base_url}{path}"
 
         # Pause every 50 requests to stay well under 150/10s limit
         if self.request_count % 50 == 0:
             time.sleep(1)
 
-        if method == "GET":
-            resp = requests.get(url, headers=self.headers)
-        else:
-            resp = requests.post(url, json=json_body, headers=self.headers)
+        # GET paths end in a product code; the ledger groups them per endpoint
+        endpoint = f"{method} {re.sub(r'/[^/]+$', '/{code}', path) if method == 'GET' else path}"
+        with ledger_call("viator", endpoint):
+            if method == "GET":
+                resp = requests.get(url, headers=self.headers)
+            else:
+                resp = requests.post(url, json=json_body, headers=self.headers)
+
+            if resp.status_code == 401:
+                body = resp.json() if resp.headers.get("content-type", "").startswith("application/json") else {}
+                msg = body.get("message", "Unauthorized")
+                print(f"\n  AUTH ERROR: {msg}", file=sys.stderr)
+                print(f"  Check your VIATOR_API_KEY in .env — it may not be activated yet.", file=sys.stderr)
+                resp.raise_for_status()
 
-        if resp.status_code == 401:
-            body = resp.json() if resp.headers.get("content-type", "").startswith("application/json") else {}
-            msg = body.get("message", "Unauthorized")
-            print(f"\n  AUTH ERROR: {msg}", file=sys.stderr)
-            print(f"  Check your VIATOR_API_KEY in .env — it may not be activated yet.", file=sys.stderr)
             resp.raise_for_status()
-
-        resp.raise_for_status()
         return resp.json()
 
     def search_freetext(self, search_term: str, count: int = 20) -> dict:
@@ -173,7 +248,7 @@ class ViatorClient:
         return self._request("POST", "/search/freetext", payload)
 
     def search_products(
-        self, dest_id: str = SEATTLE_DEST_ID, count: int = 50, start: int = 1,
+        self, dest_id: str, count: int = 50, start: int = 1,
     ) -> dict:
         """POST /products/search — search products by destination."""
         payload = {
@@ -197,12 +272,14 @@ class ViatorClient:
 # Phase 1: Discovery
 # ---------------------------------------------------------------------------
 
-def run_discovery(client: ViatorClient) -> dict:
-    """Find our 7 operators on Viator via freetext search + supplier lookup.
+def run_discovery(client: ViatorClient, operators: list[dict]) -> dict:
+    """Find the manifest's operators on Viator via freetext search + supplier lookup.
 
     Freetext search results don't include supplier names, so we pull
     full product details for the top candidates and match by supplier.
     """
+    import requests
+
     print()
     print("=" * 60)
     print("PHASE 1: DISCOVERY — Finding operators on Viator")
@@ -212,8 +289,9 @@ def run_discovery(client: ViatorClient) -> dict:
     supplier_cache: dict[str, str] = {}
     all_discoveries: dict[str, dict] = {}
 
-    for op in OPERATORS:
+    for op in operators:
         slug = op["slug"]
+        set_ledger_operator(slug)
         print(f"\n  Searching: {slug}")
 
         # Collect candidate product codes from freetext search
@@ -299,7 +377,7 @@ def run_discovery(client: ViatorClient) -> dict:
         status = f"{count} product(s)" if count > 0 else "NOT FOUND"
         print(f"  {slug:25s} {status}")
     operators_found = sum(1 for d in all_discoveries.values() if d["product_codes"])
-    print(f"\n  Total: {total_matched} products across {operators_found}/7 operators")
+    print(f"\n  Total: {total_matched} products across {operators_found}/{len(operators)} operators")
 
     return all_discoveries
 
@@ -484,6 +562,8 @@ def map_viator_to_octo(product: dict, schedule: dict | None = None) -> dict:
 
 def run_deep_pull(client: ViatorClient, discoveries: dict) -> dict:
     """Pull full product details for all discovered products."""
+    import requests
+
     print()
     print("=" * 60)
     print("PHASE 2: DEEP PULL — Full product details from Viator")
@@ -492,6 +572,7 @@ def run_deep_pull(client: ViatorClient, discoveries: dict) -> dict:
     all_mapped: dict[str, list[dict]] = {}
 
     for slug, disc in discoveries.items():
+        set_ledger_operator(slug)
         codes = disc["product_codes"]
         if not codes:
             print(f"\n  {slug}: skipping (no products found)")
@@ -580,10 +661,10 @@ def run_deep_pull(client: ViatorClient, discoveries: dict) -> dict:
 # Phase 3: Comparison
 # ---------------------------------------------------------------------------
 
-def load_path_a_results() -> dict:
+def load_path_a_results(operators: list[dict]) -> dict:
     """Load all Path A extraction results from disk."""
     path_a: dict[str, dict] = {}
-    for op in OPERATORS:
+    for op in operators:
         slug = op["slug"]
         fpath = RESULTS_DIR / slug / "extract_operator_v1.json"
         if fpath.exists():
@@ -618,6 +699,7 @@ def compare_operator(slug: str, path_a_data: dict, viator_products: list[dict])
 
     matched_pa: set[int] = set()
     matched_pc: set[int] = set()
+    pairs: list[tuple[dict, dict, float]] = []
 
     # Match products by title similarity
     for i, pa_prod in enumerate(pa_products):
@@ -636,11 +718,10 @@ def compare_operator(slug: str, path_a_data: dict, viator_products: list[dict])
         if best_j is not None:
             matched_pa.add(i)
             matched_pc.add(best_j)
-            pa_p = pa_products[i]
-            pc_p = viator_products[best_j]
+            pairs.append((pa_products[i], viator_products[best_j], best_score))
 
-            match_detail = _compare_products(pa_p, pc_p, best_score)
-            comparison["productMatches"].append(match_detail)
+    # Compare all matched pairs at once, one field column at a time
+    comparison["productMatches"] = compare_product_pairs(pairs)
 
     # Collect unmatched products
     for i, pa_prod in enumerate(pa_products):
@@ -653,148 +734,324 @@ def compare_operator(slug: str, path_a_data: dict, viator_products: list[dict])
     return comparison
 
 
-def _compare_products(pa_p: dict, pc_p: dict, match_score: float) -> dict:
-    """Field-by-field comparison between one Path A and one Path C product."""
-    detail: dict = {
-        "pathA_title": pa_p.get("title", ""),
-        "pathC_title": pc_p.get("title", ""),
-        "matchScore": round(match_score, 2),
-        "fields": {},
-    }
+# ---------------------------------------------------------------------------
+# Field comparators
+#
+# Each entry in FIELD_COMPARATORS declares how one report field is built:
+# a comparator kind plus per-side extractors. Kinds operate on whole
+# columns (every matched pair of an operator at once), so each extractor
+# runs exactly once per product and adding a field adds one pass over the
+# pairs rather than per-pair branching.
+# ---------------------------------------------------------------------------
 
-    # --- Title ---
-    detail["fields"]["title"] = {
-        "pathA": pa_p.get("title", ""),
-        "pathC": pc_p.get("title", ""),
-        "match": pa_p.get("title", "").lower().strip()
-        == pc_p.get("title", "").lower().strip(),
-    }
+# Durations within this many minutes of each other count as a match
+DURATION_TOLERANCE_MINUTES = 15
 
-    # --- Description ---
-    pa_desc = pa_p.get("description", "") or ""
-    pc_desc = pc_p.get("description", "") or ""
-    detail["fields"]["description"] = {
-        "pathA_length": len(pa_desc),
-        "pathC_length": len(pc_desc),
-        "winner": "A" if len(pa_desc) > len(pc_desc) else ("C" if len(pc_desc) > len(pa_desc) else "tie"),
-    }
+# Minimum share of the shorter item's words for an inclusion/exclusion to
+# count as present on both sides
+FEATURE_OVERLAP_THRESHOLD = 0.4
+FEATURE_STOPWORDS = {"and", "the", "for", "with", "are", "all", "your", "you", "will", "from"}
 
-    # --- Pricing ---
-    pa_prices = pa_p.get("priceByUnit", [])
-    pa_price_str = ""
-    if pa_prices:
-        parts = []
-        for u in pa_prices:
-            amt = u.get("amount", 0)
-            label = u.get("label") or u.get("unitType", "")
-            parts.append(f"${amt / 100:.2f} {label}")
-        pa_price_str = ", ".join(parts)
-    elif pa_p.get("pricingNotes"):
-        pa_price_str = pa_p["pricingNotes"]
-
-    pc_details = pc_p.get("priceDetails", [])
-    pc_price_str = ""
-    if pc_details:
-        seen: set[str] = set()
-        parts = []
-        for d in pc_details:
-            rrp = d.get("recommendedRetailPrice")
-            band = d.get("ageBand", "")
-            if rrp is not None:
-                key = f"${rrp:.2f} {band}"
-                if key not in seen:
-                    seen.add(key)
-                    parts.append(key)
-        pc_price_str = ", ".join(parts)
-    elif pc_p.get("fromPrice") is not None:
-        pc_price_str = f"From ${pc_p['fromPrice']:.2f}"
-
-    detail["fields"]["pricing"] = {
-        "pathA": pa_price_str or "No pricing",
-        "pathC": pc_price_str or "No pricing",
-        "pathA_model": pa_p.get("pricingModel", ""),
-        "pathC_model": pc_p.get("pricingModel", ""),
-    }
+# Path A unit types that correspond to a differently named Viator age band
+UNIT_TYPE_TO_AGE_BAND = {"GROUP": "TRAVELER"}
+
+
+def _winner(a: int, b: int) -> str:
+    return "A" if a > b else ("C" if b > a else "tie")
+
+
+def _truncate(text: str, limit: int = 100) -> str:
+    return (text[:limit] + "...") if len(text) > limit else text
 
-    # --- Duration ---
-    pa_dur = pa_p.get("duration")
-    pc_dur = pc_p.get("duration")
-    detail["fields"]["duration"] = {
-        "pathA": f"{pa_dur} min" if pa_dur else pa_p.get("durationDisplay", "N/A"),
-        "pathC": f"{pc_dur} min" if pc_dur else "N/A",
-        "match": pa_dur == pc_dur if (pa_dur and pc_dur) else None,
-    }
 
-    # --- Inclusions ---
-    pa_inclusions = [
+def _feature_tokens(text: str) -> frozenset[str]:
+    """Content words of an inclusion/exclusion, for set-overlap matching."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return frozenset(w for w in words if len(w) > 2 and w not in FEATURE_STOPWORDS)
+
+
+def _features_overlap(a: frozenset[str], b: frozenset[str]) -> bool:
+    if not a or not b:
+        return False
+    return len(a & b) / min(len(a), len(b)) >= FEATURE_OVERLAP_THRESHOLD
+
+
+def _features_of_type(product: dict, feature_type: str) -> list[str]:
+    return [
         f.get("value", "")
-        for f in (pa_p.get("features") or [])
-        if f.get("type") == "INCLUSION"
+        for f in (product.get("features") or [])
+        if f.get("type") == feature_type
     ]
-    pc_inclusions = pc_p.get("inclusions", [])
-    detail["fields"]["inclusions"] = {
-        "pathA_count": len(pa_inclusions),
-        "pathC_count": len(pc_inclusions),
-        "winner": "A" if len(pa_inclusions) > len(pc_inclusions) else (
-            "C" if len(pc_inclusions) > len(pa_inclusions) else "tie"
-        ),
-    }
 
-    # --- Exclusions ---
-    pa_exclusions = [
-        f.get("value", "")
-        for f in (pa_p.get("features") or [])
-        if f.get("type") == "EXCLUSION"
+
+def _path_a_price_table(product: dict) -> dict:
+    """Path A pricing as a display string plus {age band: dollars}."""
+    units = product.get("priceByUnit", [])
+    table: dict[str, float] = {}
+    parts = []
+    for u in units:
+        amt = u.get("amount", 0)
+        label = u.get("label") or u.get("unitType", "")
+        parts.append(f"${amt / 100:.2f} {label}")
+        band = (u.get("unitType") or "").upper()
+        band = UNIT_TYPE_TO_AGE_BAND.get(band, band)
+        if band and band not in table:
+            table[band] = amt / 100
+    if parts:
+        display = ", ".join(parts)
+    else:
+        display = product.get("pricingNotes") or ""
+    return {"display": display, "table": table, "model": product.get("pricingModel", "")}
+
+
+def _path_c_price_table(product: dict) -> dict:
+    """Path C pricing as a deduped display string plus {age band: lowest dollars}."""
+    details = product.get("priceDetails", [])
+    table: dict[str, float] = {}
+    parts: dict[str, None] = {}  # insertion-ordered set of display strings
+    for d in details:
+        rrp = d.get("recommendedRetailPrice")
+        if rrp is None:
+            continue
+        band = d.get("ageBand", "")
+        parts.setdefault(f"${rrp:.2f} {band}")
+        if band and (band not in table or rrp < table[band]):
+            table[band] = rrp
+    if parts:
+        display = ", ".join(parts)
+    elif product.get("fromPrice") is not None:
+        display = f"From ${product['fromPrice']:.2f}"
+    else:
+        display = ""
+    return {"display": display, "table": table, "model": product.get("pricingModel", "")}
+
+
+def _cmp_exact(spec: dict, pa_vals: list, pc_vals: list) -> list[dict]:
+    return [
+        {"pathA": a, "pathC": c, "match": a.lower().strip() == c.lower().strip()}
+        for a, c in zip(pa_vals, pc_vals)
     ]
-    pc_exclusions = pc_p.get("exclusions", [])
-    detail["fields"]["exclusions"] = {
-        "pathA_count": len(pa_exclusions),
-        "pathC_count": len(pc_exclusions),
-    }
 
-    # --- Meeting points ---
-    pa_locs = pa_p.get("locations") or []
-    pa_starts = [loc for loc in pa_locs if loc.get("type") == "START"]
-    pc_starts = pc_p.get("startLocations", [])
-    detail["fields"]["meetingPoints"] = {
-        "pathA_count": len(pa_starts),
-        "pathC_count": len(pc_starts),
-    }
 
-    # --- Reviews (Path C exclusive) ---
-    pc_reviews = pc_p.get("reviews", {})
-    detail["fields"]["reviews"] = {
-        "pathA": "N/A (not on operator websites)",
-        "pathC": (
-            f"{pc_reviews.get('totalReviews', 0)} reviews, "
-            f"{pc_reviews.get('combinedAverageRating', 'N/A')} avg"
-        ),
-        "winner": "C",
-    }
+def _cmp_length(spec: dict, pa_vals: list, pc_vals: list) -> list[dict]:
+    pa_lens = [len(v) for v in pa_vals]
+    pc_lens = [len(v) for v in pc_vals]
+    return [
+        {"pathA_length": a, "pathC_length": c, "winner": _winner(a, c)}
+        for a, c in zip(pa_lens, pc_lens)
+    ]
 
-    # --- Cancellation ---
-    pa_cancel = pa_p.get("cancellationPolicy", "")
-    pc_cancel = pc_p.get("cancellationPolicy", {})
-    pc_cancel_str = pc_cancel.get("description", "") if isinstance(pc_cancel, dict) else ""
-    detail["fields"]["cancellationPolicy"] = {
-        "pathA": (str(pa_cancel)[:100] + "...") if len(str(pa_cancel)) > 100 else str(pa_cancel),
-        "pathC": (pc_cancel_str[:100] + "...") if len(pc_cancel_str) > 100 else pc_cancel_str,
-        "pathA_has": bool(pa_cancel),
-        "pathC_has": bool(pc_cancel_str),
-    }
 
-    # --- Images ---
-    pa_media = pa_p.get("media") or []
-    pc_image_count = pc_p.get("imageCount", 0)
-    detail["fields"]["images"] = {
-        "pathA_count": len(pa_media),
-        "pathC_count": pc_image_count,
-        "winner": "C" if pc_image_count > len(pa_media) else (
-            "A" if len(pa_media) > pc_image_count else "tie"
+def _cmp_count(spec: dict, pa_vals: list, pc_vals: list) -> list[dict]:
+    rows = []
+    for a, c in zip(pa_vals, pc_vals):
+        row: dict = {"pathA_count": a, "pathC_count": c}
+        if spec.get("winner"):
+            row["winner"] = _winner(a, c)
+        rows.append(row)
+    return rows
+
+
+def _cmp_set_overlap(spec: dict, pa_vals: list, pc_vals: list) -> list[dict]:
+    rows = []
+    for a_items, c_items in zip(pa_vals, pc_vals):
+        c_tokens = [_feature_tokens(c) for c in c_items]
+        shared = sum(
+            1 for a in a_items
+            if any(_features_overlap(_feature_tokens(a), c) for c in c_tokens)
+        )
+        row: dict = {"pathA_count": len(a_items), "pathC_count": len(c_items)}
+        if spec.get("winner"):
+            row["winner"] = _winner(len(a_items), len(c_items))
+        row["overlap"] = shared
+        rows.append(row)
+    return rows
+
+
+def _cmp_numeric(spec: dict, pa_vals: list, pc_vals: list) -> list[dict]:
+    tolerance = spec.get("tolerance", 0)
+    unit = spec.get("unit", "")
+    rows = []
+    for (a, a_display), c in zip(pa_vals, pc_vals):
+        row: dict = {
+            "pathA": f"{a} {unit}" if a else a_display,
+            "pathC": f"{c} {unit}" if c else "N/A",
+            "match": abs(a - c) <= tolerance if (a and c) else None,
+        }
+        if a and c:
+            row["difference"] = c - a
+        rows.append(row)
+    return rows
+
+
+def _cmp_price_table(spec: dict, pa_vals: list, pc_vals: list) -> list[dict]:
+    rows = []
+    for a, c in zip(pa_vals, pc_vals):
+        diffs = []
+        for band in list(a["table"]) + [b for b in c["table"] if b not in a["table"]]:
+            a_price = a["table"].get(band)
+            c_price = c["table"].get(band)
+            diffs.append({
+                "band": band,
+                "pathA": a_price,
+                "pathC": c_price,
+                "delta": (
+                    round(c_price - a_price, 2)
+                    if a_price is not None and c_price is not None
+                    else None
+                ),
+            })
+        rows.append({
+            "pathA": a["display"] or "No pricing",
+            "pathC": c["display"] or "No pricing",
+            "pathA_model": a["model"],
+            "pathC_model": c["model"],
+            "diffs": diffs,
+        })
+    return rows
+
+
+def _cmp_reviews(spec: dict, pa_vals: list, pc_vals: list) -> list[dict]:
+    return [
+        {
+            "pathA": "N/A (not on operator websites)",
+            "pathC": (
+                f"{c.get('totalReviews', 0)} reviews, "
+                f"{c.get('combinedAverageRating', 'N/A')} avg"
+            ),
+            "winner": "C",
+        }
+        for c in pc_vals
+    ]
+
+
+def _cmp_presence(spec: dict, pa_vals: list, pc_vals: list) -> list[dict]:
+    return [
+        {"pathA": _truncate(str(a)), "pathC": _truncate(c), "pathA_has": bool(a), "pathC_has": bool(c)}
+        for a, c in zip(pa_vals, pc_vals)
+    ]
+
+
+COMPARATOR_KINDS = {
+    "exact": _cmp_exact,
+    "length": _cmp_length,
+    "count": _cmp_count,
+    "set_overlap": _cmp_set_overlap,
+    "numeric": _cmp_numeric,
+    "price_table": _cmp_price_table,
+    "reviews": _cmp_reviews,
+    "presence": _cmp_presence,
+}
+
+# Report fields in output order: comparator kind, Path A / Path C extractors,
+# and any kind-specific options.
+FIELD_COMPARATORS: dict[str, dict] = {
+    "title": {
+        "kind": "exact",
+        "pathA": lambda p: p.get("title", ""),
+        "pathC": lambda p: p.get("title", ""),
+    },
+    "description": {
+        "kind": "length",
+        "pathA": lambda p: p.get("description", "") or "",
+        "pathC": lambda p: p.get("description", "") or "",
+    },
+    "pricing": {
+        "kind": "price_table",
+        "pathA": _path_a_price_table,
+        "pathC": _path_c_price_table,
+    },
+    "duration": {
+        "kind": "numeric",
+        "pathA": lambda p: (p.get("duration"), p.get("durationDisplay", "N/A")),
+        "pathC": lambda p: p.get("duration"),
+        "tolerance": DURATION_TOLERANCE_MINUTES,
+        "unit": "min",
+    },
+    "inclusions": {
+        "kind": "set_overlap",
+        "pathA": lambda p: _features_of_type(p, "INCLUSION"),
+        "pathC": lambda p: p.get("inclusions", []),
+        "winner": True,
+    },
+    "exclusions": {
+        "kind": "set_overlap",
+        "pathA": lambda p: _features_of_type(p, "EXCLUSION"),
+        "pathC": lambda p: p.get("exclusions", []),
+    },
+    "meetingPoints": {
+        "kind": "count",
+        "pathA": lambda p: sum(1 for loc in (p.get("locations") or []) if loc.get("type") == "START"),
+        "pathC": lambda p: len(p.get("startLocations", [])),
+    },
+    "reviews": {
+        "kind": "reviews",
+        "pathA": lambda p: None,
+        "pathC": lambda p: p.get("reviews", {}),
+    },
+    "cancellationPolicy": {
+        "kind": "presence",
+        "pathA": lambda p: p.get("cancellationPolicy", ""),
+        "pathC": lambda p: (
+            p["cancellationPolicy"].get("description", "")
+            if isinstance(p.get("cancellationPolicy"), dict)
+            else ""
         ),
-    }
+    },
+    "images": {
+        "kind": "count",
+        "pathA": lambda p: len(p.get("media") or []),
+        "pathC": lambda p: p.get("imageCount", 0),
+        "winner": True,
+    },
+}
+
+
+def compare_product_pairs(pairs: list[tuple[dict, dict, float]]) -> list[dict]:
+    """Field-by-field comparison for every (Path A, Path C, score) pair of an operator.
+
+    Runs each registered comparator once over the whole column of pairs
+    and stitches the per-field rows back into one detail dict per pair.
+    """
+    details = [
+        {
+            "pathA_title": pa_p.get("title", ""),
+            "pathC_title": pc_p.get("title", ""),
+            "matchScore": round(score, 2),
+            "fields": {},
+        }
+        for pa_p, pc_p, score in pairs
+    ]
+    if not pairs:
+        return details
+
+    pa_col = [pa_p for pa_p, _, _ in pairs]
+    pc_col = [pc_p for _, pc_p, _ in pairs]
+
+    for field, spec in FIELD_COMPARATORS.items():
+        compare = COMPARATOR_KINDS[spec["kind"]]
+        rows = compare(
+            spec,
+            [spec["pathA"](p) for p in pa_col],
+            [spec["pathC"](p) for p in pc_col],
+        )
+        for detail, row in zip(details, rows):
+            detail["fields"][field] = row
+
+    for detail, pa_p, pc_p in zip(details, pa_col, pc_col):
+        detail["pathA_exclusive"] = _path_a_exclusive(pa_p)
+        detail["pathC_exclusive"] = _path_c_exclusive(pc_p)
+
+    return details
+
+
+def _compare_products(pa_p: dict, pc_p: dict, match_score: float) -> dict:
+    """Field-by-field comparison between one Path A and one Path C product."""
+    return compare_product_pairs([(pa_p, pc_p, match_score)])[0]
+
 
-    # --- Path A exclusive data ---
+def _path_a_exclusive(pa_p: dict) -> list[str]:
+    """Data only Path A (website extraction) captured for this product."""
     pa_exclusive: list[str] = []
     if pa_p.get("activePromotions"):
         codes = [p.get("code", "") for p in pa_p["activePromotions"]]
@@ -806,9 +1063,11 @@ def _compare_products(pa_p: dict, pc_p: dict, match_score: float) -> dict:
         pa_exclusive.append(f"Booking system: {pa_p['bookingSystem']['name']}")
     if pa_p.get("faqs"):
         pa_exclusive.append(f"FAQs: {len(pa_p['faqs'])} Q&As")
-    detail["pathA_exclusive"] = pa_exclusive
+    return pa_exclusive
 
-    # --- Path C exclusive data ---
+
+def _path_c_exclusive(pc_p: dict) -> list[str]:
+    """Data only Path C (Viator API) provides for this product."""
     pc_exclusive: list[str] = []
     if pc_p.get("reviews", {}).get("totalReviews", 0) > 0:
         pc_exclusive.append(f"Reviews: {pc_p['reviews']['totalReviews']} reviews")
@@ -824,17 +1083,23 @@ def _compare_products(pa_p: dict, pc_p: dict, match_score: float) -> dict:
         pc_exclusive.append("Structured accessibility data")
     if pc_p.get("flags"):
         pc_exclusive.append(f"Flags: {pc_p['flags']}")
-    detail["pathC_exclusive"] = pc_exclusive
-
-    return detail
+    return pc_exclusive
 
 
 # ---------------------------------------------------------------------------
 # Report generation
 # ---------------------------------------------------------------------------
 
-def generate_report(comparisons: dict, discoveries: dict) -> str:
-    """Generate the markdown comparison report."""
+def iter_report_sections(
+    comparisons: dict, discoveries: dict, operators: list[dict],
+) -> Iterator[list[str]]:
+    """Yield the markdown comparison report one section (list of lines) at a time.
+
+    write_report writes each section as it is produced, so the markdown text
+    is never built as one string. ``comparisons`` itself is still held in
+    memory in full (run_comparison returns it, and the JSON output is dumped
+    from it), so memory still grows with the number of operators.
+    """
     lines: list[str] = []
     lines.append("# Path A vs Path C Comparison Report")
     lines.append("")
@@ -847,8 +1112,10 @@ def generate_report(comparisons: dict, discoveries: dict) -> str:
     lines.append("")
     lines.append("---")
     lines.append("")
+    yield lines
 
     # --- 1. Coverage table ---
+    lines = []
     lines.append("## 1. Operator Coverage")
     lines.append("")
     lines.append("| Operator | Path A Products | On Viator? | Viator Products | Matched |")
@@ -859,7 +1126,7 @@ def generate_report(comparisons: dict, discoveries: dict) -> str:
     total_matched = 0
     operators_on_viator = 0
 
-    for op in OPERATORS:
+    for op in operators:
         slug = op["slug"]
         comp = comparisons.get(slug)
         pa_count = comp["pathA"]["productCount"] if comp else 0
@@ -877,157 +1144,30 @@ def generate_report(comparisons: dict, discoveries: dict) -> str:
         lines.append(f"| {name} | {pa_count} | {on_viator} | {pc_count} | {matched} |")
 
     lines.append(
-        f"| **Total** | **{total_pa}** | **{operators_on_viator}/7** "
+        f"| **Total** | **{total_pa}** | **{operators_on_viator}/{len(operators)}** "
         f"| **{total_pc}** | **{total_matched}** |"
     )
     lines.append("")
+    yield lines
 
     # --- 2. Per-operator detail ---
-    lines.append("## 2. Per-Operator Comparison")
-    lines.append("")
+    yield ["## 2. Per-Operator Comparison", ""]
 
-    for op in OPERATORS:
-        slug = op["slug"]
-        comp = comparisons.get(slug)
-        if not comp:
-            continue
-
-        name = slug.replace("_", " ").title()
-        lines.append(f"### {name}")
-        lines.append("")
-
-        if not comp["productMatches"] and comp["pathC"]["productCount"] == 0:
-            lines.append(
-                "**Not found on Viator.** Path A is the only data source."
-            )
-            lines.append(f"Path A extracted {comp['pathA']['productCount']} products.")
-            lines.append("")
-            continue
-
-        for match in comp["productMatches"]:
-            lines.append(
-                f"**{match['pathA_title']}** vs "
-                f"**{match['pathC_title']}** (score: {match['matchScore']})"
-            )
-            lines.append("")
-            lines.append("| Field | Path A | Path C | Notes |")
-            lines.append("|-------|--------|--------|-------|")
-
-            fields = match["fields"]
-
-            # Title
-            f = fields["title"]
-            lines.append(
-                f"| Title | {_md_escape(f['pathA'])} "
-                f"| {_md_escape(f['pathC'])} "
-                f"| {'Same' if f.get('match') else 'Different'} |"
-            )
-
-            # Description
-            f = fields["description"]
-            lines.append(
-                f"| Description | {f['pathA_length']} chars "
-                f"| {f['pathC_length']} chars "
-                f"| Winner: {f['winner']} |"
-            )
-
-            # Pricing
-            f = fields["pricing"]
-            lines.append(
-                f"| Pricing | {_md_escape(f['pathA'])} "
-                f"| {_md_escape(f['pathC'])} "
-                f"| A={f['pathA_model']}, C={f['pathC_model']} |"
-            )
-
-            # Duration
-            f = fields["duration"]
-            dur_note = (
-                "Same"
-                if f.get("match") is True
-                else ("Different" if f.get("match") is False else "—")
-            )
-            lines.append(
-                f"| Duration | {f['pathA']} | {f['pathC']} | {dur_note} |"
-            )
-
-            # Inclusions
-            f = fields["inclusions"]
-            lines.append(
-                f"| Inclusions | {f['pathA_count']} items "
-                f"| {f['pathC_count']} items "
-                f"| Winner: {f['winner']} |"
-            )
-
-            # Exclusions
-            f = fields["exclusions"]
-            lines.append(
-                f"| Exclusions | {f['pathA_count']} items "
-                f"| {f['pathC_count']} items | — |"
-            )
-
-            # Meeting points
-            f = fields["meetingPoints"]
-            lines.append(
-                f"| Meeting points | {f['pathA_count']} "
-                f"| {f['pathC_count']} | — |"
-            )
-
-            # Reviews
-            f = fields["reviews"]
-            lines.append(
-                f"| Reviews | {_md_escape(f['pathA'])} "
-                f"| {_md_escape(f['pathC'])} "
-                f"| Path C exclusive |"
-            )
-
-            # Cancellation
-            f = fields["cancellationPolicy"]
-            pa_has = "Yes" if f["pathA_has"] else "No"
-            pc_has = "Yes" if f["pathC_has"] else "No"
-            lines.append(f"| Cancellation | {pa_has} | {pc_has} | — |")
-
-            # Images
-            f = fields["images"]
-            lines.append(
-                f"| Images | {f['pathA_count']} "
-                f"| {f['pathC_count']} "
-                f"| Winner: {f['winner']} |"
-            )
-
-            lines.append("")
-
-            if match.get("pathA_exclusive"):
-                lines.append("**Unique to Path A:**")
-                for item in match["pathA_exclusive"]:
-                    lines.append(f"- {item}")
-                lines.append("")
-
-            if match.get("pathC_exclusive"):
-                lines.append("**Unique to Path C:**")
-                for item in match["pathC_exclusive"]:
-                    lines.append(f"- {item}")
-                lines.append("")
-
-        if comp["uniqueToPathA"]:
-            lines.append(f"**Products only in Path A** ({len(comp['uniqueToPathA'])}):")
-            for title in comp["uniqueToPathA"]:
-                lines.append(f"- {title}")
-            lines.append("")
-
-        if comp["uniqueToPathC"]:
-            lines.append(f"**Products only in Path C** ({len(comp['uniqueToPathC'])}):")
-            for title in comp["uniqueToPathC"]:
-                lines.append(f"- {title}")
-            lines.append("")
+    for op in operators:
+        comp = comparisons.get(op["slug"])
+        if comp:
+            yield _operator_report_lines(op["slug"], comp)
 
     # --- 3. Strategic analysis ---
+    lines = []
     lines.append("## 3. Strategic Analysis")
     lines.append("")
 
     lines.append("### Coverage Gap")
-    lines.append(f"- **{operators_on_viator}/7** operators found on Viator")
+    lines.append(f"- **{operators_on_viator}/{len(operators)}** operators found on Viator")
     lines.append(
-        f"- **{7 - operators_on_viator}/7** operators are Path A exclusive (not on Viator)"
+        f"- **{len(operators) - operators_on_viator}/{len(operators)}** "
+        f"operators are Path A exclusive (not on Viator)"
     )
     lines.append(
         f"- Path A extracted **{total_pa}** products vs Path C's **{total_pc}**"
@@ -1064,7 +1204,160 @@ def generate_report(comparisons: dict, discoveries: dict) -> str:
         f"on {datetime.now(timezone.utc).strftime('%Y-%m-%d')}*"
     )
 
-    return "\n".join(lines)
+    yield lines
+
+
+def _operator_report_lines(slug: str, comp: dict) -> list[str]:
+    """Render one operator's section of the comparison report."""
+    lines: list[str] = []
+    name = slug.replace("_", " ").title()
+    lines.append(f"### {name}")
+    lines.append("")
+
+    if not comp["productMatches"] and comp["pathC"]["productCount"] == 0:
+        lines.append(
+            "**Not found on Viator.** Path A is the only data source."
+        )
+        lines.append(f"Path A extracted {comp['pathA']['productCount']} products.")
+        lines.append("")
+        return lines
+
+    for match in comp["productMatches"]:
+        lines.append(
+            f"**{match['pathA_title']}** vs "
+            f"**{match['pathC_title']}** (score: {match['matchScore']})"
+        )
+        lines.append("")
+        lines.append("| Field | Path A | Path C | Notes |")
+        lines.append("|-------|--------|--------|-------|")
+
+        fields = match["fields"]
+
+        # Title
+        f = fields["title"]
+        lines.append(
+            f"| Title | {_md_escape(f['pathA'])} "
+            f"| {_md_escape(f['pathC'])} "
+            f"| {'Same' if f.get('match') else 'Different'} |"
+        )
+
+        # Description
+        f = fields["description"]
+        lines.append(
+            f"| Description | {f['pathA_length']} chars "
+            f"| {f['pathC_length']} chars "
+            f"| Winner: {f['winner']} |"
+        )
+
+        # Pricing
+        f = fields["pricing"]
+        lines.append(
+            f"| Pricing | {_md_escape(f['pathA'])} "
+            f"| {_md_escape(f['pathC'])} "
+            f"| A={f['pathA_model']}, C={f['pathC_model']} |"
+        )
+
+        # Duration
+        f = fields["duration"]
+        if f.get("match") is True:
+            diff = f.get("difference", 0)
+            dur_note = "Same" if not diff else f"Close ({diff:+d} min)"
+        else:
+            dur_note = "Different" if f.get("match") is False else "—"
+        lines.append(
+            f"| Duration | {f['pathA']} | {f['pathC']} | {dur_note} |"
+        )
+
+        # Inclusions
+        f = fields["inclusions"]
+        lines.append(
+            f"| Inclusions | {f['pathA_count']} items "
+            f"| {f['pathC_count']} items "
+            f"| Winner: {f['winner']}, {f['overlap']} shared |"
+        )
+
+        # Exclusions
+        f = fields["exclusions"]
+        lines.append(
+            f"| Exclusions | {f['pathA_count']} items "
+            f"| {f['pathC_count']} items | {f['overlap']} shared |"
+        )
+
+        # Meeting points
+        f = fields["meetingPoints"]
+        lines.append(
+            f"| Meeting points | {f['pathA_count']} "
+            f"| {f['pathC_count']} | — |"
+        )
+
+        # Reviews
+        f = fields["reviews"]
+        lines.append(
+            f"| Reviews | {_md_escape(f['pathA'])} "
+            f"| {_md_escape(f['pathC'])} "
+            f"| Path C exclusive |"
+        )
+
+        # Cancellation
+        f = fields["cancellationPolicy"]
+        pa_has = "Yes" if f["pathA_has"] else "No"
+        pc_has = "Yes" if f["pathC_has"] else "No"
+        lines.append(f"| Cancellation | {pa_has} | {pc_has} | — |")
+
+        # Images
+        f = fields["images"]
+        lines.append(
+            f"| Images | {f['pathA_count']} "
+            f"| {f['pathC_count']} "
+            f"| Winner: {f['winner']} |"
+        )
+
+        lines.append("")
+
+        if match.get("pathA_exclusive"):
+            lines.append("**Unique to Path A:**")
+            for item in match["pathA_exclusive"]:
+                lines.append(f"- {item}")
+            lines.append("")
+
+        if match.get("pathC_exclusive"):
+            lines.append("**Unique to Path C:**")
+            for item in match["pathC_exclusive"]:
+                lines.append(f"- {item}")
+            lines.append("")
+
+    if comp["uniqueToPathA"]:
+        lines.append(f"**Products only in Path A** ({len(comp['uniqueToPathA'])}):")
+        for title in comp["uniqueToPathA"]:
+            lines.append(f"- {title}")
+        lines.append("")
+
+    if comp["uniqueToPathC"]:
+        lines.append(f"**Products only in Path C** ({len(comp['uniqueToPathC'])}):")
+        for title in comp["uniqueToPathC"]:
+            lines.append(f"- {title}")
+        lines.append("")
+
+    return lines
+
+
+def generate_report(comparisons: dict, discoveries: dict, operators: list[dict]) -> str:
+    """Generate the markdown comparison report as a single string."""
+    return "\n".join(
+        line
+        for section in iter_report_sections(comparisons, discoveries, operators)
+        for line in section
+    )
+
+
+def write_report(comparisons: dict, discoveries: dict, operators: list[dict], path: Path):
+    """Stream the markdown comparison report to ``path`` one section at a time."""
+    with open(path, "w") as f:
+        separator = ""
+        for section in iter_report_sections(comparisons, discoveries, operators):
+            f.write(separator)
+            f.write("\n".join(section))
+            separator = "\n"
 
 
 def _md_escape(text: str) -> str:
@@ -1076,8 +1369,86 @@ def _md_escape(text: str) -> str:
 # Run Phase 3
 # ---------------------------------------------------------------------------
 
-def run_comparison(viator_mapped: dict) -> dict:
-    """Compare Path A extraction results against Path C (Viator) data."""
+def operator_fingerprint(slug: str, path_a_data: dict, viator_products: list[dict]) -> str:
+    """Hash an operator's comparison inputs (Path A result + mapped Viator products)."""
+    payload = json.dumps(
+        {
+            "version": COMPARE_VERSION,
+            "operator": slug,
+            "pathA": path_a_data,
+            "pathC": viator_products,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_cached_comparison(slug: str, fingerprint: str) -> dict | None:
+    """Return the cached comparison for an operator if its fingerprint still matches."""
+    cache_path = COMPARISON_CACHE_DIR / f"{slug}.json"
+    if not cache_path.exists():
+        return None
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if cached.get("fingerprint") != fingerprint:
+        return None
+    return cached.get("comparison")
+
+
+def save_cached_comparison(slug: str, fingerprint: str, comparison: dict):
+    """Persist one operator's comparison alongside the fingerprint of its inputs."""
+    COMPARISON_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(COMPARISON_CACHE_DIR / f"{slug}.json", "w") as f:
+        json.dump(
+            {
+                "operator": slug,
+                "fingerprint": fingerprint,
+                "comparedAt": datetime.now(timezone.utc).isoformat(),
+                "comparison": comparison,
+            },
+            f,
+            indent=2,
+            ensure_ascii=False,
+            default=str,
+        )
+
+
+def _compare_pending(pending: list[tuple], workers: int) -> list[dict]:
+    """Run compare_operator over (slug, pa_data, pc_products) jobs, preserving order.
+
+    With more than one worker the jobs are spread across a process pool;
+    ``Executor.map`` yields results in submission order, so the output is
+    identical to the serial loop.
+    """
+    if workers <= 1 or len(pending) <= 1:
+        return [compare_operator(slug, pa, pc) for slug, pa, pc in pending]
+
+    workers = min(workers, len(pending))
+    chunksize = max(1, len(pending) // (workers * 4))
+    slugs, pa_items, pc_items = zip(*pending)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(compare_operator, slugs, pa_items, pc_items, chunksize=chunksize))
+
+
+def run_comparison(
+    viator_mapped: dict, operators: list[dict], use_cache: bool = True, workers: int = 1,
+) -> dict:
+    """Compare Path A extraction results against Path C (Viator) data.
+
+    Each operator's inputs are fingerprinted; operators whose fingerprint
+    matches the cached comparison are reused instead of recompared. The
+    remaining operators are compared serially, or across ``workers``
+    processes (0 = one per CPU core).
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
     print()
     print("=" * 60)
     print("PHASE 3: COMPARISON — Path A vs Path C")
@@ -1085,33 +1456,177 @@ def run_comparison(viator_mapped: dict) -> dict:
     print()
 
     print("  Loading Path A extraction results...")
-    path_a = load_path_a_results()
+    path_a = load_path_a_results(operators)
     print(f"  Loaded {len(path_a)} operators")
     print()
 
     comparisons: dict[str, dict] = {}
-    for op in OPERATORS:
+    pending: list[tuple] = []  # (slug, pa_data, pc_products)
+    fingerprints: dict[str, str] = {}
+    for op in operators:
         slug = op["slug"]
         pa_data = path_a.get(slug, {"products": [], "operator": {}})
         pc_products = viator_mapped.get(slug, [])
         pa_count = len(pa_data.get("products", []))
         pc_count = len(pc_products)
 
+        fingerprint = operator_fingerprint(slug, pa_data, pc_products)
+        cached = load_cached_comparison(slug, fingerprint) if use_cache else None
+        if cached is not None:
+            print(f"  {slug:25s} {pa_count} (A) vs {pc_count} (C)  [cached]")
+            comparisons[slug] = cached
+            continue
+
         print(f"  {slug:25s} {pa_count} (A) vs {pc_count} (C)")
-        comparisons[slug] = compare_operator(slug, pa_data, pc_products)
+        fingerprints[slug] = fingerprint
+        pending.append((slug, pa_data, pc_products))
 
-    return comparisons
+    for (slug, _, _), comparison in zip(pending, _compare_pending(pending, workers)):
+        comparisons[slug] = comparison
+        save_cached_comparison(slug, fingerprints[slug], comparison)
+
+    reused = len(comparisons) - len(pending)
+    print()
+    print(f"  Compared {len(pending)}, reused {reused} cached")
+    if len(pending) > 1 and workers > 1:
+        print(f"  Workers: {min(workers, len(pending))} processes")
+
+    # Merge cached and fresh results back into stable operator order
+    return {op["slug"]: comparisons[op["slug"]] for op in operators}
+
+
+def serialize_discoveries(discoveries: dict) -> dict:
+    """Reduce run_discovery output to the JSON saved in discovery_results.json."""
+    serializable = {}
+    for slug, disc in discoveries.items():
+        serializable[slug] = {
+            "search_terms": disc["operator"]["search_terms"],
+            "product_codes": disc["product_codes"],
+            "matched_products": {
+                code: {
+                    "productCode": p.get("productCode", ""),
+                    "title": p.get("title", ""),
+                    "supplier": (
+                        p.get("supplier", {}).get("name", "")
+                        if isinstance(p.get("supplier"), dict)
+                        else ""
+                    ),
+                }
+                for code, p in disc["matched_products"].items()
+            },
+        }
+    return serializable
+
+
+def save_discoveries(serializable: dict, suffix: str = "") -> Path:
+    """Write discovery results (optionally per shard) and return the path."""
+    VIATOR_RAW_DIR.mkdir(parents=True, exist_ok=True)
+    discovery_path = VIATOR_RAW_DIR / f"discovery_results{suffix}.json"
+    with open(discovery_path, "w") as f:
+        json.dump(serializable, f, indent=2, ensure_ascii=False)
+    return discovery_path
+
+
+def save_comparison_outputs(
+    comparisons: dict, discoveries: dict, operators: list[dict], suffix: str = "",
+) -> tuple[Path, Path]:
+    """Write the markdown report and comparison JSON (optionally per shard)."""
+    COMPARISONS_DIR.mkdir(parents=True, exist_ok=True)
+    report_path = COMPARISONS_DIR / f"path_a_vs_path_c{suffix}.md"
+    write_report(comparisons, discoveries, operators, report_path)
+
+    json_path = COMPARISONS_DIR / f"path_a_vs_path_c{suffix}.json"
+    with open(json_path, "w") as f:
+        json.dump(comparisons, f, indent=2, ensure_ascii=False, default=str)
+    return report_path, json_path
+
+
+def merge_shards(operators: list[dict], count: int):
+    """Combine the per-shard discovery and comparison outputs of N shard runs.
+
+    Results are re-keyed in manifest order, so the merged files are the same
+    no matter which machine ran which shard or in what order they finished.
+    """
+    print()
+    print("=" * 60)
+    print(f"MERGE SHARDS — {count} shard(s)")
+    print("=" * 60)
+
+    discoveries: dict[str, dict] = {}
+    comparisons: dict[str, dict] = {}
+    missing: list[Path] = []
+    for index in range(count):
+        suffix = shard_suffix((index, count))
+        for path, merged in (
+            (VIATOR_RAW_DIR / f"discovery_results{suffix}.json", discoveries),
+            (COMPARISONS_DIR / f"path_a_vs_path_c{suffix}.json", comparisons),
+        ):
+            if not path.exists():
+                missing.append(path)
+                continue
+            with open(path) as f:
+                merged.update(json.load(f))
+
+    if missing:
+        print("ERROR: Missing shard outputs:", file=sys.stderr)
+        for path in missing:
+            print(f"  - {path}", file=sys.stderr)
+        sys.exit(1)
+
+    order = [op["slug"] for op in operators]
+    discoveries = {slug: discoveries[slug] for slug in order if slug in discoveries}
+    comparisons = {slug: comparisons[slug] for slug in order if slug in comparisons}
+    merged_ops = [op for op in operators if op["slug"] in comparisons]
+
+    discovery_path = save_discoveries(discoveries)
+    report_path, json_path = save_comparison_outputs(comparisons, discoveries, merged_ops)
+    print(f"  Operators:  {len(comparisons)} of {len(operators)} compared")
+    print(f"  Discovery:  {discovery_path}")
+    print(f"  Report:     {report_path}")
+    print(f"  JSON:       {json_path}")
 
 
 # ---------------------------------------------------------------------------
 # CLI / main
 # ---------------------------------------------------------------------------
 
+def check_connectivity(client: ViatorClient):
+    """Quick connectivity test before doing real work; exits on auth or network failure."""
+    import requests
+
+    print()
+    print("  Testing API connectivity...", end="")
+    try:
+        test_resp = requests.get(
+            f"{client.base_url}/products/tags/",
+            headers={k: v for k, v in client.headers.items() if k != "Content-Type"},
+        )
+        if test_resp.status_code == 401:
+            body = test_resp.json() if "json" in test_resp.headers.get("content-type", "") else {}
+            print(f" FAILED")
+            print()
+            print(f"  ERROR: {body.get('message', 'Unauthorized')} (HTTP 401)")
+            print(f"  Your API key may not be activated yet (can take up to 24 hours).")
+            print(f"  Check your Viator Partner dashboard for key status.")
+            sys.exit(1)
+        elif test_resp.status_code >= 400:
+            print(f" FAILED (HTTP {test_resp.status_code})")
+            print(f"  Response: {test_resp.text[:200]}")
+            sys.exit(1)
+        else:
+            tags = test_resp.json().get("tags", [])
+            print(f" OK ({len(tags)} product tags loaded)")
+    except requests.ConnectionError as e:
+        print(f" FAILED (connection error)")
+        print(f"  {e}")
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description=(
             "Compare Path A (website extraction) vs Path C (Viator API) "
-            "for Phase 0 operators"
+            "for the operators in a manifest"
         ),
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -1127,6 +1642,18 @@ Examples:
 
   # Dry run — print config, no API calls
   python scripts/viator_compare.py --dry-run
+
+  # Recompare every operator, ignoring cached comparisons
+  python scripts/viator_compare.py --no-cache
+
+  # Spread the comparison across all CPU cores
+  python scripts/viator_compare.py --workers 0
+
+  # Split a large manifest across 4 machines, then merge their outputs
+  python scripts/viator_compare.py --manifest manifests/big.json --shard 0/4
+  ...
+  python scripts/viator_compare.py --manifest manifests/big.json --shard 3/4
+  python scripts/viator_compare.py --manifest manifests/big.json --merge-shards 4
         """,
     )
     parser.add_argument(
@@ -1144,13 +1671,56 @@ Examples:
         action="store_true",
         help="Print config without making API calls.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompare every operator, ignoring cached per-operator comparisons.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for the Phase 3 comparison (default: 1, 0 = one per CPU core).",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=DEFAULT_MANIFEST_PATH,
+        help=f"Operator/destination manifest JSON (default: {DEFAULT_MANIFEST_PATH.relative_to(PROJECT_ROOT)}).",
+    )
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="i/N",
+        help="Only process shard i of N (0-based); outputs get a .shard-i-of-N suffix.",
+    )
+    shard_group.add_argument(
+        "--merge-shards",
+        type=parse_shard_count,
+        metavar="N",
+        help="Merge the outputs of N shard runs into the combined report (no API calls).",
+    )
+
+    add_cassette_arguments(parser)
 
     args = parser.parse_args()
+    configure_from_args(args)
+
+    manifest = load_manifest(args.manifest)
+    destinations = manifest["destinations"]
+
+    if args.merge_shards is not None:
+        merge_shards(manifest["operators"], args.merge_shards)
+        return
+
+    operators = select_shard(manifest["operators"], args.shard)
+    suffix = shard_suffix(args.shard)
 
     load_dotenv(PROJECT_ROOT / ".env")
 
     # Validate API key
-    api_key = os.getenv("VIATOR_API_KEY")
+    api_key = "replay-key" if replaying() else os.getenv("VIATOR_API_KEY")
     if not api_key or api_key == "your-viator-api-key-here":
         print("ERROR: VIATOR_API_KEY not set in .env", file=sys.stderr)
         sys.exit(1)
@@ -1166,22 +1736,28 @@ Examples:
     print(f"  Environment:    {env_label}")
     print(f"  Base URL:       {base_url}")
     print(f"  API Key:        {api_key[:8]}...{api_key[-4:]}")
-    print(f"  Destination:    Seattle (ID {SEATTLE_DEST_ID})")
-    print(f"  Operators:      {len(OPERATORS)}")
+    print(f"  Manifest:       {manifest.get('name', args.manifest.stem)} ({args.manifest})")
+    dest_ids = sorted({op["destination"] for op in operators})
+    dest_labels = [f"{destinations[d].get('name', '?')} (ID {d})" for d in dest_ids]
+    print(f"  Destinations:   {', '.join(dest_labels) or '—'}")
+    if args.shard:
+        print(f"  Shard:          {args.shard[0]}/{args.shard[1]}")
+    print(f"  Operators:      {len(operators)} of {len(manifest['operators'])}")
     print(f"  Output dirs:")
     print(f"    Raw:          {VIATOR_RAW_DIR}")
     print(f"    Mapped:       {VIATOR_MAPPED_DIR}")
     print(f"    Comparison:   {COMPARISONS_DIR}")
+    print(f"    Cache:        {COMPARISON_CACHE_DIR}{' (disabled)' if args.no_cache else ''}")
 
     if args.dry_run:
         print()
         print("--- DRY RUN ---")
         print()
         print("  Operators to search:")
-        for op in OPERATORS:
+        for op in operators:
             print(f"    {op['slug']:25s} terms: {op['search_terms']}")
         print()
-        search_count = sum(len(op["search_terms"]) for op in OPERATORS)
+        search_count = sum(len(op["search_terms"]) for op in operators)
         print(f"  Estimated API calls:")
         print(f"    Discovery:    ~{search_count} freetext searches")
         print(f"    Deep pull:    ~2 per matched product (product + schedule)")
@@ -1190,63 +1766,19 @@ Examples:
 
     client = ViatorClient(api_key, base_url)
 
-    # Quick connectivity test before doing real work
-    print()
-    print("  Testing API connectivity...", end="")
-    try:
-        test_resp = requests.get(
-            f"{base_url}/products/tags/",
-            headers={k: v for k, v in client.headers.items() if k != "Content-Type"},
-        )
-        if test_resp.status_code == 401:
-            body = test_resp.json() if "json" in test_resp.headers.get("content-type", "") else {}
-            print(f" FAILED")
-            print()
-            print(f"  ERROR: {body.get('message', 'Unauthorized')} (HTTP 401)")
-            print(f"  Your API key may not be activated yet (can take up to 24 hours).")
-            print(f"  Check your Viator Partner dashboard for key status.")
-            sys.exit(1)
-        elif test_resp.status_code >= 400:
-            print(f" FAILED (HTTP {test_resp.status_code})")
-            print(f"  Response: {test_resp.text[:200]}")
-            sys.exit(1)
-        else:
-            tags = test_resp.json().get("tags", [])
-            print(f" OK ({len(tags)} product tags loaded)")
-    except requests.ConnectionError as e:
-        print(f" FAILED (connection error)")
-        print(f"  {e}")
-        sys.exit(1)
+    # Quick connectivity test before doing real work (nothing to test when replaying)
+    if not replaying():
+        check_connectivity(client)
 
     # Create output directories
     for d in (VIATOR_RAW_DIR, VIATOR_MAPPED_DIR, COMPARISONS_DIR):
         d.mkdir(parents=True, exist_ok=True)
 
     # Phase 1: Discovery
-    discoveries = run_discovery(client)
+    discoveries = run_discovery(client, operators)
 
     # Save discovery results
-    serializable = {}
-    for slug, disc in discoveries.items():
-        serializable[slug] = {
-            "search_terms": disc["operator"]["search_terms"],
-            "product_codes": disc["product_codes"],
-            "matched_products": {
-                code: {
-                    "productCode": p.get("productCode", ""),
-                    "title": p.get("title", ""),
-                    "supplier": (
-                        p.get("supplier", {}).get("name", "")
-                        if isinstance(p.get("supplier"), dict)
-                        else ""
-                    ),
-                }
-                for code, p in disc["matched_products"].items()
-            },
-        }
-    discovery_path = VIATOR_RAW_DIR / "discovery_results.json"
-    with open(discovery_path, "w") as f:
-        json.dump(serializable, f, indent=2, ensure_ascii=False)
+    discovery_path = save_discoveries(serialize_discoveries(discoveries), suffix)
     print(f"\n  Discovery saved to: {discovery_path}")
 
     if args.discover_only:
@@ -1257,22 +1789,15 @@ Examples:
     viator_mapped = run_deep_pull(client, discoveries)
 
     # Phase 3: Comparison
-    comparisons = run_comparison(viator_mapped)
+    comparisons = run_comparison(
+        viator_mapped, operators, use_cache=not args.no_cache, workers=args.workers,
+    )
 
     # Generate report
     print()
     print("  Generating comparison report...")
-    report = generate_report(comparisons, discoveries)
-
-    report_path = COMPARISONS_DIR / "path_a_vs_path_c.md"
-    with open(report_path, "w") as f:
-        f.write(report)
+    report_path, json_path = save_comparison_outputs(comparisons, discoveries, operators, suffix)
     print(f"  Report:  {report_path}")
-
-    # Save comparison JSON
-    json_path = COMPARISONS_DIR / "path_a_vs_path_c.json"
-    with open(json_path, "w") as f:
-        json.dump(comparisons, f, indent=2, ensure_ascii=False, default=str)
     print(f"  JSON:    {json_path}")
 
     # Final summary
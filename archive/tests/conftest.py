@@ -0,0 +1,99 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# The scripts are standalone modules that import their siblings directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import api_ledger  # noqa: E402
+import extraction_pipeline  # noqa: E402
+import preflight  # noqa: E402
+import response_parsing  # noqa: E402
+import scraping  # noqa: E402
+
+RESULT = {
+    "operator": {"name": "Harbor Cruises"},
+    "products": [
+        {"title": "Sunset cruise", "priceByUnit": [{"unitType": "adult", "amount": 4900}]},
+        {"title": "Whale watch", "priceByUnit": [{"unitType": "adult", "amount": 8900}]},
+    ],
+}
+
+
+class FakeFirecrawl:
+    def scrape(self, url, **kwargs):
+        return SimpleNamespace(markdown=f"# {url}\n\nTours and prices for {url}.", raw_html=None)
+
+
+class FakeStream:
+    """messages.stream() stand-in; ``fail`` raises after the text has streamed."""
+
+    def __init__(self, message, fail: Exception | None = None):
+        self.message = message
+        self.fail = fail
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        text = self.message.content[0].text
+        for start in range(0, len(text), 20):
+            yield text[start:start + 20]
+        if self.fail is not None:
+            raise self.fail
+
+    def get_final_message(self):
+        return self.message
+
+
+class FakeClaude:
+    """Serves queued replies to messages.create and messages.stream, RESULT by default.
+
+    Queue (text, stop_reason) pairs in ``replies``; a stop_reason of
+    "error" streams the text and then raises.
+    """
+
+    def __init__(self):
+        self.replies: list[tuple[str, str]] = []
+        self.requests: list[dict] = []
+        self.messages = self
+
+    def _message(self, **kwargs):
+        self.requests.append(kwargs)
+        text, stop_reason = self.replies.pop(0) if self.replies else (json.dumps(RESULT), "end_turn")
+        usage = SimpleNamespace(
+            input_tokens=1000, output_tokens=200, cache_creation_input_tokens=0, cache_read_input_tokens=0,
+        )
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage, stop_reason=stop_reason)
+
+    def create(self, **kwargs):
+        return self._message(**kwargs)
+
+    def stream(self, **kwargs):
+        message = self._message(**kwargs)
+        if message.stop_reason == "error":
+            return FakeStream(message, fail=ConnectionError("stream reset"))
+        return FakeStream(message)
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    """run_extraction against fake Firecrawl and Claude clients, writing under tmp_path."""
+    claude = FakeClaude()
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "fc-test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-test")
+    for module in (extraction_pipeline, preflight, response_parsing):
+        monkeypatch.setattr(module, "RESULTS_DIR", tmp_path / "results")
+    monkeypatch.setattr(scraping, "SCRAPE_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(extraction_pipeline, "firecrawl_app", lambda api_key: FakeFirecrawl())
+    monkeypatch.setattr(extraction_pipeline, "anthropic_client", lambda api_key: claude)
+    api_ledger.set_ledger_path(None)
+    yield SimpleNamespace(claude=claude, results=tmp_path / "results")
+    api_ledger.set_ledger_path(api_ledger.DEFAULT_LEDGER_PATH)
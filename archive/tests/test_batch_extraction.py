@@ -0,0 +1,58 @@
+"""extract_operator.py --batch end to end against the local Message Batches stand-in."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import api_ledger
+import batch_extraction
+import extraction_pipeline
+import preflight
+import response_parsing
+import scraping
+from batch_standin import start_standin
+
+
+class FakeFirecrawl:
+    def scrape(self, url, **kwargs):
+        return SimpleNamespace(markdown=f"# {url}\n\nTours and prices for {url}.", raw_html=None)
+
+
+@pytest.fixture
+def standin(monkeypatch, tmp_path):
+    server, base_url = start_standin(polls_until_ended=1)
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", base_url)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-standin")
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "fc-standin")
+    for module in (extraction_pipeline, preflight, response_parsing):
+        monkeypatch.setattr(module, "RESULTS_DIR", tmp_path / "results")
+    monkeypatch.setattr(batch_extraction, "BATCHES_DIR", tmp_path / "results" / "batches")
+    monkeypatch.setattr(scraping, "SCRAPE_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(batch_extraction, "firecrawl_app", lambda api_key: FakeFirecrawl())
+    api_ledger.set_ledger_path(None)
+    yield server
+    api_ledger.set_ledger_path(api_ledger.DEFAULT_LEDGER_PATH)
+    server.shutdown()
+
+
+def test_batch_writes_each_operators_result(standin, tmp_path):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"operators": [
+        {"slug": "harbor_cruises", "urls": ["https://harbor.example.com/tours/"]},
+        {"slug": "rainier_tours", "urls": ["https://rainier.example.com/", "https://rainier.example.com/day-trip"]},
+    ]}))
+
+    summary = batch_extraction.run_batch_extraction(manifest_path=manifest, poll_interval=0)
+
+    assert sorted(summary["saved"]) == ["harbor_cruises", "rainier_tours"]
+    assert summary["failed"] == {}
+    (batch,) = standin.standin.batches.values()
+    assert batch["polls"] > standin.standin.polls_until_ended  # polled through in_progress
+    for slug in ("harbor_cruises", "rainier_tours"):
+        path = tmp_path / "results" / slug / "extract_operator_v1.json"
+        assert path.exists()
+        result = json.loads(path.read_text())
+        assert result["operator"]["name"] == slug.replace("_", " ").title()
+        assert len(result["products"]) == 1
+        assert result["extractionMetadata"]["method"] == "firecrawl_scrape_claude_batch"
@@ -0,0 +1,45 @@
+"""Chunked extraction reports a single page still cut off at max_tokens as truncated."""
+
+import json
+
+from conftest import RESULT
+from extraction_options import ExtractionOptions
+from extraction_pipeline import run_extraction
+
+URLS = ["https://harbor.example.com/tours/"]
+CHUNKED = ExtractionOptions(chunked=True, repair_products=False)
+
+
+def cut_off_reply() -> tuple[str, str]:
+    text = json.dumps(RESULT)
+    return text[:text.index('{"title": "Whale watch"')], "max_tokens"
+
+
+def test_truncated_chunk_is_recorded_and_retried(pipeline):
+    pipeline.claude.replies.append(cut_off_reply())
+
+    result = run_extraction(URLS, operator="harbor", options=CHUNKED)
+
+    assert [p["title"] for p in result["products"]] == ["Sunset cruise"]
+    meta = result["extractionMetadata"]
+    assert meta["truncated"] == {"stopReason": "max_tokens", "chunks": ["1"]}
+    assert meta["chunking"]["truncatedChunks"] == ["1"]
+
+    # Unchanged pages, but a truncated result is worth another call
+    run_extraction(URLS, operator="harbor", options=CHUNKED)
+    assert len(pipeline.claude.requests) == 2
+
+
+def test_truncated_chunk_escalates_the_cascade(pipeline):
+    pipeline.claude.replies.append(cut_off_reply())
+    options = ExtractionOptions(
+        chunked=True, repair_products=False,
+        cascade_models=["claude-haiku-4-5-20251001", "claude-sonnet-4-5-20250929"],
+    )
+
+    result = run_extraction(URLS, operator="harbor", options=options)
+
+    cascade = result["extractionMetadata"]["cascade"]
+    assert cascade["attempts"][0]["issues"][0] == "response truncated"
+    assert cascade["tier"] == 2
+    assert len(result["products"]) == 2
@@ -0,0 +1,71 @@
+"""run_comparison reuses per-operator comparisons whose input fingerprint is unchanged."""
+
+import json
+
+import pytest
+
+import viator_compare
+
+OPERATORS = [{"slug": "harbor_cruises"}, {"slug": "rainier_tours"}]
+VIATOR = {
+    "harbor_cruises": [{"title": "Sunset Harbor Cruise", "duration": 120}],
+    "rainier_tours": [{"title": "Mount Rainier Day Trip", "duration": 600}],
+}
+
+
+@pytest.fixture
+def compared(monkeypatch, tmp_path):
+    """Slugs passed to compare_operator, with results and cache under tmp_path."""
+    monkeypatch.setattr(viator_compare, "RESULTS_DIR", tmp_path / "results")
+    monkeypatch.setattr(viator_compare, "COMPARISON_CACHE_DIR", tmp_path / "cache")
+    calls = []
+    real = viator_compare.compare_operator
+
+    def counting(slug, path_a_data, viator_products):
+        calls.append(slug)
+        return real(slug, path_a_data, viator_products)
+
+    monkeypatch.setattr(viator_compare, "compare_operator", counting)
+    for op, title in zip(OPERATORS, ["Sunset Harbor Cruise", "Mount Rainier Day Trip"]):
+        write_path_a(tmp_path, op["slug"], title)
+    return calls
+
+
+def write_path_a(tmp_path, slug: str, title: str):
+    path = tmp_path / "results" / slug / "extract_operator_v1.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"operator": {"name": slug}, "products": [{"title": title}]}))
+
+
+def test_unchanged_inputs_hit_the_cache(compared):
+    first = viator_compare.run_comparison(VIATOR, OPERATORS)
+    second = viator_compare.run_comparison(VIATOR, OPERATORS)
+
+    assert compared == ["harbor_cruises", "rainier_tours"]
+    assert second == first
+
+
+def test_changed_inputs_miss_the_cache(compared, tmp_path):
+    viator_compare.run_comparison(VIATOR, OPERATORS)
+    write_path_a(tmp_path, "rainier_tours", "Mount Rainier Private Tour")
+    changed_viator = {**VIATOR, "harbor_cruises": [{"title": "Sunset Harbor Cruise", "duration": 90}]}
+
+    result = viator_compare.run_comparison(changed_viator, OPERATORS)
+
+    assert compared[2:] == ["harbor_cruises", "rainier_tours"]
+    assert list(result) == ["harbor_cruises", "rainier_tours"]
+
+
+def test_no_cache_recompares_everything(compared):
+    viator_compare.run_comparison(VIATOR, OPERATORS)
+    viator_compare.run_comparison(VIATOR, OPERATORS, use_cache=False)
+    assert len(compared) == 4
+
+
+def test_fingerprint_covers_both_sides_and_the_compare_version(monkeypatch):
+    base = viator_compare.operator_fingerprint("harbor", {"products": []}, [])
+    assert viator_compare.operator_fingerprint("harbor", {"products": []}, []) == base
+    assert viator_compare.operator_fingerprint("harbor", {"products": [{}]}, []) != base
+    assert viator_compare.operator_fingerprint("harbor", {"products": []}, [{}]) != base
+    monkeypatch.setattr(viator_compare, "COMPARE_VERSION", "compare_next")
+    assert viator_compare.operator_fingerprint("harbor", {"products": []}, []) != base
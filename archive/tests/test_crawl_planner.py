@@ -0,0 +1,119 @@
+"""Crawl planning: candidate ranking, and sitemap fetches that go through the cassettes."""
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import api_ledger
+import cassettes
+import crawl_planner
+import scraping
+from crawl_planner import score_candidate
+
+ROBOTS = "User-agent: *\nSitemap: https://harbor.example.com/sitemap.xml\n"
+SITEMAP = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    "<url><loc>https://harbor.example.com/tours/sunset-cruise/</loc></url>"
+    "<url><loc>https://harbor.example.com/blog/whale-season/</loc></url>"
+    "</urlset>"
+)
+
+
+class FakeResponse:
+    def __init__(self, body: str, status_code: int = 200):
+        self.content = body.encode("utf-8")
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path):
+    fetched = []
+
+    def get(url, timeout):
+        fetched.append(url)
+        return {
+            "https://harbor.example.com/robots.txt": FakeResponse(ROBOTS),
+            "https://harbor.example.com/sitemap.xml": FakeResponse(SITEMAP),
+        }.get(url, FakeResponse("", 404))
+
+    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(scraping, "SCRAPE_CACHE_DIR", tmp_path / "cache")
+    api_ledger.set_ledger_path(None)
+    yield fetched
+    cassettes.configure(None)
+    api_ledger.set_ledger_path(api_ledger.DEFAULT_LEDGER_PATH)
+
+
+def test_sitemap_fetches_replay_offline(site, tmp_path):
+    cassettes.configure("record", tmp_path / "cassette")
+    recorded = crawl_planner.fetch_sitemap_urls("https://harbor.example.com/tours/")
+    assert site == ["https://harbor.example.com/robots.txt", "https://harbor.example.com/sitemap.xml"]
+
+    site.clear()
+    cassettes.configure("replay", tmp_path / "cassette", "none")
+    assert crawl_planner.fetch_sitemap_urls("https://harbor.example.com/tours/") == recorded
+    assert site == []
+    with pytest.raises(cassettes.CassetteMiss):
+        crawl_planner.fetch_sitemap_urls("https://rainier.example.com/")
+
+
+def test_dry_run_plan_fetches_nothing(site):
+    listing = "https://harbor.example.com/tours/"
+    markdown = "# Tours\n\n[Sunset cruise](/tours/sunset-cruise/) [About us](/about/)"
+    scraping.save_cached_scrape(listing, ["markdown"], False, markdown, None)
+
+    plan = crawl_planner.plan_pages(None, listing)
+
+    assert site == []
+    assert plan["sitemapUrls"] == 0
+    assert [page["url"] for page in plan["selected"]] == [listing, "https://harbor.example.com/tours/sunset-cruise/"]
+
+
+def test_score_candidate_ranks_product_pages_above_the_rest():
+    listing = "https://harbor.example.com/tours/"
+    linked_product = score_candidate("https://harbor.example.com/tours/sunset-cruise/", listing, True, True)
+    sitemap_only = score_candidate("https://harbor.example.com/charters/private/", listing, False, True)
+
+    assert linked_product == (8, ["linked from listing", "under listing path", "product-like path", "in sitemap"])
+    assert sitemap_only == (3, ["product-like path", "in sitemap"])
+    assert score_candidate("https://harbor.example.com/blog/whale-season/", listing, True, True)[0] < 0
+    assert score_candidate("https://harbor.example.com/tours/map.pdf", listing, True, False)[0] < 0
+    assert score_candidate("https://harbor.example.com/", listing, True, True)[0] == 2  # depth 0
+
+
+def test_plan_ranks_dedupes_and_respects_the_page_budget(site):
+    listing = "https://harbor.example.com/tours/"
+    markdown = (
+        "# Tours\n\n[Sunset cruise](/tours/sunset-cruise/?utm_source=nav) "
+        "[Sunset again](https://harbor.example.com/tours/sunset-cruise#book) "
+        "[Harbor lunch](/tours/harbor-lunch/) [Partner](https://rainier.example.com/tours/day-trip/)"
+    )
+
+    class ListingApp:
+        def scrape(self, url, **kwargs):
+            return SimpleNamespace(markdown=markdown, raw_html=None)
+
+    plan = crawl_planner.plan_pages(ListingApp(), listing, max_pages=3)
+
+    assert plan["sitemapUrls"] == 2
+    assert [page["url"] for page in plan["selected"]] == [
+        listing,
+        "https://harbor.example.com/tours/sunset-cruise/",  # linked and in the sitemap
+        "https://harbor.example.com/tours/harbor-lunch/",
+    ]
+    assert plan["candidates"] == 2  # blog post excluded, other host skipped
+
+
+def test_plan_skips_pages_over_the_token_budget(site):
+    listing = "https://harbor.example.com/tours/"
+    scraping.save_cached_scrape(listing, ["markdown"], False, "[Sunset cruise](/tours/sunset-cruise/)", None)
+    scraping.save_cached_scrape("https://harbor.example.com/tours/sunset-cruise/", ["markdown"], False, "x" * 40_000, None)
+
+    roomy = crawl_planner.plan_pages(None, listing)
+    tight = crawl_planner.plan_pages(None, listing, token_budget=1_000)
+
+    assert len(roomy["selected"]) == 2 and roomy["estimatedTokens"] > 1_000
+    assert [page["url"] for page in tight["selected"]] == [listing]
@@ -0,0 +1,87 @@
+"""viator_compare's FIELD_COMPARATORS registry: one row per field per matched product pair."""
+
+from viator_compare import (
+    COMPARATOR_KINDS, DURATION_TOLERANCE_MINUTES, FIELD_COMPARATORS, _compare_products,
+    compare_product_pairs,
+)
+
+PATH_A = {
+    "title": "Sunset Harbor Cruise",
+    "description": "Two hours on the water.",
+    "duration": 120,
+    "durationDisplay": "2 hours",
+    "priceByUnit": [
+        {"unitType": "adult", "label": "Adult", "amount": 4900},
+        {"unitType": "group", "label": "Up to 6", "amount": 25000},
+    ],
+    "features": [
+        {"type": "INCLUSION", "value": "Complimentary sparkling wine"},
+        {"type": "INCLUSION", "value": "Live narration"},
+        {"type": "EXCLUSION", "value": "Hotel pickup"},
+    ],
+    "locations": [{"type": "START", "name": "Pier 55"}],
+    "media": [{"url": "a.jpg"}],
+}
+PATH_C = {
+    "title": "sunset harbor cruise ",
+    "description": "A longer description of two hours on the water with views.",
+    "duration": 130,
+    "priceDetails": [
+        {"ageBand": "ADULT", "recommendedRetailPrice": 52.0},
+        {"ageBand": "ADULT", "recommendedRetailPrice": 51.0},
+        {"ageBand": "TRAVELER", "recommendedRetailPrice": 240.0},
+        {"ageBand": "CHILD", "recommendedRetailPrice": 30.0},
+    ],
+    "inclusions": ["Sparkling wine (complimentary)", "Snacks"],
+    "exclusions": [],
+    "startLocations": [{"ref": "1"}, {"ref": "2"}],
+    "reviews": {"totalReviews": 87, "combinedAverageRating": 4.8},
+    "cancellationPolicy": {"description": "Full refund up to 24 hours before."},
+    "imageCount": 12,
+}
+
+
+def test_every_field_uses_a_registered_kind_in_report_order():
+    assert all(spec["kind"] in COMPARATOR_KINDS for spec in FIELD_COMPARATORS.values())
+    fields = _compare_products(PATH_A, PATH_C, 0.91)["fields"]
+    assert list(fields) == list(FIELD_COMPARATORS)
+
+
+def test_field_rows():
+    detail = _compare_products(PATH_A, PATH_C, 0.912)
+    fields = detail["fields"]
+
+    assert detail["matchScore"] == 0.91
+    assert fields["title"]["match"]
+    assert fields["description"]["winner"] == "C"
+    assert fields["duration"] == {"pathA": "120 min", "pathC": "130 min", "match": True, "difference": 10}
+    assert fields["inclusions"] == {"pathA_count": 2, "pathC_count": 2, "winner": "tie", "overlap": 1}
+    assert fields["exclusions"] == {"pathA_count": 1, "pathC_count": 0, "overlap": 0}
+    assert fields["meetingPoints"] == {"pathA_count": 1, "pathC_count": 2}
+    assert fields["images"]["winner"] == "C"
+    assert fields["cancellationPolicy"]["pathC_has"] and not fields["cancellationPolicy"]["pathA_has"]
+
+
+def test_price_table_maps_bands_and_keeps_the_lowest_viator_price():
+    pricing = _compare_products(PATH_A, PATH_C, 0.9)["fields"]["pricing"]
+    diffs = {d["band"]: d for d in pricing["diffs"]}
+
+    assert diffs["ADULT"] == {"band": "ADULT", "pathA": 49.0, "pathC": 51.0, "delta": 2.0}
+    assert diffs["TRAVELER"]["delta"] == -10.0  # Path A "group" is Viator's TRAVELER band
+    assert diffs["CHILD"] == {"band": "CHILD", "pathA": None, "pathC": 30.0, "delta": None}
+    assert pricing["pathC"].count("ADULT") == 2  # deduped display, both distinct prices
+
+
+def test_duration_outside_tolerance_is_a_mismatch():
+    far = {**PATH_C, "duration": PATH_A["duration"] + DURATION_TOLERANCE_MINUTES + 1}
+    assert _compare_products(PATH_A, far, 0.9)["fields"]["duration"]["match"] is False
+    assert _compare_products({**PATH_A, "duration": None}, PATH_C, 0.9)["fields"]["duration"]["match"] is None
+
+
+def test_columns_match_pairwise_comparison():
+    other_a = {"title": "Whale Watch", "priceByUnit": [], "pricingNotes": "Call for prices"}
+    other_c = {"title": "Whale Watching Tour", "fromPrice": 89.0}
+    pairs = [(PATH_A, PATH_C, 0.9), (other_a, other_c, 0.6)]
+
+    assert compare_product_pairs(pairs) == [_compare_products(a, c, s) for a, c, s in pairs]
+    assert compare_product_pairs([]) == []
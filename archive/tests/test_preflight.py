@@ -0,0 +1,81 @@
+"""Preflight estimates: from the scrape cache alone, exact token counts, cascade tiers, chunk plans."""
+
+from types import SimpleNamespace
+
+import pytest
+
+import preflight
+import scraping
+from chunking import plan_chunks
+from extraction_options import ExtractionOptions
+from page_reduction import reduce_pages
+
+URLS = ["https://harbor.example.com/tours/", "https://harbor.example.com/tours/sunset/"]
+
+
+@pytest.fixture
+def cached_pages(monkeypatch, tmp_path):
+    monkeypatch.setattr(scraping, "SCRAPE_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(preflight, "RESULTS_DIR", tmp_path / "results")
+    for url in URLS:
+        markdown = f"# Harbor cruise\n\nFrom $49 per adult.\n\n" + f"Narrated sightseeing from {url}. " * 400
+        scraping.save_cached_scrape(url, ["markdown"], False, markdown, None)
+
+
+def test_estimates_cached_pages_and_counts_uncached_ones(cached_pages):
+    urls = URLS + ["https://harbor.example.com/not-cached/"]
+    (estimate,) = preflight.run_preflight(
+        [{"slug": "harbor", "urls": urls}], ExtractionOptions(), scrape=False,
+    )
+    assert estimate["operator"] == "harbor"
+    assert estimate["pages"] == 2
+    assert estimate["calls"] == 1
+    assert estimate["fitsMaxTokens"]
+
+
+def test_chunked_options_split_the_estimate_into_calls(cached_pages):
+    options = ExtractionOptions(model="claude-haiku-4-5-20251001", chunked=True, chunk_tokens=3_000)
+    (estimate,) = preflight.run_preflight([{"slug": "harbor", "urls": URLS}], options, scrape=False)
+    assert estimate["calls"] > 1
+
+
+class CountingClaude:
+    def __init__(self):
+        self.counted = []
+        self.messages = self
+
+    def count_tokens(self, model, system, messages):
+        self.counted.append(model)
+        return SimpleNamespace(input_tokens=2_000 + len(messages[0]["content"]) // 4)
+
+
+def test_counts_tokens_exactly_when_a_client_is_given(cached_pages):
+    options = ExtractionOptions()
+    pages = scraping.cached_pages_only(URLS, False, options.max_age_hours)["pages"]
+    pages, site_chrome, _ = reduce_pages(pages, options.strip_boilerplate)
+    client = CountingClaude()
+
+    estimate = preflight.preflight_operator(
+        "harbor", 1, pages, site_chrome, "prompt", options.model, options, client=client,
+    )
+
+    assert estimate["tokenSource"] == "count_tokens"
+    assert estimate["systemTokens"] == 2_000
+    assert estimate["userTokens"] == len(preflight.planned_messages(pages, site_chrome, options)[0]) // 4
+    assert client.counted == [options.model] * 2
+
+
+def test_every_cascade_tier_is_estimated(cached_pages):
+    tiers = ["claude-haiku-4-5-20251001", "claude-sonnet-4-5-20250929"]
+    options = ExtractionOptions(cascade_models=tiers)
+    estimates = preflight.run_preflight([{"slug": "harbor", "urls": URLS}], options, scrape=False)
+    assert [e["model"] for e in estimates] == tiers
+    assert estimates[0]["costUsd"] < estimates[1]["costUsd"]
+
+
+def test_chunk_plan_matches_extract_chunked(cached_pages):
+    options = ExtractionOptions(chunked=True, chunk_tokens=1_500)
+    pages = scraping.cached_pages_only(URLS, False, options.max_age_hours)["pages"]
+    pages, site_chrome, _ = reduce_pages(pages, options.strip_boilerplate)
+    (estimate,) = preflight.run_preflight([{"slug": "harbor", "urls": URLS}], options, scrape=False)
+    assert estimate["calls"] == len(plan_chunks(pages, False, options.chunk_tokens, site_chrome))
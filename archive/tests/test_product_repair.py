@@ -0,0 +1,55 @@
+"""repair_invalid_products: only failing products are re-asked, and non-objects never crash it."""
+
+import json
+from types import SimpleNamespace
+
+import api_ledger
+from product_repair import build_repair_content, repair_invalid_products
+
+PAGES = [{"url": "https://harbor.example.com/tours/", "markdown": "# Sunset cruise\n\nFrom $49 per adult."}]
+
+
+class FakeClaude:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+        self.messages = self
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        usage = SimpleNamespace(
+            input_tokens=100, output_tokens=20, cache_creation_input_tokens=0, cache_read_input_tokens=0,
+        )
+        text = json.dumps({"products": self.replies.pop(0)})
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage, stop_reason="end_turn")
+
+
+def setup_module():
+    api_ledger.set_ledger_path(None)
+
+
+def teardown_module():
+    api_ledger.set_ledger_path(api_ledger.DEFAULT_LEDGER_PATH)
+
+
+def test_only_invalid_products_are_re_asked_and_spliced_back():
+    result = {"products": [{"title": "Sunset cruise"}, {"title": 7}]}
+    client = FakeClaude([{"title": "Whale watch"}])
+
+    repair = repair_invalid_products(client, "claude-haiku-4-5-20251001", [], PAGES, result)
+
+    assert result["products"] == [{"title": "Sunset cruise"}, {"title": "Whale watch"}]
+    assert repair["metadata"]["repairedProducts"] == 1
+    assert "Sunset cruise" not in client.requests[0]["messages"][0]["content"]
+
+
+def test_non_object_products_are_reported_not_raised():
+    result = {"products": ["x", {"title": "Sunset cruise"}]}
+    client = FakeClaude(["still not an object"])
+
+    repair = repair_invalid_products(client, "claude-haiku-4-5-20251001", [], PAGES, result)
+
+    assert len(client.requests) == 1
+    assert repair["metadata"]["repairedProducts"] == 0
+    assert repair["metadata"]["remainingErrors"] == {"0": ["not an object"]}
+    assert "- not an object" in build_repair_content(["x"], [["not an object"]], PAGES)
@@ -0,0 +1,54 @@
+"""Raw HTML is reduced to chrome subtrees and booking URLs, not truncated."""
+
+import page_reduction
+from page_reduction import build_user_content, reduce_pages, reduce_raw_html
+
+HTML = """<html><head><style>body { color: red }</style>
+<script>FH.init({url: "https://fareharbor.com/embeds/book/harborcruises/"});</script></head>
+<body>
+<div class="hello-bar">Summer sale: 20% off sunset cruises</div>
+<nav><ul><li><a href="/tours">Tours</a></li><li><a href="#top">Top</a></li></ul></nav>
+<main><p>Main content the markdown already carries.</p>
+<svg><text>logo glyphs</text></svg></main>
+<footer><p>Pier 55<br>Seattle WA</p></footer>
+</body></html>"""
+
+
+def test_digest_keeps_chrome_regions_and_booking_urls():
+    html = reduce_raw_html(HTML)
+    digest = html["digest"]
+
+    assert html["regions"] == ["banner", "nav", "footer"]
+    assert "Summer sale: 20% off sunset cruises" in digest
+    assert "Tours (/tours)" in digest and "(#top)" not in digest
+    assert "Pier 55\nSeattle WA" in digest
+    assert html["bookingUrls"] == ["https://fareharbor.com/embeds/book/harborcruises/"]
+    for dropped in ("color: red", "logo glyphs", "Main content"):
+        assert dropped not in digest
+    assert html["digestChars"] < html["rawChars"]
+
+
+def test_html_split_across_feed_pieces_parses_the_same(monkeypatch):
+    whole = reduce_raw_html(HTML)
+    monkeypatch.setattr(page_reduction, "HTML_FEED_CHARS", 7)
+    assert reduce_raw_html(HTML) == whole
+
+
+def test_oversized_digest_is_capped(monkeypatch):
+    monkeypatch.setattr(page_reduction, "RAW_HTML_DIGEST_MAX_CHARS", 50)
+    digest = reduce_raw_html(HTML)["digest"]
+    assert digest.endswith("[... digest truncated at 50 chars ...]")
+    assert len(digest) < 100
+
+
+def test_only_the_first_page_digest_reaches_the_prompt():
+    pages = [{"url": "https://harbor.example.com/", "markdown": "# Home", "raw_html": HTML},
+             {"url": "https://harbor.example.com/sunset", "markdown": "# Sunset", "raw_html": HTML}]
+
+    reduced, _, reduction = reduce_pages(pages)
+    content = build_user_content(reduced, include_raw_html=True)
+
+    assert reduction["rawHtmlDigest"]["regions"] == ["banner", "nav", "footer"]
+    assert "raw_html_digest" not in reduced[1]
+    assert content.count("Summer sale") == 1
+    assert "<script>" not in content
@@ -0,0 +1,40 @@
+"""scan_json_object: the outermost JSON object in a response, repaired when cut off."""
+
+import json
+
+import pytest
+
+from response_parsing import scan_json_object
+
+RESULT = {"operator": {"name": "Op {x}"}, "products": [{"title": "A"}, {"title": "B ]"}]}
+
+
+def test_object_inside_fences_and_prose():
+    text = "Here it is {see below}:\n```json\n" + json.dumps(RESULT) + "\n```\nAnything else? {no}"
+    assert scan_json_object(text) == (RESULT, False)
+
+
+def test_falls_back_to_object_inside_a_non_json_candidate():
+    assert scan_json_object("{prose " + json.dumps(RESULT) + " more prose}") == (RESULT, False)
+
+
+def test_truncated_output_is_cut_back_to_last_complete_product():
+    text = json.dumps(RESULT)
+    result, repaired = scan_json_object(text[:text.index('{"title": "B')] + '{"title": "B')
+    assert repaired
+    assert result == {"operator": RESULT["operator"], "products": [{"title": "A"}]}
+
+
+def test_cut_inside_a_nested_array_drops_the_whole_product():
+    text = '{"products":[{"title":"A"},{"title":"B","priceByUnit":[{"amount":1},{"amo'
+    assert scan_json_object(text) == ({"products": [{"title": "A"}]}, True)
+
+
+def test_cut_inside_the_first_product_leaves_products_empty():
+    text = '{"products":[{"title":"A","priceByUnit":[{"amount":1},{"amo'
+    assert scan_json_object(text) == ({"products": []}, True)
+
+
+def test_no_object_raises():
+    with pytest.raises(json.JSONDecodeError):
+        scan_json_object("no json here { ] at all")
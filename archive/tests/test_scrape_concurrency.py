@@ -0,0 +1,69 @@
+"""scrape_pages runs concurrently but never exceeds per_host requests to one hostname."""
+
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+import pytest
+
+import api_ledger
+import scraping
+
+URLS = [f"https://{host}.example.com/tours/{n}" for n in range(4) for host in ("harbor", "rainier")]
+
+
+class SlowFirecrawl:
+    """Records the peak number of in-flight scrapes per hostname."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = Counter()
+        self.peak = Counter()
+        self.calls = 0
+
+    def scrape(self, url, **kwargs):
+        host = urlparse(url).hostname
+        with self.lock:
+            self.calls += 1
+            self.in_flight[host] += 1
+            self.peak[host] = max(self.peak[host], self.in_flight[host])
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight[host] -= 1
+        return SimpleNamespace(markdown=f"# {url}", raw_html=None)
+
+
+@pytest.fixture(autouse=True)
+def scrape_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(scraping, "SCRAPE_CACHE_DIR", tmp_path / "cache")
+    api_ledger.set_ledger_path(None)
+    yield
+    api_ledger.set_ledger_path(api_ledger.DEFAULT_LEDGER_PATH)
+
+
+def test_per_host_cap_holds_under_more_workers():
+    app = SlowFirecrawl()
+
+    result = scraping.scrape_pages(app, URLS, max_workers=8, per_host=2)
+
+    assert app.peak == {"harbor.example.com": 2, "rainier.example.com": 2}
+    assert [p["url"] for p in result["pages"]] == URLS
+    assert result["total_credits"] == len(URLS)
+
+
+def test_per_host_one_serializes_each_host():
+    app = SlowFirecrawl()
+    scraping.scrape_pages(app, URLS, max_workers=8, per_host=1)
+    assert max(app.peak.values()) == 1
+
+
+def test_cached_pages_skip_the_host_slots():
+    scraping.scrape_pages(SlowFirecrawl(), URLS, max_workers=8)
+    app = SlowFirecrawl()
+
+    result = scraping.scrape_pages(app, URLS, max_workers=8)
+
+    assert app.calls == 0
+    assert result["cached_pages"] == len(URLS) and result["total_credits"] == 0
@@ -0,0 +1,46 @@
+"""Blocks repeated across an operator's pages are sent once as site chrome."""
+
+from page_reduction import CHROME_MIN_BLOCK_CHARS, build_user_content, reduce_pages, strip_site_chrome
+
+NAV = "Home | Tours | Private Charters | Gift Cards | About Us | Contact"
+FOOTER = "Harbor Cruises, Pier 55, Seattle WA. Call (206) 555-0100 to book."
+
+
+def page(url: str, body: str) -> dict:
+    return {"url": url, "markdown": f"{NAV}\n\n# {body}\n\nDetails for {body}.\n\n{FOOTER}\n"}
+
+
+PAGES = [page("https://harbor.example.com/", "Home"),
+         page("https://harbor.example.com/sunset", "Sunset cruise"),
+         page("https://harbor.example.com/whales", "Whale watch")]
+
+
+def test_repeated_blocks_are_moved_to_chrome_once():
+    stripped, chrome, stats = strip_site_chrome(PAGES)
+
+    assert chrome == [NAV, FOOTER]
+    assert stripped[1]["markdown"] == "# Sunset cruise\n\nDetails for Sunset cruise."
+    assert stats["chromeBlocks"] == 2
+    assert stats["charsRemoved"] > 0 and stats["estimatedTokensSaved"] > 0
+
+    content = build_user_content(stripped, include_raw_html=False, site_chrome=chrome)
+    assert content.count(NAV) == 1 and content.count(FOOTER) == 1
+
+
+def test_short_or_rare_blocks_stay_on_their_pages():
+    short = "Book now"
+    assert len(short) < CHROME_MIN_BLOCK_CHARS
+    pages = [{"url": f"https://x.example.com/{n}", "markdown": f"{short}\n\nPage {n} body."} for n in range(3)]
+    pages.append({"url": "https://x.example.com/3", "markdown": f"{FOOTER}\n\nPage 3 body."})
+
+    stripped, chrome, stats = strip_site_chrome(pages)
+
+    assert chrome == [] and stripped == pages
+    assert stats["chromeBlocks"] == 0
+
+
+def test_single_page_and_disabled_stripping_are_untouched():
+    assert strip_site_chrome(PAGES[:1])[1] == []
+
+    pages, chrome, reduction = reduce_pages(PAGES, strip_boilerplate=False)
+    assert pages == PAGES and chrome == [] and "siteChrome" not in reduction
@@ -0,0 +1,31 @@
+"""A stream that fails partway keeps the products that finished before it broke."""
+
+import json
+
+from conftest import RESULT
+from extraction_options import ExtractionOptions
+from extraction_pipeline import run_extraction
+
+URLS = ["https://harbor.example.com/tours/"]
+OPTIONS = ExtractionOptions(repair_products=False)
+
+
+def test_failed_stream_saves_the_finished_products(pipeline):
+    text = json.dumps(RESULT)
+    pipeline.claude.replies.append((text[:text.index('{"title": "Whale watch"')], "error"))
+
+    result = run_extraction(URLS, operator="harbor", options=OPTIONS)
+
+    assert result["operator"] == RESULT["operator"]
+    assert [p["title"] for p in result["products"]] == ["Sunset cruise"]
+    truncated = result["extractionMetadata"]["truncated"]
+    assert truncated["stopReason"] == "error"
+    assert truncated["resumePoint"]["lastCompleteProduct"] == "Sunset cruise"
+    assert not (pipeline.results / "harbor" / "extract_operator_v1_products.jsonl").exists()
+
+
+def test_failed_stream_with_no_finished_product_saves_nothing(pipeline):
+    pipeline.claude.replies.append(('{"operator": {"name": "Harbor', "error"))
+
+    assert run_extraction(URLS, operator="harbor", options=OPTIONS) is None
+    assert not (pipeline.results / "harbor" / "extract_operator_v1.json").exists()
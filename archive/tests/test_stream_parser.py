@@ -0,0 +1,36 @@
+"""IncrementalExtractionParser: products emitted as they close, buffer kept to the open value."""
+
+import json
+
+from response_parsing import IncrementalExtractionParser
+
+
+def _response(count: int) -> str:
+    return "```json\n" + json.dumps({
+        "operator": {"name": "Op {braces} \"quoted\"", "url": "https://op.example.com"},
+        "products": [{"title": f"Tour {i} [x]", "notes": "}\\\\"} for i in range(count)],
+    }) + "\n```"
+
+
+def test_chunked_feed_matches_whole_response():
+    text = _response(50)
+    whole = IncrementalExtractionParser()
+    whole.feed(text)
+    chunked = IncrementalExtractionParser()
+    emitted = []
+    for i in range(0, len(text), 7):
+        emitted += chunked.feed(text[i:i + 7])
+    assert emitted == whole.products == json.loads(text.strip("`json\n"))["products"]
+    assert chunked.operator == whole.operator
+    assert chunked.buffer == ""  # nothing retained once the root object closes
+
+
+def test_cut_off_stream_keeps_complete_products_and_bounded_buffer():
+    text = _response(200)
+    cut = text.index('"Tour 150')
+    parser = IncrementalExtractionParser()
+    for i in range(0, cut, 11):
+        parser.feed(text[i:min(i + 11, cut)])
+        assert len(parser.buffer) < 100  # only the product in flight is buffered
+    assert len(parser.products) == 150
+    assert parser.resume_point()["responseOffset"] == text.rindex("}", 0, cut) + 1
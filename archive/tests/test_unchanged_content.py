@@ -0,0 +1,36 @@
+"""run_extraction skips Claude when the messages, prompt, models and settings are unchanged."""
+
+from extraction_options import ExtractionOptions
+from extraction_pipeline import run_extraction
+
+URLS = ["https://harbor.example.com/tours/", "https://harbor.example.com/tours/sunset/"]
+
+
+def test_unchanged_content_reuses_the_saved_result(pipeline):
+    first = run_extraction(URLS, operator="harbor")
+    second = run_extraction(URLS, operator="harbor")
+
+    assert len(pipeline.claude.requests) == 1
+    assert "reusedUnchanged" in second["extractionMetadata"]
+    assert second["products"] == first["products"]
+
+
+def test_force_extract_calls_claude_again(pipeline):
+    run_extraction(URLS, operator="harbor")
+    run_extraction(URLS, operator="harbor", options=ExtractionOptions(force_extract=True))
+
+    assert len(pipeline.claude.requests) == 2
+
+
+def test_changed_settings_are_not_reused(pipeline):
+    run_extraction(URLS, operator="harbor")
+    run_extraction(URLS, operator="harbor", options=ExtractionOptions(max_tokens=8_000))
+    run_extraction(URLS, operator="harbor", options=ExtractionOptions(max_tokens=8_000, repair_products=False))
+    assert len(pipeline.claude.requests) == 3
+
+    chunked = ExtractionOptions(max_tokens=8_000, repair_products=False, chunked=True, chunk_tokens=200)
+    run_extraction(URLS, operator="harbor", options=chunked)
+    calls = len(pipeline.claude.requests)
+    assert calls > 3
+    run_extraction(URLS, operator="harbor", options=chunked)
+    assert len(pipeline.claude.requests) == calls
@@ -0,0 +1,26 @@
+"""viator_compare --shard / --merge-shards argument checks and stable shard assignment."""
+
+import argparse
+
+import pytest
+
+from viator_compare import parse_shard, parse_shard_count, select_shard, shard_of
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "x"])
+def test_merge_shards_rejects_counts_below_one(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard_count(value)
+
+
+def test_shard_index_must_be_below_count():
+    assert parse_shard("3/4") == (3, 4)
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard("4/4")
+
+
+def test_shards_partition_the_operators():
+    operators = [{"slug": f"operator_{i}"} for i in range(40)]
+    shards = [select_shard(operators, (i, 4)) for i in range(4)]
+    assert sorted(op["slug"] for shard in shards for op in shard) == sorted(op["slug"] for op in operators)
+    assert all(shard_of(op["slug"], 4) == i for i, shard in enumerate(shards) for op in shard)